@@ -2,14 +2,19 @@
 This file contains the main class of the project. It processes streams of events and detects pattern matches
 by invoking the rest of the system components.
 """
+import asyncio
+
 from base.DataFormatter import DataFormatter
 from parallel.EvaluationManagerFactory import EvaluationManagerFactory
 from parallel.ParallelExecutionParameters import ParallelExecutionParameters
 from stream.Stream import InputStream, OutputStream
+from stream.AsyncStream import AsyncInputStream, AsyncOutputStream
+from stream.TeeStream import CallbackOutputStream
 from base.Pattern import Pattern
 from evaluation.EvaluationMechanismFactory import EvaluationMechanismParameters
-from typing import List
+from typing import Callable, List
 from datetime import datetime
+from misc import DefaultConfig
 from transformation.PatternPreprocessingParameters import PatternPreprocessingParameters
 from transformation.PatternPreprocessor import PatternPreprocessor
 
@@ -22,7 +27,8 @@ class CEP:
     """
     def __init__(self, patterns: Pattern or List[Pattern], eval_mechanism_params: EvaluationMechanismParameters = None,
                  parallel_execution_params: ParallelExecutionParameters = None,
-                 pattern_preprocessing_params: PatternPreprocessingParameters = None):
+                 pattern_preprocessing_params: PatternPreprocessingParameters = None,
+                 project_event_attributes: bool = DefaultConfig.PROJECT_EVENT_ATTRIBUTES):
         """
         Constructor of the class.
         """
@@ -30,6 +36,15 @@ class CEP:
         self.__evaluation_manager = EvaluationManagerFactory.create_evaluation_manager(actual_patterns,
                                                                                        eval_mechanism_params,
                                                                                        parallel_execution_params)
+        # if enabled and possible, the data formatters only parse the event attributes referenced by the engine
+        self.__referenced_attribute_names = None
+        if project_event_attributes:
+            self.__referenced_attribute_names = CEP.__get_referenced_attribute_names(actual_patterns,
+                                                                                     parallel_execution_params)
+        # the state of the incremental evaluation, initialized by start
+        self.__is_started = False
+        self.__match_callback = None
+        self.__new_matches = []
 
     def run(self, events: InputStream, matches: OutputStream, data_formatter: DataFormatter):
         """
@@ -37,9 +52,129 @@ class CEP:
         Returns the total time elapsed during evaluation.
         """
         start = datetime.now()
-        self.__evaluation_manager.eval(events, matches, data_formatter)
+        self.__evaluation_manager.eval(events, matches, self.__project(data_formatter))
         return (datetime.now() - start).total_seconds()
 
+    async def run_async(self, events: AsyncInputStream, matches: OutputStream, data_formatter: DataFormatter):
+        """
+        A coroutine applying the evaluation mechanism to a stream of events arriving asynchronously. The events are
+        evaluated in the calling event loop as they arrive, yielding control to other coroutines between batches.
+        The matches can be consumed concurrently if an AsyncOutputStream is provided.
+        Returns the total time elapsed during evaluation. Not supported in the data parallel mode.
+        """
+        start = datetime.now()
+        try:
+            self.__evaluation_manager.start_eval(matches, self.__project(data_formatter))
+            async for raw_events in events.iterate_batches():
+                self.__evaluation_manager.eval_raw_events(raw_events)
+                await asyncio.sleep(0)
+            self.__evaluation_manager.finish_eval()
+        finally:
+            # the output stream is closed even on failure to release the consumers
+            matches.close()
+        return (datetime.now() - start).total_seconds()
+
+    async def iterate_matches_async(self, events: AsyncInputStream, data_formatter: DataFormatter):
+        """
+        An asynchronous generator evaluating a stream of events arriving asynchronously and yielding the pattern
+        matches as soon as they are detected.
+        """
+        matches = AsyncOutputStream()
+        evaluation_task = asyncio.ensure_future(self.run_async(events, matches, data_formatter))
+        try:
+            async for match in matches:
+                yield match
+        finally:
+            if not evaluation_task.done():
+                evaluation_task.cancel()
+        # propagates the exceptions raised during evaluation, if any
+        await evaluation_task
+
+    def start(self, data_formatter: DataFormatter, match_callback: Callable = None):
+        """
+        Starts an incremental evaluation, in which the events are pushed to the engine one at a time or in batches using
+        push_event and push_events, instead of being read from an input stream.
+        If a callback is specified, it is invoked on each match as soon as it is detected. In addition, the matches
+        detected while handling the pushed events are returned to the caller.
+        Not supported in the data parallel mode.
+        """
+        if self.__is_started:
+            raise Exception("The incremental evaluation has already been started.")
+        self.__match_callback = match_callback
+        self.__new_matches = []
+        self.__evaluation_manager.start_eval(CallbackOutputStream(self.__report_match), self.__project(data_formatter))
+        self.__is_started = True
+
+    def push_event(self, raw_event):
+        """
+        Evaluates a single raw event and returns the list of the matches it completed.
+        """
+        return self.push_events([raw_event])
+
+    def push_events(self, raw_events: List):
+        """
+        Evaluates a batch of raw events and returns the list of the matches they completed.
+        """
+        if not self.__is_started:
+            raise Exception("The incremental evaluation has not been started.")
+        self.__evaluation_manager.eval_raw_events(raw_events)
+        return self.__take_new_matches()
+
+    def flush(self):
+        """
+        Ends the incremental evaluation and returns the list of the matches that were still pending, e.g., matches
+        awaiting the expiration of a negated event at the end of a pattern.
+        """
+        if not self.__is_started:
+            raise Exception("The incremental evaluation has not been started.")
+        self.__is_started = False
+        self.__evaluation_manager.finish_eval()
+        return self.__take_new_matches()
+
+    def __report_match(self, match):
+        """
+        Handles a match detected during the incremental evaluation.
+        """
+        self.__new_matches.append(match)
+        if self.__match_callback is not None:
+            self.__match_callback(match)
+
+    def __take_new_matches(self):
+        """
+        Returns the matches detected since the last call and starts a new list.
+        """
+        new_matches = self.__new_matches
+        self.__new_matches = []
+        return new_matches
+
+    @staticmethod
+    def __get_referenced_attribute_names(patterns: Pattern or List[Pattern],
+                                         parallel_execution_params: ParallelExecutionParameters):
+        """
+        Returns the names of the event attributes accessed by the conditions of the given patterns and by the
+        partitioning of the events among the execution units, or None if they cannot be determined.
+        """
+        if isinstance(patterns, Pattern):
+            patterns = [patterns]
+        attribute_names = set()
+        for pattern in patterns:
+            pattern_attribute_names = pattern.get_attribute_names()
+            if pattern_attribute_names is None:
+                return None
+            attribute_names |= pattern_attribute_names
+        if parallel_execution_params is not None:
+            attribute_names |= parallel_execution_params.get_partitioning_attribute_names()
+        return attribute_names
+
+    def __project(self, data_formatter: DataFormatter):
+        """
+        Returns the formatter to be used for parsing the events, only converting the referenced attributes if
+        projection is enabled.
+        """
+        if self.__referenced_attribute_names is None:
+            return data_formatter
+        return data_formatter.get_projection(self.__referenced_attribute_names)
+
     def get_pattern_match(self):
         """
         Returns one match from the output stream.
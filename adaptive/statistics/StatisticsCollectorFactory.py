@@ -5,6 +5,7 @@ from misc import DefaultConfig
 from adaptive.statistics.StatisticsTypes import StatisticsTypes
 from adaptive.statistics.StatisticsCollector import StatisticsCollector
 from adaptive.statistics.StatisticsFactory import StatisticsFactory
+from misc.Utils import convert_time_window
 
 
 class StatisticsCollectorParameters:
@@ -25,20 +26,23 @@ class StatisticsCollectorFactory:
     """
 
     @staticmethod
-    def build_statistics_collector(statistics_collector_parameters: StatisticsCollectorParameters, patterns: List[Pattern]):
+    def build_statistics_collector(statistics_collector_parameters: StatisticsCollectorParameters, patterns: List[Pattern],
+                                   timestamp_unit: timedelta = None):
         if statistics_collector_parameters is None:
             statistics_collector_parameters = StatisticsCollectorFactory.__create_default_statistics_collector_parameters()
-        return StatisticsCollectorFactory.__create_statistics_collector(statistics_collector_parameters, patterns)
+        return StatisticsCollectorFactory.__create_statistics_collector(statistics_collector_parameters, patterns,
+                                                                        timestamp_unit)
 
     @staticmethod
     def __create_statistics_collector(statistics_collector_parameters: StatisticsCollectorParameters,
-                                      patterns: List[Pattern]):
+                                      patterns: List[Pattern], timestamp_unit: timedelta):
         """
         Currently, multi-pattern is not supported.
         TODO: To support multi-pattern mode it will need to go through a loop and create statistics for each pattern.
         """
         pattern = patterns[0]
-        statistics_time_window = statistics_collector_parameters.statistics_time_window
+        statistics_time_window = convert_time_window(statistics_collector_parameters.statistics_time_window,
+                                                     timestamp_unit)
         statistics_dict = {}
         for stat_type in statistics_collector_parameters.statistics_types:
             stat = StatisticsFactory.create_statistics(pattern, stat_type, statistics_time_window)
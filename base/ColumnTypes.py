@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class ColumnTypes(Enum):
+    """
+    The types of the columns of a delimited data format, determining the conversion applied to the raw field values.
+    """
+    STRING = 0
+    INT = 1
+    FLOAT = 2
+    # an integer if the value represents one, otherwise a floating point number or the raw string if not a number
+    NUMBER = 3
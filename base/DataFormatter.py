@@ -1,4 +1,5 @@
 from abc import ABC
+from typing import Iterable
 
 
 class EventTypeClassifier(ABC):
@@ -14,6 +15,20 @@ class EventTypeClassifier(ABC):
         """
         raise NotImplementedError()
 
+    def get_event_type_attribute_name(self):
+        """
+        Returns the name of the attribute whose value is the event type, or None if the type is deduced otherwise.
+        Knowing this attribute allows a data formatter to extract the event type from raw data without parsing it.
+        """
+        return None
+
+    def get_attribute_names(self):
+        """
+        Returns the names of the attributes used for deducing the event type, or None if they are unknown.
+        """
+        event_type_attribute_name = self.get_event_type_attribute_name()
+        return None if event_type_attribute_name is None else [event_type_attribute_name]
+
 
 class DataFormatter(ABC):
     """
@@ -22,6 +37,7 @@ class DataFormatter(ABC):
     """
     def __init__(self, event_type_classifier: EventTypeClassifier):
         self.__event_type_classifier = event_type_classifier
+        self.__event_schemas = {}
 
     def parse_event(self, raw_data: str):
         """
@@ -42,6 +58,38 @@ class DataFormatter(ABC):
         """
         return self.__event_type_classifier.get_event_type(event_payload)
 
+    def get_event_type_classifier(self):
+        """
+        Returns the event type classifier of this formatter.
+        """
+        return self.__event_type_classifier
+
+    def get_raw_event_type(self, raw_data: str):
+        """
+        Returns the type of the event represented by the given raw data without fully parsing it, or None if the type
+        cannot be cheaply determined. Allows the evaluation mechanisms to skip the events of irrelevant types.
+        This method is optional for a DataFormatter subclass. By default, the type is only deduced after parsing.
+        """
+        return None
+
+    def get_raw_event_timestamp(self, raw_data: str):
+        """
+        Returns the timestamp of the event represented by the given raw data, e.g., to order the events of several
+        sources without creating them.
+        By default, the event is parsed to deduce its timestamp. A DataFormatter subclass may override this method to
+        extract the timestamp without parsing the entire event.
+        """
+        return self.get_event_timestamp(self.parse_event(raw_data))
+
+    def get_timestamp_unit(self):
+        """
+        Returns the unit of the integer timestamps returned by get_event_timestamp, which then represent the number of
+        such units elapsed since the epoch. None is returned if the timestamps are datetime objects.
+        The integer timestamps allow the engine to perform the time window checks using integer arithmetic. They are
+        only supported if the same unit is specified in the parameters of the evaluation mechanism.
+        """
+        return None
+
     def get_probability(self, event_payload: dict):
         """
         Deduces and returns the occurrence probability of the event specified by the given payload. None is returned if
@@ -49,3 +97,32 @@ class DataFormatter(ABC):
         This method is optional for a DataFormatter subclass. By default, all event occurrences are non-probabilistic.
         """
         return None
+
+    def get_required_attribute_names(self):
+        """
+        Returns the names of the attributes read by the formatter itself, e.g., to extract the timestamp, the type and
+        the probability of an event, or None if they are unknown.
+        """
+        return None
+
+    def get_projection(self, attribute_names: Iterable[str]):
+        """
+        Returns a formatter producing payloads which contain the given attributes along with the attributes required by
+        the formatter itself, avoiding the conversion of the remaining ones.
+        This method is optional for a DataFormatter subclass. By default, all attributes are parsed.
+        """
+        return self
+
+    def get_event_schema(self, attribute_names: Iterable[str]):
+        """
+        Returns the schema describing the events with the given attributes. The schema is created once and shared by all
+        events parsed by this formatter. Used by formatters producing compact payloads.
+        """
+        attribute_names = tuple(attribute_names)
+        schema = self.__event_schemas.get(attribute_names)
+        if schema is None:
+            # imported here to avoid a circular import
+            from base.EventSchema import EventSchema
+            schema = EventSchema(attribute_names)
+            self.__event_schemas[attribute_names] = schema
+        return schema
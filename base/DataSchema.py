@@ -0,0 +1,238 @@
+"""
+This file contains the declarative description of delimited event formats, which is compiled into fast parsing
+functions.
+"""
+import re
+import sys
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List, Set
+
+from base.ColumnTypes import ColumnTypes
+from base.EventSchema import CompactPayload
+from misc.Utils import str_to_number
+
+# the fixed widths of the zero-padded strptime directives supported by the compiled timestamp parsers
+TIMESTAMP_DIRECTIVE_WIDTHS = {"Y": 4, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2}
+TIMESTAMP_DIRECTIVE_ARGUMENT_ORDER = ["Y", "m", "d", "H", "M", "S"]
+TIMESTAMP_DIRECTIVE_DEFAULTS = {"Y": 1900, "m": 1, "d": 1, "H": 0, "M": 0, "S": 0}
+
+# the reference point of the integer timestamps
+EPOCH = datetime(1970, 1, 1)
+
+SLOW_PATH_CONVERTERS = {
+    ColumnTypes.STRING: str,
+    ColumnTypes.INT: int,
+    ColumnTypes.FLOAT: float,
+    ColumnTypes.NUMBER: str_to_number,
+}
+
+
+class DataColumn:
+    """
+    A single column of a delimited data format.
+    The values of a column holding a small set of distinct strings (e.g., event types or names) can be interned when
+    creating compact payloads, such that all events share a single copy of each value.
+    """
+    def __init__(self, name: str, column_type: ColumnTypes = ColumnTypes.NUMBER, is_interned: bool = False):
+        self.name = name
+        self.type = column_type
+        self.is_interned = is_interned
+
+
+class DataSchema:
+    """
+    Describes a delimited event format: the names and the types of the columns, optionally followed by trailing columns
+    which may be missing, and the column containing the event timestamp along with its strptime format.
+    A schema is compiled into a single function converting a raw line into an event payload, performing exactly one
+    typed conversion per field.
+    """
+    def __init__(self, columns: List[DataColumn], timestamp_column: str, timestamp_format: str = None,
+                 delimiter: str = ",", optional_columns: List[DataColumn] = None):
+        self.columns = columns
+        self.optional_columns = [] if optional_columns is None else optional_columns
+        self.timestamp_column = timestamp_column
+        self.timestamp_format = timestamp_format
+        self.delimiter = delimiter
+        if timestamp_column not in [column.name for column in self.columns]:
+            raise Exception("The timestamp column %s is not a mandatory column of the schema." % (timestamp_column,))
+
+    def compile_parser(self, get_event_schema: Callable = None, attribute_names: Iterable[str] = None):
+        """
+        Generates the function converting a raw line into a payload. If a function returning a shared event schema for
+        a given list of attribute names is specified, compact payloads are created. Otherwise, the payloads are
+        dictionaries.
+        If a collection of attribute names is specified, only the columns with these names are converted and included
+        in the payloads.
+        """
+        all_columns = self.columns + self.optional_columns
+        if attribute_names is not None:
+            attribute_names = set(attribute_names)
+        convert_slowly = self.__create_slow_path_converter(all_columns, get_event_schema, attribute_names)
+        namespace = {"CompactPayload": CompactPayload, "intern": sys.intern, "convert_slowly": convert_slowly}
+        lines = ["def parse(raw_data):",
+                 "    f = raw_data.rstrip('\\r\\n').split(%r)" % (self.delimiter,),
+                 "    n = len(f)"]
+        for length in range(len(self.columns), len(all_columns) + 1):
+            projected_columns = [(i, column) for i, column in enumerate(all_columns[:length])
+                                 if attribute_names is None or column.name in attribute_names]
+            values = [DataSchema.__get_conversion_expression(column, "f[%d]" % i, get_event_schema is not None)
+                      for i, column in projected_columns]
+            if get_event_schema is None:
+                payload = "{%s}" % ", ".join("%r: %s" % (column.name, value)
+                                             for (_, column), value in zip(projected_columns, values))
+            else:
+                schema_name = "schema_%d" % length
+                namespace[schema_name] = get_event_schema([column.name for _, column in projected_columns])
+                payload = "CompactPayload(%s, [%s])" % (schema_name, ", ".join(values + ["None"]))
+            lines += ["    if n == %d:" % length,
+                      "        try:",
+                      "            return %s" % payload,
+                      "        except ValueError:",
+                      "            return convert_slowly(f)"]
+        lines.append("    return convert_slowly(f)")
+        exec("\n".join(lines), namespace)
+        return namespace["parse"]
+
+    def get_column_index(self, column_name: str):
+        """
+        Returns the index of the given mandatory column, or None if there is no such column.
+        """
+        for index, column in enumerate(self.columns):
+            if column.name == column_name:
+                return index
+        return None
+
+    def get_string_column_index(self, column_name: str):
+        """
+        Returns the index of the given mandatory string column, or None if there is no such column.
+        """
+        index = self.get_column_index(column_name)
+        return index if index is not None and self.columns[index].type == ColumnTypes.STRING else None
+
+    def compile_raw_field_extractor(self, column_name: str):
+        """
+        Generates the function returning the raw value of the given mandatory column of a raw line without splitting
+        the remainder of the line. The function returns None for the lines missing the column.
+        """
+        index = self.get_column_index(column_name)
+        if index is None:
+            raise Exception("The column %s is not a mandatory column of the schema." % (column_name,))
+        delimiter = self.delimiter
+
+        def extract_raw_field(raw_data: str):
+            fields = raw_data.split(delimiter, index + 1)
+            return fields[index].rstrip("\r\n") if len(fields) > index else None
+        return extract_raw_field
+
+    def compile_raw_timestamp_extractor(self, parse_timestamp: Callable):
+        """
+        Generates the function returning the timestamp of a raw line without parsing its remaining fields. The raw
+        value is converted according to the type of the timestamp column before being passed to the given timestamp
+        parser, exactly as done for a parsed payload. The function raises ValueError or TypeError for the lines missing
+        a valid timestamp.
+        """
+        extract_raw_field = self.compile_raw_field_extractor(self.timestamp_column)
+        column_type = self.columns[self.get_column_index(self.timestamp_column)].type
+        if column_type == ColumnTypes.STRING:
+            return lambda raw_data: parse_timestamp(extract_raw_field(raw_data))
+        convert = SLOW_PATH_CONVERTERS[column_type]
+        return lambda raw_data: parse_timestamp(convert(extract_raw_field(raw_data)))
+
+    def compile_timestamp_parser(self, timestamp_unit: timedelta = None):
+        """
+        Generates the function converting the value of the timestamp column into a datetime object or, if a timestamp
+        unit is specified, into the integer number of such units elapsed since the epoch.
+        A format consisting of zero-padded numeric directives and literal characters is parsed by slicing, falling back
+        to strptime for the values not matching the fixed layout. Since consecutive events often share the same
+        timestamp, the result of the last conversion is memoized.
+        """
+        timestamp_format = self.timestamp_format
+        if timestamp_format is None:
+            raise Exception("No timestamp format is specified.")
+        parsing_lines = DataSchema.__get_timestamp_parsing_lines(timestamp_format)
+        lines = ["def parse_timestamp(value):",
+                 "    last_conversion = cache[0]",
+                 "    if last_conversion[0] == value:",
+                 "        return last_conversion[1]",
+                 "    s = value if value.__class__ is str else str(value)"]
+        lines += ["    " + line for line in parsing_lines]
+        if timestamp_unit is not None:
+            lines.append("    result = (result - EPOCH) // timestamp_unit")
+        # the key and the result are replaced at once, as the function may be shared by multiple threads
+        lines += ["    cache[0] = (value, result)",
+                  "    return result"]
+        namespace = {"datetime": datetime, "EPOCH": EPOCH, "timestamp_unit": timestamp_unit, "cache": [(None, None)]}
+        exec("\n".join(lines), namespace)
+        return namespace["parse_timestamp"]
+
+    @staticmethod
+    def __get_timestamp_parsing_lines(timestamp_format: str):
+        """
+        Returns the code lines assigning the datetime object parsed from the string s to the variable result.
+        """
+        strptime_line = "result = datetime.strptime(s, %r)" % (timestamp_format,)
+        tokens = re.findall(r"%.|[^%]", timestamp_format)
+        offset = 0
+        arguments = dict(TIMESTAMP_DIRECTIVE_DEFAULTS)
+        parsed_directives = set()
+        literal_conditions = []
+        for token in tokens:
+            if not token.startswith("%"):
+                literal_conditions.append("s[%d] == %r" % (offset, token))
+                offset += 1
+                continue
+            directive = token[1]
+            if directive not in TIMESTAMP_DIRECTIVE_WIDTHS or directive in parsed_directives:
+                # an unsupported or a repeated directive
+                return [strptime_line]
+            width = TIMESTAMP_DIRECTIVE_WIDTHS[directive]
+            arguments[directive] = "int(s[%d:%d])" % (offset, offset + width)
+            parsed_directives.add(directive)
+            offset += width
+        condition = " and ".join(["len(s) == %d" % offset] + literal_conditions)
+        arguments = ", ".join(str(arguments[directive]) for directive in TIMESTAMP_DIRECTIVE_ARGUMENT_ORDER)
+        return ["result = None",
+                "if %s:" % condition,
+                "    try:",
+                "        result = datetime(%s)" % arguments,
+                "    except ValueError:",
+                "        pass",
+                "if result is None:",
+                "    " + strptime_line]
+
+    @staticmethod
+    def __get_conversion_expression(column: DataColumn, field: str, is_compact: bool):
+        """
+        Returns the expression converting the given raw field according to the column type.
+        """
+        column_type = column.type
+        if column_type == ColumnTypes.STRING:
+            return "intern(%s)" % (field,) if is_compact and column.is_interned else field
+        if column_type == ColumnTypes.INT:
+            return "int(%s)" % (field,)
+        if column_type == ColumnTypes.FLOAT:
+            return "float(%s)" % (field,)
+        # a number is parsed as a float only if it contains a decimal point, in which case it is never a valid integer.
+        # Other values which are not integers are handled by the slow path
+        return "(float(%s) if '.' in %s else int(%s))" % (field, field, field)
+
+    @staticmethod
+    def __create_slow_path_converter(all_columns: List[DataColumn], get_event_schema: Callable,
+                                     attribute_names: Set[str]):
+        """
+        Creates the function converting the fields one by one, used for the lines with an unexpected number of fields
+        or with values not handled by the compiled conversions.
+        """
+        projected_columns = [(i, column) for i, column in enumerate(all_columns)
+                             if attribute_names is None or column.name in attribute_names]
+        names = [column.name for _, column in projected_columns]
+        converters = [(i, sys.intern if get_event_schema is not None and column.is_interned and
+                       column.type == ColumnTypes.STRING else SLOW_PATH_CONVERTERS[column.type])
+                      for i, column in projected_columns]
+
+        def convert_slowly(fields: List[str]):
+            values = [converter(fields[i]) for i, converter in converters if i < len(fields)]
+            if get_event_schema is None:
+                return dict(zip(names, values))
+            return get_event_schema(names[:len(values)]).create_payload(values)
+        return convert_slowly
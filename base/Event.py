@@ -1,8 +1,30 @@
+from threading import Lock
 from typing import List
 
 from base.DataFormatter import DataFormatter
 
 
+class EventIdAllocator:
+    """
+    Assigns the serial numbers identifying the events. The numbers are allocated in consecutive blocks, such that the
+    events of a stream can be numbered in the order of their arrival (as required by the contiguity conditions) even if
+    they are parsed on multiple threads. Each evaluation mechanism owns a dedicated allocator, hence the numbers are only
+    unique among the events processed by the same mechanism.
+    """
+    def __init__(self, first_id: int = 0):
+        self.__next_id = first_id
+        self.__lock = Lock()
+
+    def allocate(self, count: int = 1):
+        """
+        Reserves a block of count consecutive numbers and returns the first one.
+        """
+        with self.__lock:
+            first_id = self.__next_id
+            self.__next_id += count
+        return first_id
+
+
 class Event:
     """
     This class represents a single primitive event received from an input stream. It may contain arbitrary attributes
@@ -10,21 +32,23 @@ class Event:
     attributes using an appropriate data formatter.
     """
 
-    # used in order to assign a serial number to each event that enters the system
-    counter = 0
+    __slots__ = ("payload", "type", "min_timestamp", "max_timestamp", "timestamp", "probability")
+
+    # used in order to assign a serial number to the events created without an explicitly allocated one
+    default_id_allocator = EventIdAllocator()
 
     INDEX_ATTRIBUTE_NAME = "InternalIndexAttributeName"
     HIDDEN_ATTRIBUTE_NAMES = [INDEX_ATTRIBUTE_NAME]
 
-    def __init__(self, raw_data: str, data_formatter: DataFormatter):
+    def __init__(self, raw_data: str, data_formatter: DataFormatter, event_id: int = None):
         self.payload = data_formatter.parse_event(raw_data)
         self.type = data_formatter.get_event_type(self.payload)
         self.min_timestamp = self.max_timestamp = self.timestamp = data_formatter.get_event_timestamp(self.payload)
-        self.payload[Event.INDEX_ATTRIBUTE_NAME] = Event.counter
+        self.payload[Event.INDEX_ATTRIBUTE_NAME] = \
+            Event.default_id_allocator.allocate() if event_id is None else event_id
         self.probability = data_formatter.get_probability(self.payload)
         if self.probability is not None and (self.probability < 0.0 or self.probability > 1.0):
             raise Exception("Invalid value for probability:%s" % (self.probability,))
-        Event.counter += 1
 
     def __eq__(self, other):
         return self.payload[Event.INDEX_ATTRIBUTE_NAME] == other.payload[Event.INDEX_ATTRIBUTE_NAME]
@@ -49,10 +73,14 @@ class AggregatedEvent(Event):
     Represents a set of events produced by a Kleene closure operator.
     TODO: as of now, can only be used for a flat (non-nested) Kleene closure.
     """
+    __slots__ = ("primitive_events",)
+
     def __init__(self, events: List[Event], probability: float):
         self.type = None if len(events) == 0 else events[0].type  # will not be set correctly for nested Kleene closures
         self.probability = probability
-        self.payload = {Event.INDEX_ATTRIBUTE_NAME: Event.counter}
+        # the aggregated event is numbered as the event following its latest primitive event
+        self.payload = {Event.INDEX_ATTRIBUTE_NAME: 0 if len(events) == 0 else
+                        max(event.payload[Event.INDEX_ATTRIBUTE_NAME] for event in events) + 1}
 
         self.primitive_events = events
 
@@ -0,0 +1,75 @@
+from collections.abc import Mapping
+from typing import Iterable
+
+from base.Event import Event
+
+
+class EventSchema:
+    """
+    Describes the attributes of a family of events sharing the same structure. A schema is shared by all events of its
+    family, such that each event only has to store the list of its attribute values.
+    The internal index attribute assigned to each event is always the last attribute of the schema.
+    """
+    def __init__(self, attribute_names: Iterable[str]):
+        self.attribute_names = tuple(attribute_names)
+        if Event.INDEX_ATTRIBUTE_NAME in self.attribute_names:
+            raise Exception("The attribute name %s is reserved." % (Event.INDEX_ATTRIBUTE_NAME,))
+        self.indices = {name: i for i, name in enumerate(self.attribute_names + (Event.INDEX_ATTRIBUTE_NAME,))}
+
+    def create_payload(self, values: Iterable):
+        """
+        Creates a compact payload holding the given attribute values, listed in the order of the schema attributes.
+        """
+        values = list(values)
+        if len(values) != len(self.attribute_names):
+            raise Exception("Expected %s attribute values, got %s." % (len(self.attribute_names), len(values)))
+        values.append(None)
+        return CompactPayload(self, values)
+
+
+class CompactPayload(Mapping):
+    """
+    An event payload storing the attribute values in a list indexed through a shared schema, as opposed to a separate
+    dictionary per event. Supports the dictionary operations used for accessing the attributes of an event, e.g., by
+    the condition variables. The attributes are fixed by the schema: their values can be modified, but no attributes
+    can be added or removed.
+    """
+    __slots__ = ("__schema", "__values")
+
+    def __init__(self, schema: EventSchema, values: list):
+        self.__schema = schema
+        self.__values = values
+
+    def __getitem__(self, key):
+        return self.__values[self.__schema.indices[key]]
+
+    def __setitem__(self, key, value):
+        index = self.__schema.indices.get(key)
+        if index is None:
+            raise Exception("The attribute %s is not defined by the event schema." % (key,))
+        self.__values[index] = value
+
+    def get(self, key, default=None):
+        index = self.__schema.indices.get(key)
+        return default if index is None else self.__values[index]
+
+    def __contains__(self, key):
+        return key in self.__schema.indices
+
+    def __iter__(self):
+        return iter(self.__schema.indices)
+
+    def __len__(self):
+        return len(self.__values)
+
+    def keys(self):
+        return self.__schema.indices.keys()
+
+    def get_schema(self):
+        """
+        Returns the schema of this payload.
+        """
+        return self.__schema
+
+    def __repr__(self):
+        return repr(dict(self.items()))
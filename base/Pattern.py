@@ -181,6 +181,13 @@ class Pattern:
                                                lambda x, y: x == y - 1)
         self.condition.add_atomic_condition(contiguity_condition)
 
+    def get_attribute_names(self):
+        """
+        Returns the names of the event attributes accessed by the pattern condition, or None if they cannot be
+        determined.
+        """
+        return self.condition.get_attribute_names()
+
     def extract_flat_sequences(self) -> List[List[str]]:
         """
         Returns a list of all flat sequences in the pattern.
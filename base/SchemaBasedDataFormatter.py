@@ -0,0 +1,136 @@
+from copy import copy
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Union
+
+from base.DataFormatter import DataFormatter, EventTypeClassifier
+from base.DataSchema import DataSchema
+
+
+class SchemaBasedDataFormatter(DataFormatter):
+    """
+    A data formatter for delimited event formats described declaratively by a DataSchema. The parsing and the timestamp
+    extraction functions are compiled from the schema upon creation.
+    A format containing several kinds of records with different columns is described by a dictionary of schemas, in
+    which case the schema of each record is selected by the value of its first field. All schemas must then share the
+    timestamp column and format.
+    If use_compact_payloads is set, the events are parsed into compact payloads sharing an event schema per record kind.
+    If timestamp_unit is set, the event timestamps are represented as the integer number of such units elapsed since
+    the epoch (see DataFormatter.get_timestamp_unit).
+    Projections are supported if the event type classifier reports the attributes it uses. If the event type is the
+    value of a string column located at the same position in all schemas, it is extracted from the raw data without
+    parsing the irrelevant events.
+    """
+    def __init__(self, event_type_classifier: EventTypeClassifier, data_schema: Union[DataSchema, Dict[str, DataSchema]],
+                 use_compact_payloads: bool = False, timestamp_unit: timedelta = None):
+        super().__init__(event_type_classifier)
+        self.__timestamp_unit = timestamp_unit
+        self.__data_schema = data_schema
+        self.__get_event_schema = self.get_event_schema if use_compact_payloads else None
+        self.__projections = {}
+        schemas = [data_schema] if isinstance(data_schema, DataSchema) else list(data_schema.values())
+        if len(schemas) == 0:
+            raise Exception("No data schema is specified.")
+        first_schema = schemas[0]
+        for schema in schemas[1:]:
+            if schema.timestamp_column != first_schema.timestamp_column or \
+                    schema.timestamp_format != first_schema.timestamp_format:
+                raise Exception("All data schemas must share the timestamp column and format.")
+        self.__timestamp_column = first_schema.timestamp_column
+        self.__parse_timestamp = first_schema.compile_timestamp_parser(timestamp_unit)
+        self.__parse = self.__create_parser()
+        self.__extract_raw_event_type = SchemaBasedDataFormatter.__create_raw_event_type_extractor(
+            schemas, event_type_classifier.get_event_type_attribute_name())
+        self.__extract_raw_timestamp = SchemaBasedDataFormatter.__create_raw_timestamp_extractor(
+            schemas, self.__parse_timestamp)
+
+    def __create_parser(self, attribute_names: Iterable[str] = None):
+        """
+        Creates the parsing function of this formatter, optionally converting the given attributes only.
+        """
+        if isinstance(self.__data_schema, DataSchema):
+            return self.__data_schema.compile_parser(self.__get_event_schema, attribute_names)
+        return SchemaBasedDataFormatter.__create_selecting_parser(self.__data_schema, self.__get_event_schema,
+                                                                  attribute_names)
+
+    @staticmethod
+    def __create_raw_event_type_extractor(data_schemas: List[DataSchema], event_type_attribute_name: str):
+        """
+        Creates the function extracting the event type from raw data, or returns None if the type cannot be extracted
+        without parsing the event.
+        """
+        if event_type_attribute_name is None:
+            return None
+        indices = set(schema.get_string_column_index(event_type_attribute_name) for schema in data_schemas)
+        if len(indices) != 1 or None in indices:
+            return None
+        return data_schemas[0].compile_raw_field_extractor(event_type_attribute_name)
+
+    @staticmethod
+    def __create_raw_timestamp_extractor(data_schemas: List[DataSchema], parse_timestamp: Callable):
+        """
+        Creates the function extracting the timestamp from raw data, or returns None if the timestamp column is not
+        located at the same position and of the same type in all schemas.
+        """
+        timestamp_column = data_schemas[0].timestamp_column
+        columns = set((schema.get_column_index(timestamp_column),
+                       schema.columns[schema.get_column_index(timestamp_column)].type) for schema in data_schemas)
+        if len(columns) != 1:
+            return None
+        return data_schemas[0].compile_raw_timestamp_extractor(parse_timestamp)
+
+    @staticmethod
+    def __create_selecting_parser(data_schemas: Dict[str, DataSchema], get_event_schema,
+                                  attribute_names: Iterable[str]):
+        """
+        Creates the parsing function selecting the schema of each record according to its first field.
+        """
+        parsers = {key: schema.compile_parser(get_event_schema, attribute_names)
+                   for key, schema in data_schemas.items()}
+        delimiters = set(schema.delimiter for schema in data_schemas.values())
+        if len(delimiters) != 1:
+            raise Exception("All data schemas must share the delimiter.")
+        delimiter = delimiters.pop()
+
+        def parse(raw_data: str):
+            return parsers[raw_data.split(delimiter, 1)[0].rstrip("\r\n")](raw_data)
+        return parse
+
+    def parse_event(self, raw_data: str):
+        return self.__parse(raw_data)
+
+    def get_raw_event_type(self, raw_data: str):
+        return None if self.__extract_raw_event_type is None else self.__extract_raw_event_type(raw_data)
+
+    def get_event_timestamp(self, event_payload: dict):
+        return self.__parse_timestamp(event_payload[self.__timestamp_column])
+
+    def get_raw_event_timestamp(self, raw_data: str):
+        if self.__extract_raw_timestamp is not None:
+            try:
+                return self.__extract_raw_timestamp(raw_data)
+            except (ValueError, TypeError):
+                # the event is parsed in order to handle the malformed values as usual
+                pass
+        return super().get_raw_event_timestamp(raw_data)
+
+    def get_timestamp_unit(self):
+        return self.__timestamp_unit
+
+    def get_required_attribute_names(self):
+        type_attribute_names = self.get_event_type_classifier().get_attribute_names()
+        if type_attribute_names is None:
+            return None
+        return set(type_attribute_names) | {self.__timestamp_column}
+
+    def get_projection(self, attribute_names: Iterable[str]):
+        required_attribute_names = self.get_required_attribute_names()
+        if required_attribute_names is None:
+            return self
+        attribute_names = frozenset(attribute_names) | required_attribute_names
+        projection = self.__projections.get(attribute_names)
+        if projection is None:
+            # the projection shares the event schemas and the timestamp parser of this formatter
+            projection = copy(self)
+            projection.__parse = self.__create_parser(attribute_names)
+            self.__projections[attribute_names] = projection
+        return projection
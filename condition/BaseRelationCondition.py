@@ -1,9 +1,28 @@
 """
 This file contains the basic relation condition classes.
 """
+import operator
 from abc import ABC
 
-from condition.Condition import BinaryCondition, Variable, RelopTypes
+from condition.Condition import BinaryCondition, SimpleCondition, Variable, RelopTypes, get_term_expression
+
+RELOP_TYPE_OPERATORS = {
+    RelopTypes.Equal: "==",
+    RelopTypes.NotEqual: "!=",
+    RelopTypes.Greater: ">",
+    RelopTypes.GreaterEqual: ">=",
+    RelopTypes.Smaller: "<",
+    RelopTypes.SmallerEqual: "<=",
+}
+
+RELOP_TYPE_FUNCTIONS = {
+    RelopTypes.Equal: operator.eq,
+    RelopTypes.NotEqual: operator.ne,
+    RelopTypes.Greater: operator.gt,
+    RelopTypes.GreaterEqual: operator.ge,
+    RelopTypes.Smaller: operator.lt,
+    RelopTypes.SmallerEqual: operator.le,
+}
 
 
 class BaseRelationCondition(BinaryCondition, ABC):
@@ -26,6 +45,16 @@ class BaseRelationCondition(BinaryCondition, ABC):
     def __repr__(self):
         raise NotImplementedError()
 
+    def get_compiled_expression(self, payload_variables: dict, namespace: dict):
+        if self._statistics_collector is not None or type(self)._eval is not SimpleCondition._eval:
+            return None
+        # the relation is applied directly instead of invoking the relation function
+        left_expression = get_term_expression(self.left_term_repr, payload_variables, namespace)
+        right_expression = get_term_expression(self.right_term_repr, payload_variables, namespace)
+        if left_expression is None or right_expression is None:
+            return None
+        return "(%s %s %s)" % (left_expression, RELOP_TYPE_OPERATORS[self.relop_type], right_expression)
+
     def __eq_same_type(self, other):
         """
         Returns True if self and other are of the same basic relation types and represent the same condition.
@@ -102,6 +102,29 @@ class CompositeCondition(Condition, ABC):
         """
         return self._statistics_collector
 
+    def get_attribute_names(self):
+        attribute_names = set()
+        for condition in self._conditions:
+            condition_attribute_names = condition.get_attribute_names()
+            if condition_attribute_names is None:
+                return None
+            attribute_names |= condition_attribute_names
+        return attribute_names
+
+    def get_compiled_expression(self, payload_variables: dict, namespace: dict):
+        if type(self).eval is not CompositeCondition.eval:
+            return None
+        if self.get_num_conditions() == 0:
+            return "True"
+        expressions = [condition.get_compiled_expression(payload_variables, namespace)
+                       for condition in self._conditions]
+        if None in expressions:
+            return None
+        # the results of the nested conditions are compared with the terminating result exactly as done by eval
+        if self._terminating_result:
+            return "(%s)" % (" or ".join("(%s) == True" % (expression,) for expression in expressions),)
+        return "(%s)" % (" and ".join("(%s) != False" % (expression,) for expression in expressions),)
+
     def __repr__(self):
         res_list = []
         for condition in self._conditions:
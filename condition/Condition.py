@@ -1,6 +1,7 @@
 """
 This file contains the basic Condition classes.
 """
+import dis
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from enum import Enum
@@ -41,6 +42,86 @@ class EquationSides(Enum):
     right = 1
 
 
+def get_accessed_attribute_names(getattr_func: callable):
+    """
+    Returns the names of the payload attributes read by the given single-argument function, or None if they cannot be
+    determined. The names can only be determined if the payload is exclusively accessed using constant keys, either by
+    subscription (e.g., lambda x: x["Peak Price"]) or via the get method (e.g., lambda x: x.get("Volume", 0)).
+    """
+    code = getattr(getattr_func, "__code__", None)
+    if code is None or code.co_argcount != 1 or len(code.co_cellvars) > 0:
+        return None
+    payload_name = code.co_varnames[0]
+    instructions = [instruction for instruction in dis.get_instructions(code)
+                    if instruction.opname not in ("CACHE", "PRECALL", "NOP", "EXTENDED_ARG")]
+    attribute_names = set()
+    for i, instruction in enumerate(instructions):
+        if "FAST" not in instruction.opname:
+            continue
+        argument = instruction.argval
+        if argument != payload_name and not (isinstance(argument, tuple) and payload_name in argument):
+            continue
+        if not instruction.opname.startswith("LOAD_FAST") or argument != payload_name:
+            # the payload is either modified or loaded along with other variables
+            return None
+        following_instructions = instructions[i + 1:i + 3]
+        if len(following_instructions) < 2:
+            return None
+        first, second = following_instructions
+        if first.opname == "LOAD_CONST" and isinstance(first.argval, str) and \
+                (second.opname == "BINARY_SUBSCR" or (second.opname == "BINARY_OP" and second.argrepr == "[]")):
+            attribute_names.add(first.argval)
+        elif first.opname in ("LOAD_METHOD", "LOAD_ATTR") and first.argval == "get" and \
+                second.opname == "LOAD_CONST" and isinstance(second.argval, str):
+            attribute_names.add(second.argval)
+        else:
+            # the payload is used in an arbitrary way
+            return None
+    return attribute_names
+
+
+def get_subscripted_attribute_name(getattr_func: callable):
+    """
+    Returns the name of the payload attribute if the given function merely subscripts its argument with a constant key
+    (e.g., lambda x: x["Peak Price"]), or None otherwise.
+    """
+    code = getattr(getattr_func, "__code__", None)
+    if code is None or code.co_argcount != 1 or code.co_kwonlyargcount != 0 or len(code.co_varnames) != 1:
+        return None
+    instructions = [instruction for instruction in dis.get_instructions(code)
+                    if instruction.opname not in ("RESUME", "CACHE", "PRECALL", "NOP", "EXTENDED_ARG")]
+    if len(instructions) != 4:
+        return None
+    load, key, subscription, ret = instructions
+    if not load.opname.startswith("LOAD_FAST") or load.argval != code.co_varnames[0]:
+        return None
+    if key.opname != "LOAD_CONST" or not isinstance(key.argval, str):
+        return None
+    if subscription.opname != "BINARY_SUBSCR" and \
+            (subscription.opname != "BINARY_OP" or subscription.argrepr != "[]"):
+        return None
+    return key.argval if ret.opname == "RETURN_VALUE" else None
+
+
+def add_to_namespace(namespace: dict, value):
+    """
+    Adds the given value to the namespace of a generated function and returns the name it is accessible by.
+    """
+    name = "v%d" % (len(namespace),)
+    namespace[name] = value
+    return name
+
+
+def get_term_expression(term, payload_variables: dict, namespace: dict):
+    """
+    Returns the expression evaluating the given term of a condition, which is either a variable or a constant, or None
+    if the term references an unbound event name.
+    """
+    if isinstance(term, Variable):
+        return term.get_compiled_expression(payload_variables, namespace)
+    return add_to_namespace(namespace, term)
+
+
 class Variable:
     """
     This class represents a variable in an event-related condition.
@@ -61,6 +142,25 @@ class Variable:
             raise NameError("Name %s is not bound to a value" % self.name)
         return self.getattr_func(binding[self.name])
 
+    def get_attribute_names(self):
+        """
+        Returns the names of the payload attributes read by this variable, or None if they cannot be determined.
+        """
+        return get_accessed_attribute_names(self.getattr_func)
+
+    def get_compiled_expression(self, payload_variables: dict, namespace: dict):
+        """
+        Returns the expression retrieving the value of this variable, given the names of the variables holding the
+        bound payloads, or None if the name of this variable is not bound.
+        """
+        if self.name not in payload_variables:
+            return None
+        payload_variable = payload_variables[self.name]
+        attribute_name = get_subscripted_attribute_name(self.getattr_func)
+        if attribute_name is not None:
+            return "%s[%r]" % (payload_variable, attribute_name)
+        return "%s(%s)" % (add_to_namespace(namespace, self.getattr_func), payload_variable)
+
     def __repr__(self):
         return self.name
 
@@ -105,6 +205,20 @@ class Condition(ABC):
         """
         raise NotImplementedError()
 
+    def get_attribute_names(self):
+        """
+        Returns the names of the event attributes accessed by this condition, or None if they cannot be determined.
+        """
+        raise NotImplementedError()
+
+    def get_compiled_expression(self, payload_variables: dict, namespace: dict):
+        """
+        Returns a Python expression evaluating this condition, given a dictionary mapping the event names to the names
+        of the variables holding their payloads. The objects referenced by the expression are added to the given
+        namespace. None is returned if this condition cannot be compiled.
+        """
+        return None
+
 
 class AtomicCondition(Condition, ABC):
     """
@@ -157,6 +271,10 @@ class AtomicCondition(Condition, ABC):
             return deepcopy(self)
         return None
 
+    def get_attribute_names(self):
+        # the attributes accessed by a custom atomic condition are unknown
+        return None
+
     def get_conditions_intersection(self, other):
         if self == other:
             return deepcopy(self)
@@ -182,6 +300,12 @@ class TrueCondition(AtomicCondition):
     def is_condition_of(self, names: set):
         return False
 
+    def get_attribute_names(self):
+        return set()
+
+    def get_compiled_expression(self, payload_variables: dict, namespace: dict):
+        return "True"
+
     def __eq__(self, other):
         return type(other) == TrueCondition
 
@@ -225,6 +349,26 @@ class SimpleCondition(AtomicCondition):
         """
         return set(term.name for term in self.terms)
 
+    def get_attribute_names(self):
+        attribute_names = set()
+        for term in self.terms:
+            if not isinstance(term, Variable):
+                continue
+            term_attribute_names = term.get_attribute_names()
+            if term_attribute_names is None:
+                return None
+            attribute_names |= term_attribute_names
+        return attribute_names
+
+    def get_compiled_expression(self, payload_variables: dict, namespace: dict):
+        if self._statistics_collector is not None or type(self)._eval is not SimpleCondition._eval:
+            # the evaluations have to be registered or the evaluation logic was customized
+            return None
+        term_expressions = [get_term_expression(term, payload_variables, namespace) for term in self.terms]
+        if None in term_expressions:
+            return None
+        return "%s(%s)" % (add_to_namespace(namespace, self.relation_op), ", ".join(term_expressions))
+
 
 class BinaryCondition(SimpleCondition):
     """
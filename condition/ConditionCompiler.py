@@ -0,0 +1,48 @@
+"""
+This file contains the compiler turning the conditions evaluated by the tree nodes into specialized Python functions.
+"""
+from typing import List
+
+from base.Event import AggregatedEvent
+from condition.Condition import Condition
+
+
+class PayloadVariables(dict):
+    """
+    Maps the event names to the names of the variables holding their payloads, recording the names actually referenced
+    by the compiled expression.
+    """
+    def __init__(self):
+        super().__init__()
+        self.referenced_names = set()
+
+    def __getitem__(self, name: str):
+        self.referenced_names.add(name)
+        return super().__getitem__(name)
+
+
+def compile_condition(condition: Condition, event_names: List[str]):
+    """
+    Generates a function evaluating the given condition on a list of events, the events of which are bound to the given
+    names according to their positions. Instead of creating a binding dictionary and walking the condition objects, the
+    generated function reads the payloads of the referenced events and evaluates a single expression.
+    None is returned if the condition cannot be compiled, in which case it should be evaluated as usual.
+    """
+    payload_variables = PayloadVariables()
+    for i, name in enumerate(event_names):
+        payload_variables[name] = "p%d" % (i,)
+    namespace = {"AggregatedEvent": AggregatedEvent}
+    expression = condition.get_compiled_expression(payload_variables, namespace)
+    if expression is None:
+        return None
+    lines = ["def evaluate_condition(events):"]
+    for i, name in enumerate(event_names):
+        if name not in payload_variables.referenced_names:
+            continue
+        # the content of an aggregated event is the list of the payloads of its primitive events
+        lines += ["    e = events[%d]" % (i,),
+                  "    p%d = e.payload if e.__class__ is not AggregatedEvent else "
+                  "[primitive_event.payload for primitive_event in e.primitive_events]" % (i,)]
+    lines.append("    return %s" % (expression,))
+    exec("\n".join(lines), namespace)
+    return namespace["evaluate_condition"]
@@ -1,4 +1,5 @@
 from abc import ABC
+from typing import List
 
 from base.DataFormatter import DataFormatter
 from stream.Stream import InputStream, OutputStream
@@ -14,6 +15,25 @@ class EvaluationMechanism(ABC):
         """
         raise NotImplementedError()
 
+    def start_eval(self, matches: OutputStream, data_formatter: DataFormatter):
+        """
+        Prepares the evaluation mechanism for receiving events incrementally. The detected pattern matches will be
+        reported to the given output stream.
+        """
+        raise NotImplementedError()
+
+    def eval_raw_events(self, raw_events: List):
+        """
+        Processes a batch of raw events after start_eval was called.
+        """
+        raise NotImplementedError()
+
+    def finish_eval(self):
+        """
+        Reports the remaining pattern matches once no more events are expected.
+        """
+        raise NotImplementedError()
+
     def get_structure_summary(self):
         """
         Returns an object summarizing the structure of this evaluation mechanism.
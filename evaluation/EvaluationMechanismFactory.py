@@ -39,11 +39,17 @@ class TreeBasedEvaluationMechanismParameters(EvaluationMechanismParameters):
                  storage_params: TreeStorageParameters = TreeStorageParameters(),
                  optimizer_params: OptimizerParameters = StatisticsDeviationAwareOptimizerParameters(),
                  tree_update_type: TreeEvaluationMechanismUpdateTypes = DefaultConfig.DEFAULT_TREE_UPDATE_TYPE,
-                 local_search_params: LocalSearchParameters = TabuSearchLocalSearchParameters()):
+                 local_search_params: LocalSearchParameters = TabuSearchLocalSearchParameters(),
+                 allowed_lateness: timedelta = DefaultConfig.EVENT_REORDERING_ALLOWED_LATENESS,
+                 timestamp_unit: timedelta = DefaultConfig.TIMESTAMP_UNIT):
         super().__init__(EvaluationMechanismTypes.TREE_BASED, optimizer_params)
         self.storage_params = storage_params
         self.tree_update_type = tree_update_type
         self.local_search_params = local_search_params
+        # if specified, events arriving out of order by up to this delay are reordered before the evaluation
+        self.allowed_lateness = allowed_lateness
+        # if specified, the event timestamps are integer numbers of this unit (see DataFormatter.get_timestamp_unit)
+        self.timestamp_unit = timestamp_unit
 
 
 class EvaluationMechanismFactory:
@@ -73,7 +79,8 @@ class EvaluationMechanismFactory:
         optimizer_params = eval_mechanism_params.optimizer_params
         statistic_collector_params = optimizer_params.statistics_collector_params
         statistics_collector = StatisticsCollectorFactory.build_statistics_collector(statistic_collector_params,
-                                                                                     patterns)
+                                                                                     patterns,
+                                                                                     eval_mechanism_params.timestamp_unit)
         optimizer = OptimizerFactory.build_optimizer(eval_mechanism_params.optimizer_params)
         cost_model_type = eval_mechanism_params.optimizer_params.tree_plan_params.cost_model_type
         pattern_to_tree_plan_map = {pattern: optimizer.build_initial_plan(pattern, cost_model_type)
@@ -87,7 +94,8 @@ class EvaluationMechanismFactory:
 
         return EvaluationMechanismFactory.__create_tree_based_evaluation_mechanism_by_update_type(
             pattern_to_tree_plan_map, eval_mechanism_params.storage_params, runtime_statistics_collector, optimizer,
-            optimizer_params.statistics_updates_time_window, eval_mechanism_params.tree_update_type)
+            optimizer_params.statistics_updates_time_window, eval_mechanism_params.tree_update_type,
+            eval_mechanism_params.allowed_lateness, eval_mechanism_params.timestamp_unit)
 
     @staticmethod
     def __merge_tree_plans(pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
@@ -121,7 +129,9 @@ class EvaluationMechanismFactory:
                                                                 statistics_collector: StatisticsCollector,
                                                                 optimizer: Optimizer,
                                                                 statistics_update_time_window: timedelta,
-                                                                tree_update_type: TreeEvaluationMechanismUpdateTypes):
+                                                                tree_update_type: TreeEvaluationMechanismUpdateTypes,
+                                                                allowed_lateness: timedelta = None,
+                                                                timestamp_unit: timedelta = None):
         """
         Instantiates a tree-based evaluation mechanism given all the parameters.
         """
@@ -130,12 +140,16 @@ class EvaluationMechanismFactory:
                                                        storage_params,
                                                        statistics_collector,
                                                        optimizer,
-                                                       statistics_update_time_window)
+                                                       statistics_update_time_window,
+                                                       allowed_lateness,
+                                                       timestamp_unit)
 
         if tree_update_type == TreeEvaluationMechanismUpdateTypes.SIMULTANEOUS_TREE_EVALUATION:
             return SimultaneousTreeBasedEvaluationMechanism(pattern_to_tree_plan_map,
                                                             storage_params,
                                                             statistics_collector,
                                                             optimizer,
-                                                            statistics_update_time_window)
+                                                            statistics_update_time_window,
+                                                            allowed_lateness,
+                                                            timestamp_unit)
         raise Exception("Unknown evaluation mechanism type: %s" % (tree_update_type,))
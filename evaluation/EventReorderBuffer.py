@@ -0,0 +1,88 @@
+"""
+This file contains the buffer used for reordering events arriving out of timestamp order.
+"""
+import heapq
+from datetime import datetime, timedelta
+
+from base.Event import Event
+
+
+class EventReorderBuffer:
+    """
+    Restores the timestamp order of a stream of events arriving with bounded delays.
+    The buffer maintains a watermark - a timestamp such that no event older than it is expected to arrive. By default,
+    the watermark trails the latest timestamp observed so far by the allowed lateness. It can also be advanced
+    explicitly, e.g., according to a progress indication of the event source.
+    Buffered events are released in timestamp order once the watermark reaches them. Events arriving after the
+    watermark has passed their timestamp are considered late and are dropped, as they can no longer be placed in order.
+    """
+    def __init__(self, allowed_lateness: timedelta or int, timestamp_unit: timedelta = None):
+        # the lateness is a timedelta for datetime timestamps and an integer number of units for integer timestamps
+        if timestamp_unit is None:
+            if not isinstance(allowed_lateness, timedelta):
+                raise Exception("The allowed lateness should be a timedelta for datetime timestamps.")
+            if allowed_lateness < timedelta(0):
+                raise Exception("The allowed lateness should be non-negative.")
+        else:
+            if not isinstance(allowed_lateness, int) or isinstance(allowed_lateness, bool):
+                raise Exception("The allowed lateness should be an integer number of timestamp units for integer "
+                                "timestamps.")
+            if allowed_lateness < 0:
+                raise Exception("The allowed lateness should be non-negative.")
+        self.__allowed_lateness = allowed_lateness
+        self.__heap = []
+        self.__watermark = None
+        # used to preserve the arrival order of the events with identical timestamps
+        self.__sequence_number = 0
+        self.__dropped_events_count = 0
+
+    def add_event(self, event: Event):
+        """
+        Buffers a new event and returns the list of the events released by the resulting watermark advance.
+        """
+        if self.__watermark is not None and event.timestamp < self.__watermark:
+            self.__dropped_events_count += 1
+            return []
+        heapq.heappush(self.__heap, (event.timestamp, self.__sequence_number, event))
+        self.__sequence_number += 1
+        return self.advance_watermark(event.timestamp - self.__allowed_lateness)
+
+    def advance_watermark(self, watermark: datetime):
+        """
+        Advances the watermark to the given timestamp and returns the list of the events it releases. An attempt to move
+        the watermark backwards is ignored.
+        """
+        if self.__watermark is None or watermark > self.__watermark:
+            self.__watermark = watermark
+        released_events = []
+        while len(self.__heap) > 0 and self.__heap[0][0] <= self.__watermark:
+            released_events.append(heapq.heappop(self.__heap)[2])
+        return released_events
+
+    def flush(self):
+        """
+        Releases all buffered events in timestamp order. Called when no more events are expected.
+        """
+        released_events = [entry[2] for entry in sorted(self.__heap)]
+        self.__heap = []
+        if len(released_events) > 0 and (self.__watermark is None or released_events[-1].timestamp > self.__watermark):
+            self.__watermark = released_events[-1].timestamp
+        return released_events
+
+    def get_watermark(self):
+        """
+        Returns the current watermark.
+        """
+        return self.__watermark
+
+    def get_buffered_events_count(self):
+        """
+        Returns the number of events waiting for the watermark to reach them.
+        """
+        return len(self.__heap)
+
+    def get_dropped_events_count(self):
+        """
+        Returns the number of late events dropped so far.
+        """
+        return self.__dropped_events_count
@@ -20,6 +20,7 @@ from plan.multi.MultiPatternTreePlanMergeApproaches import MultiPatternTreePlanM
 
 # general settings
 DEFAULT_EVALUATION_MECHANISM_TYPE = EvaluationMechanismTypes.TREE_BASED
+PROJECT_EVENT_ATTRIBUTES = False  # if True, only the event attributes referenced by the patterns are parsed
 
 # plan generation-related defaults
 DEFAULT_TREE_PLAN_BUILDER = TreePlanBuilderTypes.TRIVIAL_LEFT_DEEP_TREE
@@ -34,6 +35,17 @@ SECONDARY_SELECTION_STRATEGY = SelectionStrategies.MATCH_SINGLE
 SHOULD_SORT_STORAGE = False
 CLEANUP_INTERVAL = 10  # the default number of pattern match additions between subsequent storage cleanups
 PRIORITIZE_SORTING_BY_TIMESTAMP = True
+VECTORIZE_CONDITIONS = False  # if True, the conditions are evaluated in bulk on the stored partial matches using NumPy
+VECTORIZED_EVALUATION_THRESHOLD = 64  # the minimal number of candidate partial matches evaluated in bulk
+
+# stream settings
+STREAM_BATCH_SIZE = 1000  # the default maximal number of items retrieved from a stream at once
+FILE_INPUT_READ_AHEAD_SIZE = 10000  # the maximal number of lines buffered by a lazy file input stream reader thread
+COMPRESSED_FILE_CHUNK_SIZE = 1024 * 1024  # the size in bytes of the chunks read from or written to compressed files
+FILE_OUTPUT_BUFFER_SIZE = 1024 * 1024  # the size in bytes of the buffer of a buffered file output stream
+FILE_OUTPUT_WRITER_QUEUE_SIZE = 4  # the maximal number of full buffers pending for a file output stream writer thread
+FILE_OUTPUT_WRITER_POLL_INTERVAL = 0.1  # the interval in seconds for checking the liveness of a blocked writer thread
+TEE_SINK_BUFFER_SIZE = 10000  # the default capacity of the buffer of a threaded sink of a TeeOutputStream
 
 # iterative improvement defaults
 ITERATIVE_IMPROVEMENT_TYPE = IterativeImprovementType.SWAP_BASED
@@ -47,6 +59,7 @@ DEFAULT_PARALLEL_UNITS_NUMBER = 1
 DEFAULT_PARALLEL_KEY = None
 DEFAULT_PARALLEL_ATTRIBUTES_DICT = None
 DEFAULT_PARALLEL_MULTIPLE = 12
+DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY = 0  # the maximal number of events pending for an execution unit, 0 for unbounded
 
 # settings for pattern transformation rules
 PREPROCESSING_RULES_ORDER = None  # disabled for now
@@ -69,6 +82,8 @@ DEFAULT_OPTIMIZER_TYPE = OptimizerTypes.STATISTICS_DEVIATION_AWARE_OPTIMIZER
 DEFAULT_INIT_TREE_PLAN_BUILDER = TreePlanBuilderTypes.TRIVIAL_LEFT_DEEP_TREE  # initial tree plan builder in case of predifined statistics
 DEVIATION_OPTIMIZER_THRESHOLD = 0.5  # the default threshold for statistics changes aware optimizer
 DEFAULT_TREE_UPDATE_TYPE = TreeEvaluationMechanismUpdateTypes.TRIVIAL_TREE_EVALUATION
+TIMESTAMP_UNIT = None  # the unit of integer event timestamps or None for datetime timestamps
+EVENT_REORDERING_ALLOWED_LATENESS = None  # the maximal delay of an out-of-order event or None to disable reordering
 DEFAULT_STATISTICS_TYPE = [StatisticsTypes.ARRIVAL_RATES, StatisticsTypes.SELECTIVITY_MATRIX]  # the default statistics type can also be a list of types
 STATISTICS_TIME_WINDOW = timedelta(hours=1)  # Time window for statistics
 STATISTICS_UPDATES_WAIT_TIME = None  # the default wait time between statistics updates or None to disable adaptivity
@@ -2,7 +2,7 @@
 This file contains various useful functions utilized by different project modules.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Iterator, Sequence, TypeVar
 from typing import List, Container, Optional, Union
 from base.Pattern import Pattern
@@ -46,6 +46,17 @@ def find_partial_match_by_timestamp(partial_matches: List[PatternMatch], timesta
     raise Exception()
 
 
+def convert_time_window(time_window: timedelta, timestamp_unit: timedelta):
+    """
+    Converts a time window into the representation of the event timestamps. If a timestamp unit is specified, the
+    timestamps are integer numbers of this unit, and so is the returned window. As the differences between such
+    timestamps are integers, rounding the window down does not change the outcome of the window checks.
+    """
+    if timestamp_unit is None or time_window is None:
+        return time_window
+    return time_window // timestamp_unit
+
+
 def is_float(x: str):
     try:
         _ = float(x)
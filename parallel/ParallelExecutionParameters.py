@@ -14,6 +14,12 @@ class ParallelExecutionParameters:
         self.execution_mode = execution_mode
         self.platform = platform
 
+    def get_partitioning_attribute_names(self):
+        """
+        Returns the names of the event attributes used for dividing the events among the execution units.
+        """
+        return set()
+
 
 class DataParallelExecutionParameters(ParallelExecutionParameters):
     """
@@ -22,12 +28,17 @@ class DataParallelExecutionParameters(ParallelExecutionParameters):
     def __init__(self,
                  platform: ParallelExecutionPlatforms = DefaultConfig.DEFAULT_PARALLEL_EXECUTION_PLATFORM,
                  data_parallel_mode: DataParallelExecutionModes = DefaultConfig.DEFAULT_DATA_PARALLEL_ALGORITHM,
-                 units_number: int = DefaultConfig.DEFAULT_PARALLEL_UNITS_NUMBER):
+                 units_number: int = DefaultConfig.DEFAULT_PARALLEL_UNITS_NUMBER,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY):
         if units_number <= 0:
             raise Exception(f"units_number must be positive number, got {units_number}")
+        if unit_stream_capacity < 0:
+            raise Exception(f"unit_stream_capacity must be non-negative number, got {unit_stream_capacity}")
         super().__init__(execution_mode=ParallelExecutionModes.DATA_PARALLELISM, platform=platform)
         self.algorithm = data_parallel_mode
         self.units_number = units_number
+        # when positive, the dispatcher blocks whenever an execution unit falls behind by this number of events
+        self.unit_stream_capacity = unit_stream_capacity
 
 
 class DataParallelExecutionParametersHirzelAlgorithm(DataParallelExecutionParameters):
@@ -37,12 +48,17 @@ class DataParallelExecutionParametersHirzelAlgorithm(DataParallelExecutionParame
     def __init__(self,
                  platform: ParallelExecutionPlatforms = DefaultConfig.DEFAULT_PARALLEL_EXECUTION_PLATFORM,
                  units_number: int = DefaultConfig.DEFAULT_PARALLEL_UNITS_NUMBER,
-                 key: str = DefaultConfig.DEFAULT_PARALLEL_KEY):
+                 key: str = DefaultConfig.DEFAULT_PARALLEL_KEY,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY):
         super().__init__(platform,
                          DataParallelExecutionModes.GROUP_BY_KEY_ALGORITHM,
-                         units_number)
+                         units_number,
+                         unit_stream_capacity)
         self.divide_key = key
 
+    def get_partitioning_attribute_names(self):
+        return set() if self.divide_key is None else {self.divide_key}
+
 
 class DataParallelExecutionParametersRIPAlgorithm(DataParallelExecutionParameters):
     """
@@ -51,10 +67,12 @@ class DataParallelExecutionParametersRIPAlgorithm(DataParallelExecutionParameter
     def __init__(self,
                  platform: ParallelExecutionPlatforms = DefaultConfig.DEFAULT_PARALLEL_EXECUTION_PLATFORM,
                  units_number: int = DefaultConfig.DEFAULT_PARALLEL_UNITS_NUMBER,
-                 multiple: float = DefaultConfig.DEFAULT_PARALLEL_MULTIPLE):
+                 multiple: float = DefaultConfig.DEFAULT_PARALLEL_MULTIPLE,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY):
         super().__init__(platform,
                          DataParallelExecutionModes.RIP_ALGORITHM,
-                         units_number)
+                         units_number,
+                         unit_stream_capacity)
         self.rip_multiple = multiple
 
 
@@ -65,8 +83,21 @@ class DataParallelExecutionParametersHyperCubeAlgorithm(DataParallelExecutionPar
     def __init__(self,
                  platform: ParallelExecutionPlatforms = DefaultConfig.DEFAULT_PARALLEL_EXECUTION_PLATFORM,
                  units_number: int = DefaultConfig.DEFAULT_PARALLEL_UNITS_NUMBER,
-                 attributes_dict: dict = DefaultConfig.DEFAULT_PARALLEL_ATTRIBUTES_DICT):
+                 attributes_dict: dict = DefaultConfig.DEFAULT_PARALLEL_ATTRIBUTES_DICT,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY):
         super().__init__(platform,
                          DataParallelExecutionModes.HYPER_CUBE_ALGORITHM,
-                         units_number)
+                         units_number,
+                         unit_stream_capacity)
         self.divide_keys_dict = attributes_dict
+
+    def get_partitioning_attribute_names(self):
+        attribute_names = set()
+        if self.divide_keys_dict is None:
+            return attribute_names
+        for attributes in self.divide_keys_dict.values():
+            if isinstance(attributes, list):
+                attribute_names.update(attributes)
+            else:
+                attribute_names.add(attributes)
+        return attribute_names
@@ -29,6 +29,15 @@ class DataParallelEvaluationManager(ParallelEvaluationManager, ABC):
         self.__algorithm.eval(events, matches, data_formatter)
         # for now it copies all the output stream to the match stream inside the algorithms classes
 
+    def start_eval(self, pattern_matches: OutputStream, data_formatter: DataFormatter):
+        raise Exception("Incremental evaluation is not supported in the data parallel mode")
+
+    def eval_raw_events(self, raw_events: List):
+        raise Exception("Incremental evaluation is not supported in the data parallel mode")
+
+    def finish_eval(self):
+        raise Exception("Incremental evaluation is not supported in the data parallel mode")
+
     def get_pattern_match_stream(self):
         return self.__pattern_matches
 
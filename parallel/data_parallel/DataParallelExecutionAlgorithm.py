@@ -7,7 +7,7 @@ from parallel.platform.ParallelExecutionPlatform import ParallelExecutionPlatfor
 from stream.Stream import *
 from parallel.manager.EvaluationManager import EvaluationManager
 from parallel.manager.SequentialEvaluationManager import SequentialEvaluationManager
-from typing import Set, Callable
+from typing import Set, Callable, Optional, Iterable
 
 
 class DataParallelExecutionAlgorithm(ABC):
@@ -16,9 +16,11 @@ class DataParallelExecutionAlgorithm(ABC):
     """
 
     def __init__(self, units_number, patterns: Pattern or List[Pattern],
-                 eval_mechanism_params: EvaluationMechanismParameters, platform: ParallelExecutionPlatform):
+                 eval_mechanism_params: EvaluationMechanismParameters, platform: ParallelExecutionPlatform,
+                 unit_stream_capacity: int = 0):
         self.units_number = units_number
         self.platform = platform
+        self.unit_stream_capacity = unit_stream_capacity
         # create SequentialEvaluationManager for every unit
         self.evaluation_managers = [SequentialEvaluationManager(patterns, eval_mechanism_params)
                                     for _ in range(self.units_number)]
@@ -29,6 +31,8 @@ class DataParallelExecutionAlgorithm(ABC):
         Activates the parallel algorithm of the instance.
         """
         execution_units = list()
+        # if the input can be partitioned in advance, each unit reads its own part directly
+        unit_event_streams = self._get_unit_event_streams(events, data_formatter)
         # create and run execution unit for each unit
         for unit_id, evaluation_manager in enumerate(self.evaluation_managers):
             execution_unit = self.ExecutionUnit(self.platform,
@@ -38,15 +42,23 @@ class DataParallelExecutionAlgorithm(ABC):
                                                                   matches=matches,
                                                                   unit_id=unit_id,
                                                                   lock=self.match_lock),
-                                                data_formatter)
+                                                data_formatter,
+                                                None if unit_event_streams is None else unit_event_streams[unit_id],
+                                                self.unit_stream_capacity)
             execution_unit.start()
             execution_units.append(execution_unit)
 
-        # iterate over all events
-        for raw_event in events:
-            event = Event(raw_event, data_formatter)
-            for unit_id in self._classifier(event):
-                execution_units[unit_id].add_event(raw_event)
+        if unit_event_streams is None:
+            # iterate over all events in batches, handing each unit its share of a batch at once
+            for raw_events in events.iterate_batches():
+                unit_batches = [[] for _ in execution_units]
+                for raw_event in raw_events:
+                    event = Event(raw_event, data_formatter)
+                    for unit_id in self._classifier(event):
+                        unit_batches[unit_id].append(raw_event)
+                for execution_unit, unit_batch in zip(execution_units, unit_batches):
+                    if len(unit_batch) > 0:
+                        execution_unit.add_events(unit_batch)
 
         # waits for all execution_units to terminate
         for execution_unit in execution_units:
@@ -61,6 +73,13 @@ class DataParallelExecutionAlgorithm(ABC):
         """
         raise NotImplementedError()
 
+    def _get_unit_event_streams(self, events: InputStream, data_formatter: DataFormatter) -> Optional[List[InputStream]]:
+        """
+        Returns a list containing a dedicated input stream for each execution unit, or None if the events have to be
+        dispatched to the units one by one using the classifier.
+        """
+        return None
+
     def _classifier(self, event: Event) -> Set[int]:
         """
         returns list of unit ids that will evaluate the event
@@ -74,8 +93,11 @@ class DataParallelExecutionAlgorithm(ABC):
         """
         A wrap for single unit that has input stream and an execution unit.
         """
-        def __init__(self, platform, unit_id, evaluation_manager, matches, data_formatter):
-            self.events = Stream()
+        def __init__(self, platform, unit_id, evaluation_manager, matches, data_formatter,
+                     events: InputStream = None, events_capacity: int = 0):
+            # an execution unit either reads from a given stream or gets its events dispatched by the algorithm
+            self.__owns_events = events is None
+            self.events = Stream(max_size=events_capacity) if events is None else events
             self.execution_unit = platform.create_parallel_execution_unit(unit_id,
                                                                           self._run,
                                                                           evaluation_manager,
@@ -94,9 +116,21 @@ class DataParallelExecutionAlgorithm(ABC):
             """
             self.events.add_item(raw_event)
 
+        def add_events(self, raw_events: List):
+            """
+            :param raw_events: a batch of events from the input stream
+            :returns: adds the given events to the execution unit's event stream.
+            """
+            self.events.add_items(raw_events)
+
         def wait(self):
-            self.events.close()
+            if self.__owns_events:
+                self.events.close()
+                self.execution_unit.wait()
+                return
             self.execution_unit.wait()
+            # the part of the input read directly by this unit is no longer needed
+            self.events.close()
 
         @staticmethod
         def _run(evaluation_manager: EvaluationManager,
@@ -127,5 +161,9 @@ class DataParallelExecutionAlgorithm(ABC):
                 self.matches.add_item(item)
                 self.lock.release()
 
+        def add_items(self, items: Iterable):
+            for item in items:
+                self.add_item(item)
+
         def close(self):
             pass
@@ -24,8 +24,9 @@ class GroupByKeyParallelExecutionAlgorithm(DataParallelExecutionAlgorithm):
                  patterns: Pattern or List[Pattern],
                  eval_mechanism_params: EvaluationMechanismParameters,
                  platform: ParallelExecutionPlatform,
-                 key: str):
-        super().__init__(units_number, patterns, eval_mechanism_params, platform)
+                 key: str,
+                 unit_stream_capacity: int = 0):
+        super().__init__(units_number, patterns, eval_mechanism_params, platform, unit_stream_capacity)
         self._key = key
 
     def _classifier(self, event: Event) -> Set[int]:
@@ -21,7 +21,8 @@ class HyperCubeParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
     """
 
     def __init__(self, units_number, patterns: Pattern or List[Pattern],
-                 eval_mechanism_params: EvaluationMechanismParameters, platform, attributes_dict: dict):
+                 eval_mechanism_params: EvaluationMechanismParameters, platform, attributes_dict: dict,
+                 unit_stream_capacity: int = 0):
         if isinstance(patterns, Pattern):
             patterns = [patterns]
         for pattern in patterns:
@@ -49,7 +50,7 @@ class HyperCubeParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
 
         shares, cube_size = self._calc_cubic_shares(units_number, dims)
         self._cube = array(range(cube_size)).reshape(shares)
-        super().__init__(self._cube.size, patterns, eval_mechanism_params, platform)
+        super().__init__(self._cube.size, patterns, eval_mechanism_params, platform, unit_stream_capacity)
 
     def _classifier(self, event: Event) -> Set[int]:
         """
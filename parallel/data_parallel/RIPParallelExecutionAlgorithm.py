@@ -6,6 +6,8 @@ from base.PatternMatch import *
 from typing import Set
 from base.DataFormatter import DataFormatter
 from stream.Stream import *
+from stream.MemoryMappedFileStream import MemoryMappedFileInputStream
+from misc.Utils import convert_time_window
 
 
 class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
@@ -16,14 +18,16 @@ class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
     """
     def __init__(self, units_number, patterns: Pattern or List[Pattern],
                  eval_mechanism_params: EvaluationMechanismParameters,
-                 platform, multiple: float):
-        super().__init__(units_number, patterns, eval_mechanism_params, platform)
+                 platform, multiple: float, unit_stream_capacity: int = 0):
+        super().__init__(units_number, patterns, eval_mechanism_params, platform, unit_stream_capacity)
 
         # in case of multi pattern
         if isinstance(patterns, list):
             self._time_delta = max(pattern.window for pattern in patterns)
         else:
             self._time_delta = patterns.window
+        # the intervals must match the representation of the event timestamps
+        self._time_delta = convert_time_window(self._time_delta, getattr(eval_mechanism_params, "timestamp_unit", None))
 
         self._interval = self._time_delta * multiple
 
@@ -42,6 +46,42 @@ class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
         self._start_time = first_event.timestamp
         super(RIPParallelExecutionAlgorithm, self).eval(events, matches, data_formatter)
 
+    def _get_unit_event_streams(self, events: InputStream, data_formatter: DataFormatter):
+        """
+        If the events are read from a memory-mapped file, partitions the file between the units in advance instead of
+        dispatching the events one by one. The events in the file are assumed to be sorted by their timestamps.
+        An interval number k covers the time range [start + k * interval, start + (k + 1) * interval + time_delta)
+        and is handled by the unit k % units_number. Interval -1 only contains the events whose previous interval
+        (as calculated by the classifier) precedes the start time.
+        """
+        if not isinstance(events, MemoryMappedFileInputStream) or events.count() == 0:
+            return None
+        last_timestamp = data_formatter.get_event_timestamp(data_formatter.parse_event(events.last()))
+        last_interval = int((last_timestamp - self._start_time) / self._interval)
+        unit_line_ranges = [[] for _ in range(self.units_number)]
+        for interval in range(-1, last_interval + 1):
+            interval_start_time = self._start_time + interval * self._interval
+            interval_end_time = interval_start_time + self._interval + self._time_delta
+            first_line = self.__find_first_line(events, data_formatter, interval_start_time)
+            last_line = self.__find_first_line(events, data_formatter, interval_end_time)
+            if first_line >= last_line:
+                continue
+            line_ranges = unit_line_ranges[interval % self.units_number]
+            if len(line_ranges) > 0 and line_ranges[-1][1] >= first_line:
+                # merge with an overlapping range of the same unit
+                line_ranges[-1] = (line_ranges[-1][0], max(line_ranges[-1][1], last_line))
+            else:
+                line_ranges.append((first_line, last_line))
+        return [events.get_sub_stream(line_ranges) for line_ranges in unit_line_ranges]
+
+    @staticmethod
+    def __find_first_line(events: MemoryMappedFileInputStream, data_formatter: DataFormatter, timestamp):
+        """
+        Returns the index of the first line in the file containing an event not preceding the given timestamp.
+        """
+        return events.find_line(
+            lambda line: data_formatter.get_event_timestamp(data_formatter.parse_event(line)) >= timestamp)
+
     def _create_skip_item(self, unit_id: int):
         """
         Only allows a match to pass if it was returned by the first of the two overlapping execution units.
@@ -4,6 +4,7 @@ An evaluation manager is a component responsible for parallel and/or distributed
 It internally activates and uses a CEP evaluation mechanism.
 """
 from abc import ABC
+from typing import List
 
 from stream.Stream import InputStream, OutputStream
 from base.DataFormatter import DataFormatter
@@ -20,6 +21,25 @@ class EvaluationManager(ABC):
         """
         raise NotImplementedError()
 
+    def start_eval(self, pattern_matches: OutputStream, data_formatter: DataFormatter):
+        """
+        Prepares the underlying evaluation mechanism for receiving events incrementally via eval_raw_events.
+        """
+        raise NotImplementedError()
+
+    def eval_raw_events(self, raw_events: List):
+        """
+        Processes a batch of raw events, reporting the detected pattern matches to the output stream given to
+        start_eval.
+        """
+        raise NotImplementedError()
+
+    def finish_eval(self):
+        """
+        Reports the remaining pattern matches once no more events are expected. The output stream is not closed.
+        """
+        raise NotImplementedError()
+
     def get_pattern_match_stream(self):
         """
         Returns the most recently used pattern match stream.
@@ -28,6 +28,16 @@ class SequentialEvaluationManager(EvaluationManager):
         self.__pattern_matches = pattern_matches
         self.__eval_mechanism.eval(event_stream, pattern_matches, data_formatter)
 
+    def start_eval(self, pattern_matches: OutputStream, data_formatter: DataFormatter):
+        self.__pattern_matches = pattern_matches
+        self.__eval_mechanism.start_eval(pattern_matches, data_formatter)
+
+    def eval_raw_events(self, raw_events: List):
+        self.__eval_mechanism.eval_raw_events(raw_events)
+
+    def finish_eval(self):
+        self.__eval_mechanism.finish_eval()
+
     def get_pattern_match_stream(self):
         return self.__pattern_matches
 
@@ -1,8 +1,10 @@
 from datetime import datetime, timedelta
 import random
 
-from base.DataFormatter import DataFormatter, EventTypeClassifier
-from misc.Utils import str_to_number
+from base.ColumnTypes import ColumnTypes
+from base.DataFormatter import EventTypeClassifier
+from base.DataSchema import DataSchema, DataColumn
+from base.SchemaBasedDataFormatter import SchemaBasedDataFormatter
 
 SENSORS_TIMESTAMP_KEY = "TimeStamp"
 SENSORS_TYPE_KEY = "SensorType"
@@ -36,6 +38,15 @@ SENSORS_KEYS_DICT = {
         ]
 }
 
+# the event timestamp is represented in sensors using a "%m/%d/%Y %H:%M:%S" format
+SENSORS_SCHEMAS = {
+    sensor_type: DataSchema(
+        [DataColumn(SENSORS_TYPE_KEY, ColumnTypes.STRING, is_interned=True),
+         DataColumn(SENSORS_TIMESTAMP_KEY, ColumnTypes.STRING)] + [DataColumn(key) for key in keys[2:]],
+        timestamp_column=SENSORS_TIMESTAMP_KEY, timestamp_format="%m/%d/%Y %H:%M:%S")
+    for sensor_type, keys in SENSORS_KEYS_DICT.items()
+}
+
 
 class SensorsEventTypeClassifier(EventTypeClassifier):
     """
@@ -45,32 +56,19 @@ class SensorsEventTypeClassifier(EventTypeClassifier):
     def get_event_type(self, event_payload: dict):
         return event_payload[SENSORS_TYPE_KEY]
 
+    def get_event_type_attribute_name(self):
+        return SENSORS_TYPE_KEY
+
 
-class SensorsDataFormatter(DataFormatter):
+class SensorsDataFormatter(SchemaBasedDataFormatter):
     """
     A data formatter implementation for a Sensors event stream, where each event is given as a string in Sensors
     format.
     """
 
-    def __init__(self, event_type_classifier: EventTypeClassifier = SensorsEventTypeClassifier()):
-        super().__init__(event_type_classifier)
-
-    def parse_event(self, raw_data: str):
-        """
-        Parses a Sensors formatted string into an event.
-        """
-        event_attributes = raw_data.replace("\n", "").split(",")
-        return dict(zip(
-            SENSORS_KEYS_DICT[event_attributes[0]],
-            map(str_to_number, event_attributes)
-        ))
-
-    def get_event_timestamp(self, event_payload: dict):
-        """
-        The event timestamp is represented in sensors using a "%m/%d/%Y %H:%M:%S" format.
-        """
-        timestamp_str = event_payload[SENSORS_TIMESTAMP_KEY]
-        return datetime.strptime(timestamp_str, "%m/%d/%Y %H:%M:%S")
+    def __init__(self, event_type_classifier: EventTypeClassifier = SensorsEventTypeClassifier(),
+                 use_compact_payloads: bool = False, timestamp_unit: timedelta = None):
+        super().__init__(event_type_classifier, SENSORS_SCHEMAS, use_compact_payloads, timestamp_unit)
 
 
 def random_str(lowest, highest):
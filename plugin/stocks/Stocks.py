@@ -1,8 +1,10 @@
-from datetime import datetime
+from datetime import timedelta
 from typing import Any, Dict, Optional
 
-from base.DataFormatter import DataFormatter, EventTypeClassifier
-from misc.Utils import str_to_number
+from base.ColumnTypes import ColumnTypes
+from base.DataFormatter import EventTypeClassifier
+from base.DataSchema import DataSchema, DataColumn
+from base.SchemaBasedDataFormatter import SchemaBasedDataFormatter
 
 METASTOCK_STOCK_TICKER_KEY = "Stock Ticker"
 METASTOCK_EVENT_TIMESTAMP_KEY = "Date"
@@ -19,6 +21,14 @@ METASTOCK_7_COLUMN_KEYS = [
 
 ADDITIONAL_OPTIONAL_KEYS = [PROBABILITY_KEY]
 
+# the event timestamp is represented in metastock 7 using a YYYYMMDDhhmm format
+METASTOCK_7_SCHEMA = DataSchema(
+    [DataColumn(METASTOCK_STOCK_TICKER_KEY, ColumnTypes.STRING, is_interned=True),
+     DataColumn(METASTOCK_EVENT_TIMESTAMP_KEY, ColumnTypes.INT)] +
+    [DataColumn(key) for key in METASTOCK_7_COLUMN_KEYS[2:]],
+    timestamp_column=METASTOCK_EVENT_TIMESTAMP_KEY, timestamp_format="%Y%m%d%H%M",
+    optional_columns=[DataColumn(key) for key in ADDITIONAL_OPTIONAL_KEYS])
+
 
 class MetastockByTickerEventTypeClassifier(EventTypeClassifier):
     """
@@ -30,32 +40,22 @@ class MetastockByTickerEventTypeClassifier(EventTypeClassifier):
         """
         return event_payload[METASTOCK_STOCK_TICKER_KEY]
 
+    def get_event_type_attribute_name(self):
+        return METASTOCK_STOCK_TICKER_KEY
+
 
-class MetastockDataFormatter(DataFormatter):
+class MetastockDataFormatter(SchemaBasedDataFormatter):
     """
     A data formatter implementation for a stock event stream, where each event is given as a string in metastock 7
     format.
     """
-    def __init__(self, event_type_classifier: EventTypeClassifier = MetastockByTickerEventTypeClassifier()):
-        super().__init__(event_type_classifier)
+    def __init__(self, event_type_classifier: EventTypeClassifier = MetastockByTickerEventTypeClassifier(),
+                 use_compact_payloads: bool = False, timestamp_unit: timedelta = None):
+        super().__init__(event_type_classifier, METASTOCK_7_SCHEMA, use_compact_payloads, timestamp_unit)
 
-    def parse_event(self, raw_data: str):
-        """
-        Parses a metastock 7 formatted string into an event.
-        """
-        event_attributes = raw_data.replace("\n", "").split(",")
-        return dict(zip(
-            METASTOCK_7_COLUMN_KEYS + ADDITIONAL_OPTIONAL_KEYS,
-            map(str_to_number, event_attributes)
-        ))
-
-    def get_event_timestamp(self, event_payload: dict):
-        """
-        The event timestamp is represented in metastock 7 using a YYYYMMDDhhmm format.
-        """
-        timestamp_str = str(event_payload[METASTOCK_EVENT_TIMESTAMP_KEY])
-        return datetime(year=int(timestamp_str[0:4]), month=int(timestamp_str[4:6]), day=int(timestamp_str[6:8]),
-                        hour=int(timestamp_str[8:10]), minute=int(timestamp_str[10:12]))
+    def get_required_attribute_names(self):
+        required_attribute_names = super().get_required_attribute_names()
+        return None if required_attribute_names is None else required_attribute_names | {PROBABILITY_KEY}
 
     def get_probability(self, event_payload: Dict[str, Any]) -> Optional[float]:
         return event_payload.get(PROBABILITY_KEY, None)
@@ -0,0 +1,124 @@
+"""
+This file contains the streams used for running the CEP engine inside an asyncio event loop.
+"""
+import asyncio
+from typing import Iterable, List
+
+from misc import DefaultConfig
+from stream.Stream import OutputStream
+
+
+class AsyncInputStream:
+    """
+    A stream of events produced and consumed by coroutines running in the same event loop.
+    Producers add events using put (waiting for free space if the stream is bounded) or add_item. The engine awaits
+    new events via get_batch or iterate_batches. Unlike InputStream, this stream cannot be consumed synchronously.
+    """
+    def __init__(self, max_size: int = 0):
+        self.__queue = asyncio.Queue(maxsize=max_size)
+        self.__is_closed = False
+
+    async def put(self, item: object):
+        """
+        Adds an item to the stream, waiting for free space if necessary.
+        """
+        await self.__queue.put(item)
+
+    def add_item(self, item: object):
+        """
+        Adds an item to the stream without waiting. Fails if the stream is bounded and full.
+        """
+        self.__queue.put_nowait(item)
+
+    def add_items(self, items: Iterable):
+        for item in items:
+            self.__queue.put_nowait(item)
+
+    async def close(self):
+        """
+        Marks the end of the stream.
+        """
+        await self.__queue.put(None)
+
+    async def get_batch(self, max_size: int = DefaultConfig.STREAM_BATCH_SIZE) -> List:
+        """
+        Waits until at least one item is available and returns up to max_size items available at that moment.
+        Raises StopAsyncIteration if the stream has ended.
+        """
+        if self.__is_closed:
+            raise StopAsyncIteration()
+        batch = []
+        item = await self.__queue.get()
+        while item is not None:
+            batch.append(item)
+            if len(batch) == max_size or self.__queue.empty():
+                break
+            item = self.__queue.get_nowait()
+        if item is None:
+            self.__is_closed = True
+            if len(batch) == 0:
+                raise StopAsyncIteration()
+        return batch
+
+    async def iterate_batches(self, max_size: int = DefaultConfig.STREAM_BATCH_SIZE):
+        """
+        Iterates over the stream in batches of up to max_size items.
+        """
+        while True:
+            try:
+                batch = await self.get_batch(max_size)
+            except StopAsyncIteration:
+                return
+            yield batch
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.__is_closed:
+            raise StopAsyncIteration()
+        item = await self.__queue.get()
+        if item is None:
+            self.__is_closed = True
+            raise StopAsyncIteration()
+        return item
+
+
+class AsyncOutputStream(OutputStream):
+    """
+    A stream of pattern matches that can be consumed with "async for" by a coroutine running in the same event loop
+    as the engine. The matches are added synchronously by the engine, hence the stream is unbounded.
+    """
+    def __init__(self):
+        super().__init__(is_thread_safe=False)
+        self.__queue = asyncio.Queue()
+
+    def add_item(self, item: object):
+        self.__queue.put_nowait(item)
+
+    def add_items(self, items: Iterable):
+        for item in items:
+            self.__queue.put_nowait(item)
+
+    def close(self):
+        self.__queue.put_nowait(None)
+
+    def count(self):
+        return self.__queue.qsize()
+
+    def duplicate(self):
+        raise Exception("Unsupported operation")
+
+    def __next__(self):
+        raise Exception("Unsupported operation")
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self.__queue.get()
+        if item is None:
+            # keep the end marker for any other consumer
+            self.__queue.put_nowait(None)
+            raise StopAsyncIteration()
+        return item
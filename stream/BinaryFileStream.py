@@ -0,0 +1,330 @@
+"""
+This file contains the implementation of a compact binary format for storing event streams.
+An event file in any format readable by a DataFormatter can be converted once into the binary format, after which
+it can be replayed any number of times without parsing the raw events again.
+
+A binary event file starts with a magic header followed by a sequence of records of three kinds:
+    - A string record defines the next entry in the string table. All string values, attribute names and event types
+      are stored in the string table only once and referred to by their index.
+    - A schema record defines the attribute names and types of a family of events. Each distinct combination of
+      attribute names and value types is assigned a dedicated schema.
+    - An event record contains the schema index, the event type, the timestamp (in microseconds since the epoch), the
+      probability and the attribute values of a single event, packed according to its schema.
+Since strings and schemas are defined upon their first occurrence, files can be written and read in a single pass.
+"""
+import math
+import struct
+import sys
+from datetime import datetime, timedelta
+
+from base.DataFormatter import DataFormatter, EventTypeClassifier
+from misc import DefaultConfig
+from stream.CompressionTypes import CompressionTypes
+from stream.FileStream import open_file
+from stream.Stream import InputStream
+
+BINARY_FILE_MAGIC = b"OCEPBIN1"
+
+STRING_RECORD_TAG = 0
+SCHEMA_RECORD_TAG = 1
+EVENT_RECORD_TAG = 2
+
+INT_VALUE_TYPE = b"q"
+FLOAT_VALUE_TYPE = b"d"
+BOOL_VALUE_TYPE = b"?"
+STRING_VALUE_TYPE = b"s"
+BIG_INT_VALUE_TYPE = b"N"
+NONE_VALUE_TYPE = b"n"
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+RECORD_PREFIX_STRUCT = struct.Struct("<BI")
+STRING_HEADER_STRUCT = struct.Struct("<I")
+SCHEMA_FIELD_STRUCT = struct.Struct("<Ic")
+EVENT_HEADER_FORMAT = "<Iqd"
+
+MIN_INT64 = -2 ** 63
+MAX_INT64 = 2 ** 63 - 1
+
+
+class BinaryEventSchema:
+    """
+    Describes the layout of the event records sharing the same attribute names and value types.
+    """
+    def __init__(self, attribute_names: list, value_types: list):
+        self.attribute_names = attribute_names
+        self.value_types = value_types
+        field_formats = [("I" if value_type in (STRING_VALUE_TYPE, BIG_INT_VALUE_TYPE) else
+                          "?" if value_type == NONE_VALUE_TYPE else value_type.decode())
+                         for value_type in value_types]
+        self.record_struct = struct.Struct(EVENT_HEADER_FORMAT + "".join(field_formats))
+        self.string_indices = [i for i, value_type in enumerate(value_types) if value_type == STRING_VALUE_TYPE]
+        self.big_int_indices = [i for i, value_type in enumerate(value_types) if value_type == BIG_INT_VALUE_TYPE]
+        self.none_indices = [i for i, value_type in enumerate(value_types) if value_type == NONE_VALUE_TYPE]
+
+
+class PreparsedPayload(dict):
+    """
+    An event payload decoded from a binary event file. In addition to the event attributes, it carries the type,
+    the timestamp and the probability of the event, which were calculated when the file was created.
+    """
+    __slots__ = ("event_type", "timestamp", "probability")
+
+    def __init__(self, attributes: dict, event_type, timestamp: datetime, probability: float):
+        super().__init__(attributes)
+        self.event_type = event_type
+        self.timestamp = timestamp
+        self.probability = probability
+
+
+class PreparsedEventTypeClassifier(EventTypeClassifier):
+    """
+    Returns the event type stored in a preparsed payload.
+    """
+    def get_event_type(self, event_payload: PreparsedPayload):
+        return event_payload.event_type
+
+
+class PreparsedDataFormatter(DataFormatter):
+    """
+    A data formatter for the events read from a binary event file. As the events are already parsed, only a shallow
+    copy of the payload is created for each event.
+    """
+    def __init__(self, event_type_classifier: EventTypeClassifier = PreparsedEventTypeClassifier()):
+        super().__init__(event_type_classifier)
+        # the stored event types can only be used if they are not overridden by a custom classifier
+        self.__use_stored_event_types = isinstance(event_type_classifier, PreparsedEventTypeClassifier)
+
+    def parse_event(self, raw_data: PreparsedPayload):
+        # a copy is required since the same raw item may be processed more than once (e.g., by several parallel units)
+        return PreparsedPayload(raw_data, raw_data.event_type, raw_data.timestamp, raw_data.probability)
+
+    def get_raw_event_type(self, raw_data: PreparsedPayload):
+        return raw_data.event_type if self.__use_stored_event_types else None
+
+    def get_raw_event_timestamp(self, raw_data: PreparsedPayload):
+        return raw_data.timestamp
+
+    def get_event_timestamp(self, event_payload: PreparsedPayload):
+        return event_payload.timestamp
+
+    def get_probability(self, event_payload: PreparsedPayload):
+        return event_payload.probability
+
+
+class BinaryEventFileWriter:
+    """
+    Writes events into a file in the binary event format.
+    """
+    def __init__(self, file_path: str, compression: CompressionTypes = None):
+        self.__file = open_file(file_path, "wb", compression)
+        self.__file.write(BINARY_FILE_MAGIC)
+        self.__string_ids = {}
+        self.__schemas = {}
+
+    def write_event(self, payload: dict, event_type: str, timestamp: datetime, probability: float = None):
+        """
+        Appends a single event to the file.
+        """
+        if not isinstance(timestamp, datetime) or timestamp.tzinfo is not None:
+            raise Exception("Only naive datetime timestamps are supported by the binary event format.")
+        attribute_names = list(payload.keys())
+        value_types = [self.__get_value_type(value) for value in payload.values()]
+        schema_id, schema = self.__get_schema(attribute_names, value_types)
+        values = [self.__encode_value(value, value_type) for value, value_type in zip(payload.values(), value_types)]
+        # the string records must precede the event record referring to them
+        event_type_id = self.__get_string_id(event_type)
+        encoded_timestamp = (timestamp - EPOCH) // MICROSECOND
+        encoded_probability = math.nan if probability is None else probability
+        self.__file.write(RECORD_PREFIX_STRUCT.pack(EVENT_RECORD_TAG, schema_id))
+        self.__file.write(schema.record_struct.pack(event_type_id, encoded_timestamp, encoded_probability, *values))
+
+    def close(self):
+        self.__file.close()
+
+    @staticmethod
+    def __get_value_type(value):
+        """
+        Returns the binary type of the given attribute value.
+        """
+        if value is None:
+            return NONE_VALUE_TYPE
+        if isinstance(value, bool):
+            return BOOL_VALUE_TYPE
+        if isinstance(value, int):
+            return INT_VALUE_TYPE if MIN_INT64 <= value <= MAX_INT64 else BIG_INT_VALUE_TYPE
+        if isinstance(value, float):
+            return FLOAT_VALUE_TYPE
+        if isinstance(value, str):
+            return STRING_VALUE_TYPE
+        raise Exception("Unsupported attribute type for the binary event format: %s" % (type(value),))
+
+    def __encode_value(self, value, value_type: bytes):
+        """
+        Returns the representation of the given attribute value in an event record.
+        """
+        if value_type == STRING_VALUE_TYPE:
+            return self.__get_string_id(value)
+        if value_type == BIG_INT_VALUE_TYPE:
+            return self.__get_string_id(str(value))
+        if value_type == NONE_VALUE_TYPE:
+            return False
+        return value
+
+    def __get_string_id(self, string: str):
+        """
+        Returns the index of the given string in the string table, adding it to the table if necessary.
+        """
+        string_id = self.__string_ids.get(string)
+        if string_id is None:
+            if not isinstance(string, str):
+                raise Exception("Only string event types are supported by the binary event format.")
+            string_id = len(self.__string_ids)
+            self.__string_ids[string] = string_id
+            encoded_string = string.encode()
+            self.__file.write(RECORD_PREFIX_STRUCT.pack(STRING_RECORD_TAG, 0))
+            self.__file.write(STRING_HEADER_STRUCT.pack(len(encoded_string)))
+            self.__file.write(encoded_string)
+        return string_id
+
+    def __get_schema(self, attribute_names: list, value_types: list):
+        """
+        Returns the index and the layout of the schema matching the given attribute names and value types, defining
+        a new schema if necessary.
+        """
+        key = (tuple(attribute_names), tuple(value_types))
+        schema_entry = self.__schemas.get(key)
+        if schema_entry is None:
+            name_ids = [self.__get_string_id(name) for name in attribute_names]
+            schema_entry = (len(self.__schemas), BinaryEventSchema(attribute_names, value_types))
+            self.__schemas[key] = schema_entry
+            self.__file.write(RECORD_PREFIX_STRUCT.pack(SCHEMA_RECORD_TAG, len(attribute_names)))
+            for name_id, value_type in zip(name_ids, value_types):
+                self.__file.write(SCHEMA_FIELD_STRUCT.pack(name_id, value_type))
+        return schema_entry
+
+
+def convert_to_binary_file(events: InputStream, data_formatter: DataFormatter, file_path: str,
+                           compression: CompressionTypes = None):
+    """
+    Parses the events in the given stream using the given data formatter and writes them into a binary event file.
+    Returns the number of converted events.
+    """
+    writer = BinaryEventFileWriter(file_path, compression)
+    count = 0
+    for raw_event in events:
+        payload = data_formatter.parse_event(raw_event)
+        writer.write_event(payload, data_formatter.get_event_type(payload),
+                           data_formatter.get_event_timestamp(payload), data_formatter.get_probability(payload))
+        count += 1
+    writer.close()
+    return count
+
+
+class BinaryFileInputStream(InputStream):
+    """
+    Reads preparsed events from a binary event file. The events are decoded as the stream is consumed.
+    This stream is intended to be used along with PreparsedDataFormatter.
+    """
+    def __init__(self, file_path: str, compression: CompressionTypes = None):
+        super().__init__()
+        self.__file_path = file_path
+        self.__compression = compression
+        self.__file = open_file(file_path, "rb", compression)
+        if self.__file.read(len(BINARY_FILE_MAGIC)) != BINARY_FILE_MAGIC:
+            self.__file.close()
+            raise Exception("%s is not a binary event file." % (file_path,))
+        self.__strings = []
+        self.__schemas = []
+        self.__is_closed = False
+        # the first event is read in advance to support first() without consuming the stream
+        self.__pending_event = self.__read_event()
+        self.__first_event = self.__pending_event
+
+    def __next__(self):
+        event = self.__pending_event
+        if event is None:
+            self.close()
+            raise StopIteration()
+        self.__pending_event = self.__read_event()
+        return event
+
+    def __read_event(self):
+        """
+        Reads the records up to and including the next event record and returns the decoded event, or None if the end
+        of the file was reached.
+        """
+        if self.__is_closed:
+            return None
+        while True:
+            prefix = self.__file.read(RECORD_PREFIX_STRUCT.size)
+            if len(prefix) < RECORD_PREFIX_STRUCT.size:
+                return None
+            tag, argument = RECORD_PREFIX_STRUCT.unpack(prefix)
+            if tag == EVENT_RECORD_TAG:
+                return self.__decode_event(self.__schemas[argument])
+            if tag == STRING_RECORD_TAG:
+                length, = STRING_HEADER_STRUCT.unpack(self.__file.read(STRING_HEADER_STRUCT.size))
+                self.__strings.append(sys.intern(self.__file.read(length).decode()))
+            elif tag == SCHEMA_RECORD_TAG:
+                self.__schemas.append(self.__read_schema(argument))
+            else:
+                raise Exception("Corrupted binary event file: %s" % (self.__file_path,))
+
+    def __read_schema(self, field_count: int):
+        """
+        Reads the definition of a schema with the given number of attributes.
+        """
+        attribute_names = []
+        value_types = []
+        for _ in range(field_count):
+            name_id, value_type = SCHEMA_FIELD_STRUCT.unpack(self.__file.read(SCHEMA_FIELD_STRUCT.size))
+            attribute_names.append(self.__strings[name_id])
+            value_types.append(value_type)
+        return BinaryEventSchema(attribute_names, value_types)
+
+    def __decode_event(self, schema: BinaryEventSchema):
+        """
+        Reads an event record of the given schema and converts it into a preparsed payload.
+        """
+        values = schema.record_struct.unpack(self.__file.read(schema.record_struct.size))
+        event_type = self.__strings[values[0]]
+        timestamp = EPOCH + timedelta(microseconds=values[1])
+        probability = None if math.isnan(values[2]) else values[2]
+        attribute_values = list(values[3:])
+        for i in schema.string_indices:
+            attribute_values[i] = self.__strings[attribute_values[i]]
+        for i in schema.big_int_indices:
+            attribute_values[i] = int(self.__strings[attribute_values[i]])
+        for i in schema.none_indices:
+            attribute_values[i] = None
+        return PreparsedPayload(zip(schema.attribute_names, attribute_values), event_type, timestamp, probability)
+
+    def get_batch(self, max_size: int = DefaultConfig.STREAM_BATCH_SIZE, timeout: float = None):
+        return self._get_batch_by_items(max_size)
+
+    def close(self):
+        """
+        Stops reading from the file and releases it.
+        """
+        if self.__is_closed:
+            return
+        self.__is_closed = True
+        self.__pending_event = None
+        self.__file.close()
+
+    def duplicate(self):
+        """
+        Returns a new stream reading the same file from the beginning.
+        """
+        return BinaryFileInputStream(self.__file_path, self.__compression)
+
+    def first(self):
+        return self.__first_event
+
+    def count(self):
+        raise Exception("Unsupported operation")
+
+    def last(self):
+        raise Exception("Unsupported operation")
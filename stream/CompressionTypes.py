@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class CompressionTypes(Enum):
+    """
+    The compression formats supported by the file streams.
+    """
+    NONE = 0
+    GZIP = 1
+    BZ2 = 2
+    XZ = 3
+    ZSTD = 4  # only available if the zstandard package is installed
@@ -1,33 +1,204 @@
+import bz2
+import gzip
+import io
+import lzma
 import os
+from datetime import datetime, timedelta
+from queue import Queue, Empty, Full
+from threading import Thread, Lock
+from typing import Iterable
 
-from stream.Stream import InputStream, OutputStream
+from misc import DefaultConfig
+from stream.CompressionTypes import CompressionTypes
+from stream.Stream import InputStream, OutputStream, SynchronizedQueue
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_TYPES_BY_EXTENSION = {
+    ".gz": CompressionTypes.GZIP,
+    ".bz2": CompressionTypes.BZ2,
+    ".xz": CompressionTypes.XZ,
+    ".lzma": CompressionTypes.XZ,
+    ".zst": CompressionTypes.ZSTD,
+}
+
+
+def get_compression_type(file_path: str):
+    """
+    Deduces the compression format of a file from its extension.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    return COMPRESSION_TYPES_BY_EXTENSION.get(extension, CompressionTypes.NONE)
+
+
+def open_file(file_path: str, mode: str, compression: CompressionTypes = None):
+    """
+    Opens a file for reading ("r", "rb") or writing ("w", "wb"), transparently decompressing or compressing its
+    contents. If no compression format is specified, it is deduced from the file extension. Compressed text files are
+    read and written in large chunks to minimize the number of calls to the underlying codec.
+    """
+    if compression is None:
+        compression = get_compression_type(file_path)
+    if compression == CompressionTypes.NONE:
+        return open(file_path, mode)
+    is_binary = "b" in mode
+    binary_mode = mode if is_binary else mode + "b"
+    if compression == CompressionTypes.GZIP:
+        binary_file = gzip.open(file_path, binary_mode)
+    elif compression == CompressionTypes.BZ2:
+        binary_file = bz2.open(file_path, binary_mode)
+    elif compression == CompressionTypes.XZ:
+        binary_file = lzma.open(file_path, binary_mode)
+    elif compression == CompressionTypes.ZSTD:
+        if zstandard is None:
+            raise Exception("The zstandard package is required for reading and writing zstd-compressed files.")
+        binary_file = zstandard.open(file_path, binary_mode)
+    else:
+        raise Exception("Unknown compression type: %s" % (compression,))
+    if is_binary:
+        # binary files are expected to be accessed in large chunks by the caller
+        return binary_file
+    if mode == "r":
+        buffered_file = io.BufferedReader(binary_file, DefaultConfig.COMPRESSED_FILE_CHUNK_SIZE)
+    else:
+        buffered_file = io.BufferedWriter(binary_file, DefaultConfig.COMPRESSED_FILE_CHUNK_SIZE)
+    return io.TextIOWrapper(buffered_file)
 
 
 class FileInputStream(InputStream):
     """
     Reads the objects from a predefined input file.
+    By default, the entire content of the file is loaded into memory upon creation. If lazy mode is enabled, the lines
+    are only read from the file as the stream is consumed, keeping the memory consumption constant regardless of the
+    file size. A lazy stream can optionally read the file on a background thread, in which case at most
+    read_ahead_size lines are buffered ahead of the consumer.
+    Compressed files are decompressed on the fly. Unless specified explicitly, the compression format is deduced from
+    the file extension.
     """
-    def __init__(self, file_path: str):
-        super().__init__()
-        # TODO: reading the entire content of the input file here is very inefficient
-        with open(file_path, "r") as f:
-            for line in f.readlines():
-                self._stream.put(line)
-        self.close()
+    def __init__(self, file_path: str, is_lazy: bool = False, use_reader_thread: bool = False,
+                 read_ahead_size: int = DefaultConfig.FILE_INPUT_READ_AHEAD_SIZE,
+                 compression: CompressionTypes = None):
+        # an eagerly loaded file is only read after it is fully loaded, hence no synchronization is required
+        super().__init__(is_thread_safe=is_lazy)
+        self.__file_path = file_path
+        self.__compression = compression
+        self.__is_lazy = is_lazy
+        self.__use_reader_thread = use_reader_thread
+        self.__read_ahead_size = read_ahead_size
+        if not self.__is_lazy:
+            with open_file(file_path, "r", compression) as f:
+                for line in f:
+                    self._stream.put(line)
+            self.close()
+            return
+        if read_ahead_size <= 0:
+            raise Exception("read_ahead_size should be positive.")
+        self.__file = open_file(file_path, "r", compression)
+        # the first line is read in advance to support first() without consuming the stream
+        self.__first_line = self.__file.readline()
+        self.__pending_line = self.__first_line
+        self.__is_closed = False
+        if self.__use_reader_thread:
+            self._stream = SynchronizedQueue(read_ahead_size)
+            self.__reader_thread = Thread(target=self.__read_lines, daemon=True)
+            self.__reader_thread.start()
+
+    def __next__(self):
+        if not self.__is_lazy:
+            return super().__next__()
+        if self.__is_closed:
+            raise StopIteration()
+        if self.__use_reader_thread:
+            return super().__next__()
+        line = self.__pending_line
+        if line is None or line == "":
+            self.close()
+            raise StopIteration()
+        self.__pending_line = self.__file.readline()
+        return line
+
+    def __read_lines(self):
+        """
+        The main loop of the background reader thread. Blocks whenever the read-ahead buffer is full.
+        """
+        line = self.__pending_line
+        while line != "" and not self.__is_closed:
+            self._stream.put(line)
+            line = self.__file.readline()
+        self.__file.close()
+        if not self.__is_closed:
+            self._stream.put(None)
+
+    def close(self):
+        """
+        In lazy mode, stops reading from the file and releases it. Otherwise, marks the end of the stream.
+        """
+        if not self.__is_lazy:
+            super().close()
+            return
+        if self.__is_closed:
+            return
+        self.__is_closed = True
+        if self.__use_reader_thread:
+            # free the read-ahead buffer to release the reader thread in case it is blocked
+            while not self._stream.empty():
+                self._stream.get_nowait()
+            return
+        self.__pending_line = None
+        self.__file.close()
+
+    def duplicate(self):
+        """
+        In lazy mode, returns a new stream reading the same file from the beginning.
+        """
+        if not self.__is_lazy:
+            return super().duplicate()
+        return FileInputStream(self.__file_path, self.__is_lazy, self.__use_reader_thread, self.__read_ahead_size,
+                               self.__compression)
+
+    def get_batch(self, max_size: int = DefaultConfig.STREAM_BATCH_SIZE, timeout: float = None):
+        if not self.__is_lazy:
+            return super().get_batch(max_size, timeout)
+        if self.__is_closed:
+            raise StopIteration()
+        if self.__use_reader_thread:
+            return super().get_batch(max_size, timeout)
+        return self._get_batch_by_items(max_size)
+
+    def count(self):
+        if self.__is_lazy:
+            raise Exception("Unsupported operation")
+        return super().count()
+
+    def first(self):
+        if self.__is_lazy:
+            return self.__first_line if self.__first_line != "" else None
+        return super().first()
+
+    def last(self):
+        if self.__is_lazy:
+            raise Exception("Unsupported operation")
+        return super().last()
 
 
 class FileOutputStream(OutputStream):
     """
     Writes the objects into a predefined output file.
+    The output is compressed on the fly if a compression format is specified or deduced from the file extension.
     """
-    def __init__(self, base_path: str, file_name: str, is_async: bool = False):
-        super().__init__()
+    def __init__(self, base_path: str, file_name: str, is_async: bool = False, compression: CompressionTypes = None):
+        # the items are only read back by this stream upon closing it
+        super().__init__(is_thread_safe=False)
         if not os.path.exists(base_path):
             os.makedirs(base_path, exist_ok=True)
         self.__is_async = is_async
         self.__output_path = os.path.join(base_path, file_name)
+        self.__compression = compression
         if self.__is_async:
-            self.__output_file = open(self.__output_path, 'w')
+            self.__output_file = open_file(self.__output_path, 'w', compression)
         else:
             self.__output_file = None
 
@@ -40,13 +211,204 @@ class FileOutputStream(OutputStream):
         else:
             super().add_item(item)
 
+    def add_items(self, items: Iterable):
+        if self.__is_async:
+            self.__output_file.write("".join(str(item) for item in items))
+        else:
+            super().add_items(items)
+
     def close(self):
         """
         If asynchronous write is disabled, writes everything to the output file before closing it.
         """
         super().close()
         if not self.__is_async:
-            self.__output_file = open(self.__output_path, 'w')
+            self.__output_file = open_file(self.__output_path, 'w', self.__compression)
             for item in self:
                 self.__output_file.write(str(item))
         self.__output_file.close()
+
+
+class BufferedFileOutputStream(OutputStream):
+    """
+    Writes the objects into a predefined output file using a bounded in-memory buffer.
+    Each item is serialized upon arrival, so that no reference to it is retained by the stream. The buffer is flushed
+    to the file whenever its size exceeds buffer_size bytes or, if flush_interval is specified, whenever the given
+    time has passed since the last flush.
+    If a writer thread is used, the full buffers are handed over to a background thread performing the actual writes.
+    At most DefaultConfig.FILE_OUTPUT_WRITER_QUEUE_SIZE buffers can be pending at any given time - if the writer thread
+    falls behind, the producer blocks until one of the pending buffers is written. An error raised by the writer
+    thread is re-raised by the next call to add_item, flush or close.
+    """
+    def __init__(self, base_path: str, file_name: str, buffer_size: int = DefaultConfig.FILE_OUTPUT_BUFFER_SIZE,
+                 flush_interval: timedelta = None, use_writer_thread: bool = False,
+                 compression: CompressionTypes = None):
+        super().__init__()
+        if buffer_size <= 0:
+            raise Exception("buffer_size should be positive.")
+        if not os.path.exists(base_path):
+            os.makedirs(base_path, exist_ok=True)
+        self.__output_path = os.path.join(base_path, file_name)
+        self.__output_file = open_file(self.__output_path, "wb", compression)
+        self.__buffer_size = buffer_size
+        self.__flush_interval = flush_interval
+        self.__use_writer_thread = use_writer_thread
+        self.__buffer = []
+        self.__buffered_bytes = 0
+        self.__last_flush_time = datetime.now()
+        self.__is_closed = False
+        if self.__use_writer_thread:
+            self.__buffer_lock = Lock()
+            self.__pending_buffers = Queue(maxsize=DefaultConfig.FILE_OUTPUT_WRITER_QUEUE_SIZE)
+            self.__writer_error = None
+            self.__writer_thread = Thread(target=self.__write_buffers, daemon=True)
+            self.__writer_thread.start()
+
+    def add_item(self, item: object):
+        """
+        Serializes the item into the buffer and flushes the buffer if required by the flush policy.
+        """
+        if self.__is_closed:
+            raise Exception("The stream is closed.")
+        if self.__use_writer_thread:
+            self.__verify_writer_thread()
+        self._add_serialized_item(self._serialize_item(item))
+
+    def add_items(self, items: Iterable):
+        for item in items:
+            self.add_item(item)
+
+    def _serialize_item(self, item: object):
+        """
+        Returns the bytes to be written to the file for the given item. The default implementation uses the string
+        representation of the item.
+        """
+        return str(item).encode()
+
+    def _add_serialized_item(self, serialized_item: bytes):
+        """
+        Appends already serialized data to the buffer, flushing the buffer if required by the flush policy.
+        """
+        if self.__use_writer_thread:
+            with self.__buffer_lock:
+                full_buffer = self.__add_to_buffer(serialized_item)
+            if full_buffer is not None:
+                self.__put_pending_buffer(full_buffer)
+            return
+        full_buffer = self.__add_to_buffer(serialized_item)
+        if full_buffer is not None:
+            self.__output_file.write(full_buffer)
+
+    def __add_to_buffer(self, serialized_item: bytes):
+        """
+        Appends a serialized item to the buffer. If the buffer has to be flushed, returns its contents and starts a
+        new buffer. Otherwise, returns None.
+        """
+        self.__buffer.append(serialized_item)
+        self.__buffered_bytes += len(serialized_item)
+        if self.__buffered_bytes >= self.__buffer_size or self.__is_flush_interval_over():
+            return self.__take_buffer()
+        return None
+
+    def __take_buffer(self):
+        """
+        Returns the contents of the buffer and starts a new buffer.
+        """
+        contents = b"".join(self.__buffer)
+        self.__buffer = []
+        self.__buffered_bytes = 0
+        self.__last_flush_time = datetime.now()
+        return contents
+
+    def __is_flush_interval_over(self):
+        """
+        Returns True if a time-based flush is due and False otherwise.
+        """
+        return self.__flush_interval is not None and datetime.now() - self.__last_flush_time >= self.__flush_interval
+
+    def __verify_writer_thread(self):
+        """
+        Re-raises the error which terminated the writer thread, if any.
+        """
+        if self.__writer_error is not None:
+            raise Exception("The writer thread of %s failed." % (self.__output_path,)) from self.__writer_error
+
+    def __put_pending_buffer(self, contents: bytes or None):
+        """
+        Hands the given contents over to the writer thread. Instead of blocking forever on a full queue, periodically
+        verifies that the writer thread is still alive.
+        """
+        while True:
+            self.__verify_writer_thread()
+            try:
+                self.__pending_buffers.put(contents, timeout=DefaultConfig.FILE_OUTPUT_WRITER_POLL_INTERVAL)
+                return
+            except Full:
+                continue
+
+    def __write_buffers(self):
+        """
+        The background writer thread. An error terminating the thread is kept to be reported to the producer.
+        """
+        try:
+            self.__write_pending_buffers()
+        except BaseException as e:
+            self.__writer_error = e
+
+    def __write_pending_buffers(self):
+        """
+        The main loop of the background writer thread. Also performs the time-based flushes in case no items arrive.
+        """
+        timeout = None if self.__flush_interval is None else self.__flush_interval.total_seconds()
+        while True:
+            try:
+                contents = self.__pending_buffers.get(timeout=timeout)
+            except Empty:
+                with self.__buffer_lock:
+                    contents = self.__take_buffer() if self.__is_flush_interval_over() else None
+                if contents is not None:
+                    self.__output_file.write(contents)
+                    self.__output_file.flush()
+                continue
+            if contents is None:
+                return
+            self.__output_file.write(contents)
+
+    def flush(self):
+        """
+        Writes the contents of the buffer to the file, or hands them over to the writer thread if one is used.
+        """
+        if self.__use_writer_thread:
+            with self.__buffer_lock:
+                contents = self.__take_buffer()
+            self.__put_pending_buffer(contents)
+            return
+        self.__output_file.write(self.__take_buffer())
+        self.__output_file.flush()
+
+    def close(self):
+        """
+        Flushes the remaining buffered items and closes the output file.
+        """
+        if self.__is_closed:
+            return
+        self.__is_closed = True
+        if self.__use_writer_thread:
+            with self.__buffer_lock:
+                contents = self.__take_buffer()
+            try:
+                self.__put_pending_buffer(contents)
+                self.__put_pending_buffer(None)
+                self.__writer_thread.join()
+                self.__verify_writer_thread()
+            finally:
+                self.__output_file.close()
+            return
+        self.__output_file.write(self.__take_buffer())
+        self.__output_file.close()
+
+    def duplicate(self):
+        raise Exception("Unsupported operation")
+
+    def count(self):
+        raise Exception("Unsupported operation")
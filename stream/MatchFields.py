@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class MatchFields(Enum):
+    """
+    The fields of a pattern match that can be written by the structured match output streams.
+    """
+    MATCH_INDEX = 0  # the serial number of the match in the output stream
+    PATTERN_IDS = 1
+    FIRST_TIMESTAMP = 2
+    LAST_TIMESTAMP = 3
+    PROBABILITY = 4
+    EVENTS = 5
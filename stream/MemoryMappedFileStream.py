@@ -0,0 +1,299 @@
+"""
+This file contains an input stream reading its events from a memory-mapped file.
+"""
+import mmap
+import os
+from array import array
+from datetime import datetime
+from typing import List, Tuple
+
+from base.DataFormatter import DataFormatter
+from misc import DefaultConfig
+from stream.Stream import InputStream
+
+INDEX_FILE_SUFFIX = ".idx"
+INDEX_FILE_MAGIC = b"OCEPIDX1"
+
+
+class MemoryMappedLineIndex:
+    """
+    A memory-mapped text file along with an index of the offsets of its lines.
+    A single instance is shared among all streams reading from the same file. Each stream acquires the index upon
+    creation and releases it when closed, and the mapping and the file are closed once the last stream is closed.
+    """
+    def __init__(self, file_path: str, index_path: str = None, persist_index: bool = False):
+        self.__file_path = file_path
+        self.__file_size = os.path.getsize(file_path)
+        self.__file_mtime = os.stat(file_path).st_mtime_ns
+        if self.__file_size == 0:
+            # an empty file cannot be memory-mapped
+            self.__file = None
+            self.__mmap = b""
+        else:
+            self.__file = open(file_path, "rb")
+            self.__mmap = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        if index_path is None:
+            index_path = file_path + INDEX_FILE_SUFFIX
+        self.__offsets = self.__load_index(index_path)
+        if self.__offsets is None:
+            self.__offsets = self.__build_index()
+            if persist_index:
+                self.__store_index(index_path)
+        self.__reference_count = 0
+
+    def acquire(self):
+        """
+        Registers a new stream reading from the file.
+        """
+        if self.__mmap is None:
+            raise Exception("The memory-mapped file %s was already closed." % (self.__file_path,))
+        self.__reference_count += 1
+
+    def release(self):
+        """
+        Unregisters a stream reading from the file. The mapping and the file are closed if no stream remains.
+        """
+        self.__reference_count -= 1
+        if self.__reference_count > 0 or self.__mmap is None:
+            return
+        if self.__file is not None:
+            self.__mmap.close()
+            self.__file.close()
+        self.__mmap = None
+
+    def get_line_count(self):
+        """
+        Returns the number of lines in the file.
+        """
+        return len(self.__offsets) - 1
+
+    def get_line(self, line_index: int):
+        """
+        Returns the line at the given index, including its terminating newline character.
+        """
+        return self.__mmap[self.__offsets[line_index]:self.__offsets[line_index + 1]].decode()
+
+    def get_lines(self, first_line: int, last_line: int):
+        """
+        Returns the lines in the given range (last line excluded).
+        """
+        offsets = self.__offsets
+        return [self.__mmap[offsets[i]:offsets[i + 1]].decode() for i in range(first_line, last_line)]
+
+    def get_byte_range(self, first_line: int, last_line: int):
+        """
+        Returns the byte offsets in the file spanned by the lines in the given range (last line excluded).
+        """
+        return self.__offsets[first_line], self.__offsets[last_line]
+
+    def __build_index(self):
+        """
+        Scans the file and calculates the offsets of its lines. The last offset always points at the end of the file.
+        """
+        offsets = array("q", [0])
+        position = self.__mmap.find(b"\n")
+        while position != -1:
+            offsets.append(position + 1)
+            position = self.__mmap.find(b"\n", position + 1)
+        if offsets[-1] != self.__file_size:
+            # the last line is not terminated by a newline character
+            offsets.append(self.__file_size)
+        return offsets
+
+    def __get_index_header(self):
+        """
+        Returns the header identifying the version of the file for which the index was created.
+        """
+        header = array("q", [self.__file_size, self.__file_mtime])
+        return INDEX_FILE_MAGIC + header.tobytes()
+
+    def __load_index(self, index_path: str):
+        """
+        Loads a previously persisted index. Returns None if no index exists or if the file has been modified since the
+        index was created.
+        """
+        if not os.path.exists(index_path):
+            return None
+        header = self.__get_index_header()
+        with open(index_path, "rb") as f:
+            content = f.read()
+        if not content.startswith(header):
+            return None
+        offsets = array("q")
+        offsets.frombytes(content[len(header):])
+        return offsets
+
+    def __store_index(self, index_path: str):
+        """
+        Persists the index to be reused by future streams reading the same file.
+        """
+        with open(index_path, "wb") as f:
+            f.write(self.__get_index_header())
+            f.write(self.__offsets.tobytes())
+
+
+class MemoryMappedFileInputStream(InputStream):
+    """
+    Reads the objects from a predefined input file by mapping it into memory.
+    Upon creation, the offsets of all lines in the file are indexed. The index can be optionally persisted next to the
+    file (or in a given location) to make subsequent readings of the same file nearly free.
+    Using the index, the stream can be restricted to an arbitrary set of line ranges without copying or re-reading
+    the file. In particular, assuming the events in the file are sorted by their timestamps, a stream can be restricted
+    to a time range and the file can be partitioned between parallel execution units.
+    """
+    def __init__(self, file_path: str, index_path: str = None, persist_index: bool = False):
+        super().__init__()
+        self.__index = MemoryMappedLineIndex(file_path, index_path, persist_index)
+        self.__index.acquire()
+        self.__is_closed = False
+        self.__line_ranges = [(0, self.__index.get_line_count())] if self.__index.get_line_count() > 0 else []
+        self.__reset()
+
+    @staticmethod
+    def __create_view(index: MemoryMappedLineIndex, line_ranges: List[Tuple[int, int]]):
+        """
+        Creates a new stream reading the given line ranges of an already indexed file.
+        """
+        view = MemoryMappedFileInputStream.__new__(MemoryMappedFileInputStream)
+        InputStream.__init__(view)
+        index.acquire()
+        view.__index = index
+        view.__is_closed = False
+        view.__line_ranges = [(first, last) for first, last in line_ranges if first < last]
+        view.__reset()
+        return view
+
+    def __reset(self):
+        """
+        Positions the stream at the first line of the first range.
+        """
+        self.__current_range = 0
+        self.__current_line = self.__line_ranges[0][0] if len(self.__line_ranges) > 0 else 0
+
+    def __next__(self):
+        while self.__current_range < len(self.__line_ranges):
+            if self.__current_line < self.__line_ranges[self.__current_range][1]:
+                line = self.__index.get_line(self.__current_line)
+                self.__current_line += 1
+                return line
+            self.__current_range += 1
+            if self.__current_range < len(self.__line_ranges):
+                self.__current_line = self.__line_ranges[self.__current_range][0]
+        raise StopIteration()
+
+    def get_batch(self, max_size: int = DefaultConfig.STREAM_BATCH_SIZE, timeout: float = None):
+        if max_size <= 0:
+            raise Exception("max_size should be positive.")
+        batch = []
+        while len(batch) < max_size and self.__current_range < len(self.__line_ranges):
+            range_end = self.__line_ranges[self.__current_range][1]
+            batch_end = min(range_end, self.__current_line + max_size - len(batch))
+            batch.extend(self.__index.get_lines(self.__current_line, batch_end))
+            self.__current_line = batch_end
+            if self.__current_line == range_end:
+                self.__current_range += 1
+                if self.__current_range < len(self.__line_ranges):
+                    self.__current_line = self.__line_ranges[self.__current_range][0]
+        if len(batch) == 0:
+            raise StopIteration()
+        return batch
+
+    def close(self):
+        """
+        Skips the remaining lines of the stream and releases the memory-mapped file. The mapping and the file are
+        closed once all streams reading from them (including the duplicates and the sub-streams) are closed.
+        """
+        self.__current_range = len(self.__line_ranges)
+        if self.__is_closed:
+            return
+        self.__is_closed = True
+        self.__index.release()
+
+    def __verify_not_closed(self):
+        """
+        Raises an exception if the stream was closed, as the memory-mapped file may have been released.
+        """
+        if self.__is_closed:
+            raise Exception("The stream is closed.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def duplicate(self):
+        """
+        Returns a new stream reading the same lines from the beginning. The file is not indexed again.
+        """
+        return MemoryMappedFileInputStream.__create_view(self.__index, self.__line_ranges)
+
+    def count(self):
+        """
+        Returns the number of lines not yet read from the stream.
+        """
+        if self.__current_range >= len(self.__line_ranges):
+            return 0
+        result = self.__line_ranges[self.__current_range][1] - self.__current_line
+        for first, last in self.__line_ranges[self.__current_range + 1:]:
+            result += last - first
+        return result
+
+    def first(self):
+        self.__verify_not_closed()
+        if len(self.__line_ranges) == 0:
+            return None
+        return self.__index.get_line(self.__line_ranges[0][0])
+
+    def last(self):
+        self.__verify_not_closed()
+        if len(self.__line_ranges) == 0:
+            return None
+        return self.__index.get_line(self.__line_ranges[-1][1] - 1)
+
+    def get_line_count(self):
+        """
+        Returns the total number of lines in the indexed file.
+        """
+        return self.__index.get_line_count()
+
+    def get_byte_ranges(self):
+        """
+        Returns the byte ranges of the file read by this stream.
+        """
+        return [self.__index.get_byte_range(first, last) for first, last in self.__line_ranges]
+
+    def get_sub_stream(self, line_ranges: List[Tuple[int, int]]):
+        """
+        Returns a new stream reading the given ranges of lines (the last line of each range is excluded) of the file.
+        """
+        return MemoryMappedFileInputStream.__create_view(self.__index, line_ranges)
+
+    def get_time_range_stream(self, data_formatter: DataFormatter, start_time: datetime = None,
+                              end_time: datetime = None):
+        """
+        Returns a new stream reading the events whose timestamps are in the given range (end time excluded).
+        The events in the file are assumed to be sorted by their timestamps.
+        """
+        first_line = 0 if start_time is None else \
+            self.find_line(lambda line: data_formatter.get_event_timestamp(data_formatter.parse_event(line)) >= start_time)
+        last_line = self.get_line_count() if end_time is None else \
+            self.find_line(lambda line: data_formatter.get_event_timestamp(data_formatter.parse_event(line)) >= end_time)
+        return self.get_sub_stream([(first_line, last_line)])
+
+    def find_line(self, predicate: callable):
+        """
+        Returns the index of the first line of the file satisfying the given predicate, or the number of lines if no
+        such line exists. The predicate is assumed to be monotone with respect to the order of the lines, that is,
+        once satisfied, it remains satisfied for all subsequent lines.
+        """
+        self.__verify_not_closed()
+        start = 0
+        end = self.__index.get_line_count()
+        while start < end:
+            mid = (start + end) // 2
+            if predicate(self.__index.get_line(mid)):
+                end = mid
+            else:
+                start = mid + 1
+        return start
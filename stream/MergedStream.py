@@ -0,0 +1,86 @@
+"""
+This file contains an input stream merging multiple event sources.
+"""
+import heapq
+from typing import List
+
+from base.DataFormatter import DataFormatter
+from misc import DefaultConfig
+from stream.Stream import InputStream
+
+
+class MergedInputStream(InputStream):
+    """
+    Lazily merges several input streams into a single stream ordered by the event timestamps, as extracted from the
+    raw events by the given data formatter (see DataFormatter.get_raw_event_timestamp). Each source is assumed to be
+    sorted by timestamp. Only a single pending event per source is held in memory at any given time. Events with
+    identical timestamps are ordered by the position of their source in the given list.
+    The sources are not accessed until the first event is requested.
+    """
+    def __init__(self, sources: List[InputStream], data_formatter: DataFormatter):
+        # the events are read directly from the sources, hence the internal queue is never used
+        super().__init__(is_thread_safe=False)
+        self.__sources = sources
+        self.__data_formatter = data_formatter
+        self.__heap = []
+        self.__is_started = False
+        # used to preserve the original order of the events arriving from the same source
+        self.__sequence_number = 0
+
+    def __start(self):
+        """
+        Reads the first event of each source.
+        """
+        self.__is_started = True
+        for source_index in range(len(self.__sources)):
+            self.__read_from_source(source_index)
+
+    def __read_from_source(self, source_index: int):
+        """
+        Reads the next event from the given source, if available, and adds it to the heap.
+        """
+        try:
+            raw_event = next(self.__sources[source_index])
+        except StopIteration:
+            return
+        timestamp = self.__data_formatter.get_raw_event_timestamp(raw_event)
+        heapq.heappush(self.__heap, (timestamp, source_index, self.__sequence_number, raw_event))
+        self.__sequence_number += 1
+
+    def __next__(self):
+        if not self.__is_started:
+            self.__start()
+        if len(self.__heap) == 0:
+            raise StopIteration()
+        _, source_index, _, raw_event = heapq.heappop(self.__heap)
+        self.__read_from_source(source_index)
+        return raw_event
+
+    def get_batch(self, max_size: int = DefaultConfig.STREAM_BATCH_SIZE, timeout: float = None):
+        return self._get_batch_by_items(max_size)
+
+    def close(self):
+        """
+        Stops the merge and closes all sources.
+        """
+        self.__is_started = True
+        self.__heap = []
+        for source in self.__sources:
+            source.close()
+
+    def duplicate(self):
+        """
+        Returns a new stream merging the duplicates of the sources.
+        """
+        return MergedInputStream([source.duplicate() for source in self.__sources], self.__data_formatter)
+
+    def first(self):
+        if not self.__is_started:
+            self.__start()
+        return self.__heap[0][3] if len(self.__heap) > 0 else None
+
+    def count(self):
+        raise Exception("Unsupported operation")
+
+    def last(self):
+        raise Exception("Unsupported operation")
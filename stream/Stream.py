@@ -1,15 +1,186 @@
-from queue import Queue
+from collections import deque
+from queue import Full, Empty
+from threading import Lock, Condition
+from time import perf_counter, monotonic
+from typing import Iterable, List
+
+from misc import DefaultConfig
+
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
+
+
+# the error raised upon reading an item that was not yet added to a stream that is not thread-safe
+UNFILLED_STREAM_ERROR_MESSAGE = "The stream was read before all its items were added. A stream that is read " \
+                                "while being filled by another thread must be thread-safe."
+
+
+class SingleThreadedQueue:
+    """
+    A replacement for queue.Queue backed by a plain deque, without any locking.
+    Only suitable for items that are produced and consumed without a cross-thread handoff, i.e., all items are added
+    before being read. Since no other thread can add items, the queue never blocks: getting an item from an empty
+    queue raises an exception.
+    """
+    def __init__(self):
+        self.queue = deque()
+
+    def put(self, item):
+        self.queue.append(item)
+
+    def put_nowait(self, item):
+        self.queue.append(item)
+
+    def get(self):
+        if not self.queue:
+            raise Exception(UNFILLED_STREAM_ERROR_MESSAGE)
+        return self.queue.popleft()
+
+    def get_nowait(self):
+        if not self.queue:
+            raise Empty()
+        return self.queue.popleft()
+
+    def put_all(self, items: Iterable):
+        self.queue.extend(items)
+
+    def get_batch(self, max_size: int, timeout: float = None):
+        if not self.queue:
+            raise Exception(UNFILLED_STREAM_ERROR_MESSAGE)
+        return pop_batch(self.queue, max_size)
+
+    def qsize(self):
+        return len(self.queue)
+
+    def empty(self):
+        return not self.queue
+
+
+class SynchronizedQueue:
+    """
+    A replacement for queue.Queue backed by a deque guarded by a lock owned by this object, supporting the addition
+    and removal of multiple items in a single critical section. If max_size is positive, adding an item to a full
+    queue blocks until free space is available.
+    Unlike queue.Queue, the consumed items are not tracked (i.e., task_done and join are not supported).
+    """
+    def __init__(self, max_size: int = 0):
+        self.queue = deque()
+        self.__max_size = max_size
+        self.__lock = Lock()
+        self.__not_empty = Condition(self.__lock)
+        self.__not_full = Condition(self.__lock)
+
+    def put(self, item, timeout: float = None):
+        with self.__not_full:
+            if self.__max_size > 0 and not self.__wait(self.__not_full, self.__is_full, timeout):
+                raise Full()
+            self.queue.append(item)
+            self.__not_empty.notify()
+
+    def put_nowait(self, item):
+        with self.__lock:
+            if self.__is_full():
+                raise Full()
+            self.queue.append(item)
+            self.__not_empty.notify()
+
+    def put_all(self, items: Iterable):
+        """
+        Adds the given items at once. Only supported by an unbounded queue.
+        """
+        items = list(items)
+        with self.__lock:
+            self.queue.extend(items)
+            self.__not_empty.notify(len(items))
+
+    def get(self):
+        with self.__not_empty:
+            self.__wait(self.__not_empty, self.empty)
+            item = self.queue.popleft()
+            self.__not_full.notify()
+            return item
+
+    def get_nowait(self):
+        with self.__lock:
+            if not self.queue:
+                raise Empty()
+            item = self.queue.popleft()
+            self.__not_full.notify()
+            return item
+
+    def get_batch(self, max_size: int, timeout: float = None):
+        """
+        Waits until at least one item is available and removes up to max_size items (see pop_batch). Returns None if
+        no item arrives before the timeout expires.
+        """
+        with self.__not_empty:
+            if not self.__wait(self.__not_empty, self.empty, timeout):
+                return None
+            batch = pop_batch(self.queue, max_size)
+            self.__not_full.notify(len(batch))
+            return batch
+
+    def qsize(self):
+        return len(self.queue)
+
+    def empty(self):
+        return not self.queue
+
+    def __is_full(self):
+        return 0 < self.__max_size <= len(self.queue)
+
+    @staticmethod
+    def __wait(condition: Condition, predicate: callable, timeout: float = None):
+        """
+        Waits on the given condition, whose lock is held by the caller, as long as the predicate holds. Returns False
+        if the timeout expired first.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while predicate():
+            remaining = None if deadline is None else deadline - monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            condition.wait(remaining)
+        return True
+
+
+def pop_batch(items: deque, max_size: int):
+    """
+    Removes up to max_size items from the head of the given deque. The end-of-stream marker is left in place.
+    """
+    batch = []
+    while len(batch) < max_size and len(items) > 0 and items[0] is not None:
+        batch.append(items.popleft())
+    return batch
 
 
 class Stream:
     """
     Represents a generic stream of objects.
+    By default, a stream is unbounded. If max_size is positive, at most max_size items can be stored in the stream at
+    any given time, and the behavior of add_item on a full stream is determined by the overflow policy. The stream
+    keeps track of the overall time spent waiting for free space and of the number of dropped items.
+    A stream that is never accessed by more than one thread at a time can be created with is_thread_safe=False to
+    avoid the synchronization overhead. Such a stream cannot be bounded, and since reading it never blocks, it must be
+    filled and closed before being read.
     """
-    def __init__(self):
-        self._stream = Queue()
+    def __init__(self, max_size: int = 0, overflow_policy: StreamOverflowPolicies = StreamOverflowPolicies.BLOCK,
+                 timeout: float = None, is_thread_safe: bool = True):
+        if max_size < 0:
+            raise Exception("max_size should be non-negative.")
+        if overflow_policy == StreamOverflowPolicies.TIMEOUT and (timeout is None or timeout <= 0):
+            raise Exception("A positive timeout should be specified for the timeout overflow policy.")
+        if max_size > 0 and not is_thread_safe:
+            raise Exception("A bounded stream must be thread-safe.")
+        self._stream = SynchronizedQueue(max_size) if is_thread_safe else SingleThreadedQueue()
+        self.__is_thread_safe = is_thread_safe
+        self.__max_size = max_size
+        self.__overflow_policy = overflow_policy
+        self.__timeout = timeout
+        self.__blocked_time = 0.0
+        self.__dropped_items_count = 0
 
     def __next__(self):
-        next_item = self._stream.get(block=True)  # Blocking get
+        next_item = self._stream.get()  # Blocking get, unless the stream is not thread-safe
         if next_item is None:
             raise StopIteration()
         return next_item
@@ -18,13 +189,129 @@ class Stream:
         return self
 
     def add_item(self, item: object):
-        self._stream.put(item)
+        if self.__max_size == 0:
+            self._stream.put(item)
+            return
+        if self.__overflow_policy == StreamOverflowPolicies.DROP_OLDEST:
+            self.__put_dropping_oldest(item)
+            return
+        timeout = self.__timeout if self.__overflow_policy == StreamOverflowPolicies.TIMEOUT else None
+        if not self.__put_blocking(item, timeout):
+            raise Exception("Timed out while waiting for free space in the stream.")
+
+    def add_items(self, items: Iterable):
+        """
+        Adds a batch of items to the stream. For an unbounded stream, the synchronization cost is paid once per batch.
+        """
+        if self.__max_size > 0:
+            # the overflow policy is applied to each item separately
+            for item in items:
+                self.add_item(item)
+            return
+        self._stream.put_all(items)
+
+    def get_batch(self, max_size: int = DefaultConfig.STREAM_BATCH_SIZE, timeout: float = None) -> List:
+        """
+        Removes and returns up to max_size items from the stream.
+        Waits until at least one item is available, then returns all items available at that moment without waiting
+        for the batch to fill. If a timeout is specified and no item arrives in time, an empty list is returned.
+        Raises StopIteration if the stream has ended.
+        As no other thread can add items to a stream that is not thread-safe, such a stream never waits: reading it
+        before it is closed raises the same exception as __next__ once the added items are exhausted.
+        """
+        if max_size <= 0:
+            raise Exception("max_size should be positive.")
+        batch = self._stream.get_batch(max_size, timeout)
+        if batch is None:
+            return []
+        if len(batch) == 0:
+            raise StopIteration()
+        return batch
+
+    def _get_batch_by_items(self, max_size: int):
+        """
+        Collects a batch by retrieving the items one by one. Used by streams that do not read from the internal queue.
+        """
+        if max_size <= 0:
+            raise Exception("max_size should be positive.")
+        batch = []
+        while len(batch) < max_size:
+            try:
+                batch.append(self.__next__())
+            except StopIteration:
+                break
+        if len(batch) == 0:
+            raise StopIteration()
+        return batch
+
+    def iterate_batches(self, max_size: int = DefaultConfig.STREAM_BATCH_SIZE):
+        """
+        Iterates over the stream in batches of up to max_size items.
+        """
+        while True:
+            try:
+                batch = self.get_batch(max_size)
+            except StopIteration:
+                return
+            yield batch
 
     def close(self):
-        self._stream.put(None)
+        if self.__max_size == 0:
+            self._stream.put(None)
+        elif self.__overflow_policy == StreamOverflowPolicies.DROP_OLDEST:
+            self.__put_dropping_oldest(None)
+        else:
+            # the end of the stream must never be lost, hence no timeout is applied
+            self.__put_blocking(None)
+
+    def __put_blocking(self, item: object, timeout: float = None):
+        """
+        Adds an item to a bounded stream, waiting for free space if necessary. Returns False on timeout.
+        """
+        try:
+            self._stream.put_nowait(item)
+            return True
+        except Full:
+            pass
+        start_time = perf_counter()
+        try:
+            self._stream.put(item, timeout=timeout)
+            return True
+        except Full:
+            return False
+        finally:
+            self.__blocked_time += perf_counter() - start_time
+
+    def __put_dropping_oldest(self, item: object):
+        """
+        Adds an item to a bounded stream, discarding the oldest items if necessary.
+        """
+        while True:
+            try:
+                self._stream.put_nowait(item)
+                return
+            except Full:
+                pass
+            try:
+                self._stream.get_nowait()
+                self.__dropped_items_count += 1
+            except Empty:
+                pass
+
+    def get_blocked_time(self):
+        """
+        Returns the overall time in seconds spent waiting for free space in the stream.
+        """
+        return self.__blocked_time
+
+    def get_dropped_items_count(self):
+        """
+        Returns the number of items discarded due to the stream being full.
+        """
+        return self.__dropped_items_count
 
     def duplicate(self):
-        ret = Stream()
+        ret = Stream(is_thread_safe=self.__is_thread_safe)
         ret._stream.queue = self._stream.queue.copy()
         return ret
 
@@ -51,6 +338,9 @@ class InputStream(Stream):
     def add_item(self, item: object):
         raise Exception("Unsupported operation")
 
+    def add_items(self, items: Iterable):
+        raise Exception("Unsupported operation")
+
 
 class OutputStream(Stream):
     """
@@ -59,6 +349,9 @@ class OutputStream(Stream):
     def get_item(self):
         raise Exception("Unsupported operation")
 
+    def get_batch(self, max_size: int = DefaultConfig.STREAM_BATCH_SIZE, timeout: float = None):
+        raise Exception("Unsupported operation")
+
     def first(self):
         raise Exception("Unsupported operation")
 
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class StreamOverflowPolicies(Enum):
+    """
+    The possible behaviors of a bounded stream when an item is added while the stream is full.
+    """
+    BLOCK = 0  # wait until there is room in the stream
+    TIMEOUT = 1  # wait for a limited time, then fail
+    DROP_OLDEST = 2  # discard the oldest item in the stream to make room for the new one
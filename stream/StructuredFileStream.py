@@ -0,0 +1,176 @@
+"""
+This file contains output streams writing the pattern matches in structured formats (JSON Lines and CSV), as opposed to
+the string representation of the matches written by FileOutputStream.
+The matches are serialized directly from their fields and event payloads, and only the requested fields and event
+attributes are written.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+from base.Event import Event
+from base.PatternMatch import PatternMatch
+from misc import DefaultConfig
+from stream.CompressionTypes import CompressionTypes
+from stream.FileStream import BufferedFileOutputStream
+from stream.MatchFields import MatchFields
+
+ALL_MATCH_FIELDS = list(MatchFields)
+
+
+def get_primitive_events(match: PatternMatch):
+    """
+    Returns the primitive events of the given match, expanding the events aggregated by Kleene closure operators.
+    """
+    events = []
+    for event in match.events:
+        if hasattr(event, "primitive_events"):
+            events.extend(event.primitive_events)
+        else:
+            events.append(event)
+    return events
+
+
+def serialize_value(value: object):
+    """
+    Converts an attribute value not natively supported by the output format into a string.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class StructuredMatchOutputStream(BufferedFileOutputStream):
+    """
+    An abstract buffered output stream writing the requested fields of each pattern match in a structured format.
+    If event_attributes is specified, only the listed attributes of each event are written. Otherwise, all attributes
+    except for the hidden ones are written.
+    """
+    def __init__(self, base_path: str, file_name: str, fields: List[MatchFields] = None,
+                 event_attributes: List[str] = None, buffer_size: int = DefaultConfig.FILE_OUTPUT_BUFFER_SIZE,
+                 flush_interval: timedelta = None, use_writer_thread: bool = False,
+                 compression: CompressionTypes = None):
+        super().__init__(base_path, file_name, buffer_size, flush_interval, use_writer_thread, compression)
+        self._fields = ALL_MATCH_FIELDS if fields is None else fields
+        self._event_attributes = event_attributes
+        self.__next_match_index = 0
+
+    def _serialize_item(self, item: object):
+        if not isinstance(item, PatternMatch):
+            raise Exception("Only pattern matches can be written to a structured match output stream.")
+        match_index = self.__next_match_index
+        self.__next_match_index += 1
+        return self._serialize_match(item, match_index)
+
+    def _serialize_match(self, match: PatternMatch, match_index: int):
+        """
+        Returns the bytes to be written to the file for the given match.
+        """
+        raise NotImplementedError()
+
+    def _get_match_field(self, match: PatternMatch, match_index: int, field: MatchFields):
+        """
+        Returns the value of a match-level field.
+        """
+        if field == MatchFields.MATCH_INDEX:
+            return match_index
+        if field == MatchFields.PATTERN_IDS:
+            return match.pattern_ids
+        if field == MatchFields.FIRST_TIMESTAMP:
+            return serialize_value(match.first_timestamp)
+        if field == MatchFields.LAST_TIMESTAMP:
+            return serialize_value(match.last_timestamp)
+        if field == MatchFields.PROBABILITY:
+            return match.probability
+        raise Exception("Unknown match field: %s" % (field,))
+
+    def _get_event_attributes(self, event: Event):
+        """
+        Returns the attributes of the given event to be written.
+        """
+        payload = event.payload
+        if self._event_attributes is None:
+            return {key: value for key, value in payload.items() if key not in Event.HIDDEN_ATTRIBUTE_NAMES}
+        return {key: payload[key] for key in self._event_attributes if key in payload}
+
+
+class JsonLinesFileOutputStream(StructuredMatchOutputStream):
+    """
+    Writes each pattern match as a single JSON object on a separate line. The events of the match are written as a list
+    of attribute dictionaries under the "events" key.
+    """
+    def _serialize_match(self, match: PatternMatch, match_index: int):
+        record = {}
+        for field in self._fields:
+            if field == MatchFields.EVENTS:
+                record["events"] = [self._get_event_attributes(event) for event in get_primitive_events(match)]
+            else:
+                record[field.name.lower()] = self._get_match_field(match, match_index, field)
+        return (json.dumps(record, separators=(",", ":"), default=serialize_value) + "\n").encode()
+
+
+class CsvFileOutputStream(StructuredMatchOutputStream):
+    """
+    Writes the pattern matches as CSV rows. If the events are requested, each primitive event of a match occupies a
+    separate row, preceded by the match-level fields. Otherwise, each match occupies a single row.
+    Since the columns must be fixed in advance, the event attributes are taken from the first written event unless
+    specified explicitly. Missing attribute values are left empty.
+    """
+    def __init__(self, base_path: str, file_name: str, fields: List[MatchFields] = None,
+                 event_attributes: List[str] = None, buffer_size: int = DefaultConfig.FILE_OUTPUT_BUFFER_SIZE,
+                 flush_interval: timedelta = None, use_writer_thread: bool = False,
+                 compression: CompressionTypes = None, delimiter: str = ","):
+        super().__init__(base_path, file_name, fields, event_attributes, buffer_size, flush_interval,
+                         use_writer_thread, compression)
+        self.__match_fields = [field for field in self._fields if field != MatchFields.EVENTS]
+        self.__include_events = MatchFields.EVENTS in self._fields
+        self.__row_buffer = io.StringIO()
+        self.__writer = csv.writer(self.__row_buffer, delimiter=delimiter, lineterminator="\n")
+        self.__is_header_written = False
+        if not self.__include_events or self._event_attributes is not None:
+            self.__write_header()
+
+    def __write_header(self):
+        """
+        Writes the column names to the file.
+        """
+        header = [field.name.lower() for field in self.__match_fields]
+        if self.__include_events:
+            header.extend(self._event_attributes)
+        self._add_serialized_item(self.__get_rows([header]))
+        self.__is_header_written = True
+
+    def __get_rows(self, rows: List[List]):
+        """
+        Formats the given rows as CSV.
+        """
+        self.__writer.writerows(rows)
+        contents = self.__row_buffer.getvalue().encode()
+        self.__row_buffer.seek(0)
+        self.__row_buffer.truncate()
+        return contents
+
+    def _serialize_match(self, match: PatternMatch, match_index: int):
+        match_values = []
+        for field in self.__match_fields:
+            value = self._get_match_field(match, match_index, field)
+            if field == MatchFields.PATTERN_IDS:
+                value = ";".join(str(pattern_id) for pattern_id in value)
+            match_values.append(value)
+        if not self.__include_events:
+            return self.__get_rows([match_values])
+        events = get_primitive_events(match)
+        if not self.__is_header_written:
+            self._event_attributes = [key for key in events[0].payload if key not in Event.HIDDEN_ATTRIBUTE_NAMES]
+            self.__write_header()
+        rows = []
+        for event in events:
+            payload = event.payload
+            row = list(match_values)
+            for attribute in self._event_attributes:
+                value = payload.get(attribute)
+                row.append(serialize_value(value) if isinstance(value, datetime) else value)
+            rows.append(row)
+        return self.__get_rows(rows)
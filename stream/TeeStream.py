@@ -0,0 +1,140 @@
+"""
+This file contains the output streams used for delivering the pattern matches to multiple destinations.
+"""
+from threading import Thread
+from typing import Callable, Iterable, List
+
+from misc import DefaultConfig
+from stream.Stream import Stream, OutputStream
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
+
+
+class CallbackOutputStream(OutputStream):
+    """
+    An output stream invoking a callback function on each item instead of storing it.
+    """
+    def __init__(self, callback: Callable[[object], None]):
+        super().__init__(is_thread_safe=False)
+        self.__callback = callback
+
+    def add_item(self, item: object):
+        self.__callback(item)
+
+    def add_items(self, items: Iterable):
+        callback = self.__callback
+        for item in items:
+            callback(item)
+
+    def close(self):
+        pass
+
+
+class ThreadedSink:
+    """
+    Delivers the items to an output stream from a dedicated thread via a bounded buffer, so that a slow sink only delays
+    the other sinks once its buffer is full. With the DROP_OLDEST overflow policy, a slow sink never delays the other
+    sinks, at the cost of losing some of the items.
+    """
+    def __init__(self, sink: OutputStream, buffer_size: int, overflow_policy: StreamOverflowPolicies,
+                 timeout: float):
+        self.sink = sink
+        self.buffer = Stream(buffer_size, overflow_policy, timeout)
+        self.error = None
+        self.__thread = Thread(target=self.__deliver_items, daemon=True)
+        self.__thread.start()
+
+    def __deliver_items(self):
+        """
+        The main loop of the delivery thread.
+        """
+        try:
+            for batch in self.buffer.iterate_batches():
+                self.sink.add_items(batch)
+            self.sink.close()
+        except Exception as e:
+            self.error = e
+            # keep draining the buffer to avoid blocking the producer forever
+            for _ in self.buffer.iterate_batches():
+                pass
+
+    def close(self):
+        """
+        Waits until all buffered items are delivered and the sink is closed.
+        """
+        self.buffer.close()
+        self.__thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+class TeeOutputStream(OutputStream):
+    """
+    An output stream forwarding each item to several sinks. The items themselves are passed by reference and are not
+    copied.
+    By default, the items are delivered to a sink synchronously. A sink added with use_thread=True receives the items
+    from a dedicated thread via its own bounded buffer (see ThreadedSink).
+    """
+    def __init__(self, sinks: List[OutputStream] = None):
+        super().__init__(is_thread_safe=False)
+        # the streams receiving the items directly - either the synchronous sinks or the buffers of the threaded sinks
+        self.__targets = []
+        self.__synchronous_sinks = []
+        self.__threaded_sinks = []
+        self.__is_closed = False
+        if sinks is not None:
+            for sink in sinks:
+                self.add_sink(sink)
+
+    def add_sink(self, sink: OutputStream, use_thread: bool = False,
+                 buffer_size: int = DefaultConfig.TEE_SINK_BUFFER_SIZE,
+                 overflow_policy: StreamOverflowPolicies = StreamOverflowPolicies.BLOCK, timeout: float = None):
+        """
+        Adds a new destination for the items. The buffer parameters are only relevant for a threaded sink.
+        """
+        if self.__is_closed:
+            raise Exception("The stream is closed.")
+        if use_thread:
+            threaded_sink = ThreadedSink(sink, buffer_size, overflow_policy, timeout)
+            self.__threaded_sinks.append(threaded_sink)
+            self.__targets.append(threaded_sink.buffer)
+        else:
+            self.__synchronous_sinks.append(sink)
+            self.__targets.append(sink)
+
+    def add_item(self, item: object):
+        for target in self.__targets:
+            target.add_item(item)
+
+    def add_items(self, items: Iterable):
+        items = list(items)
+        for target in self.__targets:
+            target.add_items(items)
+
+    def close(self):
+        """
+        Closes all sinks, waiting for the threaded sinks to deliver their buffered items. A sink failing to close does
+        not prevent closing the remaining ones, after which the first error is re-raised.
+        """
+        if self.__is_closed:
+            return
+        self.__is_closed = True
+        errors = []
+        for sink in self.__synchronous_sinks + self.__threaded_sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                errors.append(e)
+        if len(errors) > 0:
+            raise errors[0]
+
+    def get_blocked_time(self):
+        """
+        Returns the overall time in seconds spent waiting for free space in the buffers of the threaded sinks.
+        """
+        return sum(threaded_sink.buffer.get_blocked_time() for threaded_sink in self.__threaded_sinks)
+
+    def get_dropped_items_count(self):
+        """
+        Returns the overall number of items discarded due to the buffers of the threaded sinks being full.
+        """
+        return sum(threaded_sink.buffer.get_dropped_items_count() for threaded_sink in self.__threaded_sinks)
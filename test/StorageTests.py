@@ -1,10 +1,14 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 
-from condition.BaseRelationCondition import GreaterThanCondition, GreaterThanEqCondition
+from base.Event import Event
+from base.PatternMatch import PatternMatch
+from condition.BaseRelationCondition import GreaterThanCondition, GreaterThanEqCondition, SmallerThanCondition, \
+    EqCondition
 from test.testUtils import *
-from condition.Condition import Variable
+from condition.Condition import Variable, RelopTypes, EquationSides
+from tree.PatternMatchStorage import SortedPatternMatchStorage, UnsortedPatternMatchStorage, HashPatternMatchStorage
 from condition.CompositeCondition import AndCondition
-from base.PatternStructure import AndOperator, PrimitiveEventStructure
+from base.PatternStructure import AndOperator, SeqOperator, PrimitiveEventStructure
 from base.Pattern import Pattern
 
 def sortedStorageTest(createTestFile=False):
@@ -51,3 +55,161 @@ def sortedStorageBenchMarkTest(createTestFile=False):
         storage_params=storage_params)
 
     runBenchMark("sortedStorageBenchMark - sorted storage", [pattern], eval_mechanism_params=eval_params)
+
+
+def vectorizedConditionsTest(createTestFile=False):
+    """
+    PATTERN SEQ(GoogleStockPriceUpdate a, GoogleStockPriceUpdate b, GoogleStockPriceUpdate c)
+    WHERE a.PeakPrice < b.PeakPrice AND b.PeakPrice < c.PeakPrice
+    WITHIN 3 minutes
+    """
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("GOOG", "a"),
+                    PrimitiveEventStructure("GOOG", "b"),
+                    PrimitiveEventStructure("GOOG", "c")),
+        AndCondition(
+            SmallerThanCondition(Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"])),
+            SmallerThanCondition(Variable("b", lambda x: x["Peak Price"]), Variable("c", lambda x: x["Peak Price"]))
+        ),
+        timedelta(minutes=3)
+    )
+    # the conditions are evaluated in bulk regardless of the number of candidates
+    storage_params = TreeStorageParameters(vectorize_conditions=True, vectorized_evaluation_threshold=1)
+    eval_params = TreeBasedEvaluationMechanismParameters(storage_params=storage_params)
+    runTest("vectorizedConditions", [pattern], createTestFile, eval_mechanism_params=eval_params,
+            events=nasdaqEventStreamShort, expected_file_name="streamGoogleAscend")
+
+
+def attributeColumnTest(createTestFile=False):
+    testName = "attributeColumn"
+    start = datetime.now()
+    events = [Event(raw_event, DEFAULT_TESTING_DATA_FORMATTER) for raw_event in nasdaqEventStreamShort.duplicate()]
+
+    def get_price(payload):
+        # the price is missing for some events, which should not prevent the bulk evaluation for the other ones
+        return None if payload["Stock Ticker"] == "AMZN" else payload["Peak Price"]
+
+    def is_column_correct(storage):
+        column = storage.get_column(0, get_price)
+        if column is None:
+            return False
+        values, is_valid = column
+        expected_values = [get_price(pm.events[0].payload) for pm in storage]
+        return len(values) == len(expected_values) and \
+            all((expected_value is None and not is_valid[i]) or
+                (expected_value is not None and (is_valid is None or is_valid[i]) and values[i] == expected_value)
+                for i, expected_value in enumerate(expected_values))
+
+    is_test_successful = True
+    middle_timestamp = events[len(events) // 2].timestamp
+    for storage in [UnsortedPatternMatchStorage(clean_up_interval=0),
+                    SortedPatternMatchStorage(lambda pm: pm.events[0].payload["Volume"], RelopTypes.Greater,
+                                              EquationSides.left, clean_up_interval=0)]:
+        # the column is created for the stored pattern matches and maintained upon insertions and cleanups
+        for event in events[:len(events) // 4]:
+            storage.add(PatternMatch([event]))
+        is_test_successful = is_test_successful and is_column_correct(storage)
+        for event in events[len(events) // 4:]:
+            storage.add(PatternMatch([event]))
+        is_test_successful = is_test_successful and is_column_correct(storage)
+        storage.try_clean_expired_partial_matches(middle_timestamp)
+        is_test_successful = is_test_successful and is_column_correct(storage) and \
+            all(pm.first_timestamp >= middle_timestamp for pm in storage)
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def hashedStorageTest(createTestFile=False):
+    """
+    PATTERN AND(AppleStockPriceUpdate a, AmazonStockPriceUpdate b, GoogleStockPriceUpdate c)
+    WHERE a.Date = b.Date AND b.Date = c.Date
+    WITHIN 3 minutes
+    """
+    pattern = Pattern(
+        AndOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b"),
+                    PrimitiveEventStructure("GOOG", "c")),
+        AndCondition(
+            EqCondition(Variable("a", lambda x: x["Date"]), Variable("b", lambda x: x["Date"])),
+            EqCondition(Variable("b", lambda x: x["Date"]), Variable("c", lambda x: x["Date"]))
+        ),
+        timedelta(minutes=3)
+    )
+    # both the leaves and the internal node joined on the equality conditions store their partial matches in buckets
+    storage_params = TreeStorageParameters(sort_storage=True, attributes_priorities={"a": 1, "b": 2, "c": 1},
+                                           clean_up_interval=5)
+    eval_params = TreeBasedEvaluationMechanismParameters(storage_params=storage_params)
+    runTest("hashedStorage", [pattern], createTestFile, eval_mechanism_params=eval_params,
+            events=nasdaqEventStreamShort)
+
+
+def hashStorageBucketsTest(createTestFile=False):
+    testName = "hashStorageBuckets"
+    start = datetime.now()
+    events = [Event(raw_event, DEFAULT_TESTING_DATA_FORMATTER) for raw_event in nasdaqEventStreamShort.duplicate()]
+
+    def get_ticker(pm):
+        # the keys of the AMZN events are unhashable, hence stored aside rather than in buckets
+        ticker = pm.events[0].payload["Stock Ticker"]
+        return [ticker] if ticker == "AMZN" else ticker
+
+    def is_content_correct(storage, partial_matches):
+        return len(storage) == len(partial_matches) and \
+            sorted(map(id, storage)) == sorted(map(id, partial_matches)) and \
+            all(list(map(id, storage.get(key))) == [id(pm) for pm in partial_matches if get_ticker(pm) == key]
+                for key in ["AAPL", "GOOG", ["AMZN"], "MSFT"])
+
+    is_test_successful = True
+    middle_timestamp = events[len(events) // 2].timestamp
+    for in_leaf in [True, False]:
+        storage = HashPatternMatchStorage(get_ticker, clean_up_interval=0, in_leaf=in_leaf)
+        partial_matches = [PatternMatch([event]) for event in events]
+        if not in_leaf:
+            # the partial matches of an internal node do not arrive in the order of their timestamps
+            partial_matches.reverse()
+        for pm in partial_matches:
+            storage.add(pm)
+        is_test_successful = is_test_successful and is_content_correct(storage, partial_matches)
+        # the returned buckets are copies, which must not affect the storage when modified
+        storage.get("GOOG").clear()
+        is_test_successful = is_test_successful and is_content_correct(storage, partial_matches)
+        storage.try_clean_expired_partial_matches(middle_timestamp)
+        partial_matches = [pm for pm in partial_matches if pm.first_timestamp >= middle_timestamp]
+        is_test_successful = is_test_successful and is_content_correct(storage, partial_matches)
+        storage.try_clean_expired_partial_matches(events[-1].timestamp + timedelta(minutes=1))
+        is_test_successful = is_test_successful and is_content_correct(storage, [])
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def sortedRangeStorageTest(createTestFile=False):
+    """
+    PATTERN SEQ(GoogleStockPriceUpdate a, GoogleStockPriceUpdate b, GoogleStockPriceUpdate c)
+    WHERE a.PeakPrice < b.PeakPrice AND b.PeakPrice < c.PeakPrice
+    WITHIN 3 minutes
+    """
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("GOOG", "a"),
+                    PrimitiveEventStructure("GOOG", "b"),
+                    PrimitiveEventStructure("GOOG", "c")),
+        AndCondition(
+            SmallerThanCondition(Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"])),
+            SmallerThanCondition(Variable("b", lambda x: x["Peak Price"]), Variable("c", lambda x: x["Peak Price"]))
+        ),
+        timedelta(minutes=3)
+    )
+    # the storage is sorted by the peak prices rather than by the timestamps
+    storage_params = TreeStorageParameters(sort_storage=True, attributes_priorities={"a": 1, "b": 2, "c": 1},
+                                           clean_up_interval=5, prioritize_sorting_by_timestamp=False)
+    eval_params = TreeBasedEvaluationMechanismParameters(storage_params=storage_params)
+    runTest("sortedRangeStorage", [pattern], createTestFile, eval_mechanism_params=eval_params,
+            events=nasdaqEventStreamShort, expected_file_name="streamGoogleAscend")
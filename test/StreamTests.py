@@ -0,0 +1,748 @@
+from test.testUtils import *
+import ast
+import asyncio
+import csv
+import json
+import tempfile
+from datetime import datetime, timedelta
+from operator import itemgetter
+from threading import Thread
+from condition.Condition import Variable, SimpleCondition, get_accessed_attribute_names, \
+    get_subscripted_attribute_name
+from condition.CompositeCondition import AndCondition, OrCondition
+from condition.ConditionCompiler import compile_condition
+from condition.BaseRelationCondition import SmallerThanCondition, GreaterThanCondition
+from base.PatternStructure import SeqOperator, PrimitiveEventStructure
+from base.Pattern import Pattern
+from base.Event import Event
+from base.EventSchema import EventSchema
+from misc.ConsumptionPolicy import ConsumptionPolicy
+from plugin.sensors.Sensors import SensorsDataFormatter
+from parallel.ParallelExecutionParameters import *
+from stream.Stream import Stream, UNFILLED_STREAM_ERROR_MESSAGE
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
+from stream.MemoryMappedFileStream import MemoryMappedFileInputStream
+from stream.FileStream import BufferedFileOutputStream
+from stream.AsyncStream import AsyncInputStream
+from stream.MergedStream import MergedInputStream
+from stream.MatchFields import MatchFields
+from stream.TeeStream import TeeOutputStream, CallbackOutputStream
+from stream.StructuredFileStream import JsonLinesFileOutputStream, CsvFileOutputStream
+from stream.BinaryFileStream import BinaryFileInputStream, BinaryEventFileWriter, PreparsedDataFormatter, \
+    convert_to_binary_file
+
+nasdaqEventStreamShortPath = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
+nasdaqEventStreamShortGzipPath = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt.gz")
+nasdaqEventStreamShortXzPath = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt.xz")
+
+
+def get_stream_test_pattern():
+    """
+    PATTERN SEQ(GoogleStockPriceUpdate a, GoogleStockPriceUpdate b, GoogleStockPriceUpdate c)
+    WHERE a.PeakPrice < b.PeakPrice AND b.PeakPrice < c.PeakPrice
+    WITHIN 3 minutes
+    """
+    return Pattern(
+        SeqOperator(PrimitiveEventStructure("GOOG", "a"),
+                    PrimitiveEventStructure("GOOG", "b"),
+                    PrimitiveEventStructure("GOOG", "c")),
+        AndCondition(
+            SmallerThanCondition(Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"])),
+            SmallerThanCondition(Variable("b", lambda x: x["Peak Price"]), Variable("c", lambda x: x["Peak Price"]))
+        ),
+        timedelta(minutes=3)
+    )
+
+
+def lazyFileInputStreamTest(createTestFile=False):
+    events = FileInputStream(nasdaqEventStreamShortPath, is_lazy=True)
+    runTest("lazyFileInputStream", [get_stream_test_pattern()], createTestFile, events=events,
+            expected_file_name="streamGoogleAscend")
+
+
+def lazyThreadedFileInputStreamTest(createTestFile=False):
+    events = FileInputStream(nasdaqEventStreamShortPath, is_lazy=True, use_reader_thread=True, read_ahead_size=5)
+    runTest("lazyThreadedFileInputStream", [get_stream_test_pattern()], createTestFile, events=events,
+            expected_file_name="streamGoogleAscend")
+
+
+def memoryMappedFileInputStreamTest(createTestFile=False):
+    events = MemoryMappedFileInputStream(nasdaqEventStreamShortPath)
+    runTest("memoryMappedFileInputStream", [get_stream_test_pattern()], createTestFile, events=events,
+            expected_file_name="streamGoogleAscend")
+
+
+def memoryMappedFileInputStreamRIPTest(createTestFile=False):
+    events = MemoryMappedFileInputStream(nasdaqEventStreamShortPath)
+    parallel_execution_params = DataParallelExecutionParametersRIPAlgorithm(units_number=3, multiple=2)
+    runTest("memoryMappedFileInputStreamRIP", [get_stream_test_pattern()], createTestFile, events=events,
+            parallel_execution_params=parallel_execution_params, expected_file_name="streamGoogleAscend")
+
+
+def memoryMappedFileInputStreamCloseTest(createTestFile=False):
+    testName = "memoryMappedFileInputStreamClose"
+    start = datetime.now()
+    with MemoryMappedFileInputStream(nasdaqEventStreamShortPath) as events:
+        duplicate_events = events.duplicate()
+        sub_stream = events.get_sub_stream([(0, 10)])
+    duplicate_events.close()
+    # the file remains mapped as long as some stream reading it is open
+    is_test_successful = len(list(sub_stream)) == 10
+    sub_stream.close()
+    try:
+        sub_stream.duplicate()
+        is_test_successful = False
+    except Exception:
+        pass
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def unfilledStreamTest(createTestFile=False):
+    testName = "unfilledStream"
+    start = datetime.now()
+    events = Stream(is_thread_safe=False)
+    events.add_items(["first", "second"])
+    is_test_successful = next(events) == "first" and next(events) == "second"
+    # reading an item that was not yet added fails instead of waiting for another thread to add it
+    for read_items in [lambda: next(events), lambda: next(events.iterate_batches())]:
+        try:
+            read_items()
+            is_test_successful = False
+        except Exception as e:
+            is_test_successful = is_test_successful and str(e) == UNFILLED_STREAM_ERROR_MESSAGE
+    events.add_item("third")
+    events.close()
+    is_test_successful = is_test_successful and list(events.iterate_batches()) == [["third"]]
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def synchronizedStreamTest(createTestFile=False):
+    testName = "synchronizedStream"
+    start = datetime.now()
+    items = list(range(1000))
+    is_test_successful = True
+    for stream in [Stream(), Stream(max_size=7)]:
+        is_test_successful = is_test_successful and stream.get_batch(timeout=0.01) == []
+
+        def produce(stream=stream):
+            for i in range(0, len(items), 10):
+                stream.add_items(items[i:i + 10])
+            stream.close()
+        producer = Thread(target=produce)
+        producer.start()
+        read_items = [item for batch in stream.iterate_batches(max_size=8) for item in batch]
+        producer.join()
+        is_test_successful = is_test_successful and read_items == items
+    stream = Stream(max_size=3, overflow_policy=StreamOverflowPolicies.DROP_OLDEST)
+    stream.add_items(items[:5])
+    stream.close()
+    is_test_successful = is_test_successful and stream.get_dropped_items_count() == 3 and \
+        list(stream.iterate_batches()) == [items[3:5]]
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def gzipFileInputStreamTest(createTestFile=False):
+    events = FileInputStream(nasdaqEventStreamShortGzipPath)
+    runTest("gzipFileInputStream", [get_stream_test_pattern()], createTestFile, events=events,
+            expected_file_name="streamGoogleAscend")
+
+
+def lazyXzFileInputStreamTest(createTestFile=False):
+    events = FileInputStream(nasdaqEventStreamShortXzPath, is_lazy=True)
+    runTest("lazyXzFileInputStream", [get_stream_test_pattern()], createTestFile, events=events,
+            expected_file_name="streamGoogleAscend")
+
+
+def bufferedFileOutputStreamTest(createTestFile=False):
+    events = FileInputStream(nasdaqEventStreamShortPath)
+    matches = BufferedFileOutputStream(os.path.join(absolutePath, "test", "Matches"),
+                                       "bufferedFileOutputStreamMatches.txt", buffer_size=256)
+    runTest("bufferedFileOutputStream", [get_stream_test_pattern()], createTestFile, events=events,
+            expected_file_name="streamGoogleAscend", matches_stream=matches)
+
+
+def threadedBufferedFileOutputStreamTest(createTestFile=False):
+    events = FileInputStream(nasdaqEventStreamShortPath)
+    matches = BufferedFileOutputStream(os.path.join(absolutePath, "test", "Matches"),
+                                       "threadedBufferedFileOutputStreamMatches.txt", buffer_size=256,
+                                       flush_interval=timedelta(milliseconds=1), use_writer_thread=True)
+    runTest("threadedBufferedFileOutputStream", [get_stream_test_pattern()], createTestFile, events=events,
+            expected_file_name="streamGoogleAscend", matches_stream=matches)
+
+
+class FailingOutputFile:
+    """
+    A file object failing on every write, used to simulate an I/O error in a writer thread.
+    """
+    def write(self, contents):
+        raise OSError("No space left on device")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def failedWriterThreadTest(createTestFile=False):
+    testName = "failedWriterThread"
+    start = datetime.now()
+    with tempfile.TemporaryDirectory() as temp_directory:
+        matches = BufferedFileOutputStream(temp_directory, "failedWriterThreadMatches.txt", buffer_size=1,
+                                           use_writer_thread=True)
+        output_file = matches._BufferedFileOutputStream__output_file
+        matches._BufferedFileOutputStream__output_file = FailingOutputFile()
+        output_file.close()
+        # the producer is notified of the failure instead of blocking forever on the full queue of pending buffers
+        errors = []
+        for i in range(1000):
+            try:
+                matches.add_item("match %s\n" % (i,))
+            except Exception as e:
+                errors.append(e)
+                break
+        try:
+            matches.close()
+        except Exception as e:
+            errors.append(e)
+    is_test_successful = len(errors) == 2 and all(isinstance(e.__cause__, OSError) for e in errors)
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def binaryFileInputStreamTest(createTestFile=False):
+    with tempfile.TemporaryDirectory() as temp_directory:
+        binary_file_path = os.path.join(temp_directory, "NASDAQ_SHORT.bin")
+        convert_to_binary_file(FileInputStream(nasdaqEventStreamShortPath), DEFAULT_TESTING_DATA_FORMATTER,
+                               binary_file_path)
+        events = BinaryFileInputStream(binary_file_path)
+        runTest("binaryFileInputStream", [get_stream_test_pattern()], createTestFile, events=events,
+                expected_file_name="streamGoogleAscend", data_formatter=PreparsedDataFormatter())
+
+
+def binaryFileWideSchemaTest(createTestFile=False):
+    testName = "binaryFileWideSchema"
+    start = datetime.now()
+    # the number of attributes exceeds the range of an unsigned short
+    payload = {"attr%s" % (i,): i for i in range(70000)}
+    timestamp = datetime(2020, 1, 1)
+    with tempfile.TemporaryDirectory() as temp_directory:
+        binary_file_path = os.path.join(temp_directory, "WIDE.bin")
+        writer = BinaryEventFileWriter(binary_file_path)
+        writer.write_event(payload, "WIDE", timestamp)
+        writer.close()
+        events = BinaryFileInputStream(binary_file_path)
+        read_payloads = list(events)
+        events.close()
+    is_test_successful = (len(read_payloads) == 1 and read_payloads[0] == payload and
+                          read_payloads[0].event_type == "WIDE" and read_payloads[0].timestamp == timestamp)
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def boundedUnitStreamRIPTest(createTestFile=False):
+    events = FileInputStream(nasdaqEventStreamShortPath)
+    parallel_execution_params = DataParallelExecutionParametersRIPAlgorithm(units_number=3, multiple=2,
+                                                                            unit_stream_capacity=2)
+    runTest("boundedUnitStreamRIP", [get_stream_test_pattern()], createTestFile, events=events,
+            parallel_execution_params=parallel_execution_params, expected_file_name="streamGoogleAscend")
+
+
+def verifyStreamTestOutput(testName, expected_file_name, running_time):
+    """
+    Compares the matches written by a test which does not use runTest to the expected matches.
+    """
+    actual_matches_path = os.path.join(absolutePath, "test", "Matches", "%sMatches.txt" % testName)
+    expected_matches_path = os.path.join(absolutePath, "test", "TestsExpected", "%sMatches.txt" % expected_file_name)
+    is_test_successful = fileCompare(actual_matches_path, expected_matches_path)
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if is_test_successful:
+        os.remove(actual_matches_path)
+    else:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def asyncStreamTest(createTestFile=False):
+    testName = "asyncStream"
+    cep = CEP([get_stream_test_pattern()])
+
+    async def produce_events(events: AsyncInputStream):
+        for raw_event in FileInputStream(nasdaqEventStreamShortPath):
+            await events.put(raw_event)
+        await events.close()
+
+    async def run():
+        events = AsyncInputStream(max_size=10)
+        producer = asyncio.ensure_future(produce_events(events))
+        matches = FileOutputStream(os.path.join(absolutePath, "test", "Matches"), "%sMatches.txt" % testName)
+        async for match in cep.iterate_matches_async(events, DEFAULT_TESTING_DATA_FORMATTER):
+            matches.add_item(match)
+        matches.close()
+        await producer
+
+    start = datetime.now()
+    asyncio.run(run())
+    verifyStreamTestOutput(testName, "streamGoogleAscend", (datetime.now() - start).total_seconds())
+
+
+def mergedInputStreamTest(createTestFile=False):
+    with tempfile.TemporaryDirectory() as temp_directory:
+        # split the input file into a separate file for each stock ticker
+        ticker_files = {}
+        for raw_event in FileInputStream(nasdaqEventStreamShortPath):
+            ticker = raw_event.split(",")[0]
+            if ticker not in ticker_files:
+                ticker_files[ticker] = open(os.path.join(temp_directory, "%s.txt" % ticker), "w")
+            ticker_files[ticker].write(raw_event)
+        for ticker_file in ticker_files.values():
+            ticker_file.close()
+        sources = [FileInputStream(ticker_file.name, is_lazy=True) for ticker_file in ticker_files.values()]
+        events = MergedInputStream(sources, DEFAULT_TESTING_DATA_FORMATTER)
+        runTest("mergedInputStream", [get_stream_test_pattern()], createTestFile, events=events,
+                expected_file_name="streamGoogleAscend")
+
+
+def create_shuffled_input_file(temp_directory: str):
+    """
+    Shuffles the input file by reversing the order of the events within each block of consecutive lines. Returns the
+    path of the shuffled file.
+    """
+    with open(nasdaqEventStreamShortPath) as input_file:
+        lines = input_file.readlines()
+    block_size = 20
+    shuffled_file_path = os.path.join(temp_directory, "NASDAQ_SHORT_SHUFFLED.txt")
+    with open(shuffled_file_path, "w") as shuffled_file:
+        for i in range(0, len(lines), block_size):
+            shuffled_file.writelines(reversed(lines[i:i + block_size]))
+    return shuffled_file_path
+
+
+def reorderedInputStreamTest(createTestFile=False):
+    with tempfile.TemporaryDirectory() as temp_directory:
+        shuffled_file_path = create_shuffled_input_file(temp_directory)
+        eval_mechanism_params = TreeBasedEvaluationMechanismParameters(
+            storage_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS.storage_params,
+            optimizer_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS.optimizer_params,
+            allowed_lateness=timedelta(minutes=5))
+        runTest("reorderedInputStream", [get_stream_test_pattern()], createTestFile, eval_mechanism_params,
+                events=FileInputStream(shuffled_file_path), expected_file_name="streamGoogleAscend")
+
+
+def reorderedEpochTimestampsTest(createTestFile=False):
+    timestamp_unit = timedelta(minutes=1)
+    with tempfile.TemporaryDirectory() as temp_directory:
+        shuffled_file_path = create_shuffled_input_file(temp_directory)
+        # the allowed lateness is converted to the timestamp unit along with the time windows
+        eval_mechanism_params = TreeBasedEvaluationMechanismParameters(
+            storage_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS.storage_params,
+            optimizer_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS.optimizer_params,
+            allowed_lateness=timedelta(minutes=5), timestamp_unit=timestamp_unit)
+        runTest("reorderedEpochTimestamps", [get_stream_test_pattern()], createTestFile, eval_mechanism_params,
+                events=FileInputStream(shuffled_file_path), expected_file_name="streamGoogleAscend",
+                data_formatter=MetastockDataFormatter(timestamp_unit=timestamp_unit))
+
+
+def reorderedContiguityTest(createTestFile=False):
+    """
+    Swaps each pair of consecutive timestamps of the input. Since the reordered events are numbered in their timestamp
+    order, the contiguity constraints are evaluated as if the events arrived in order.
+    """
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b"),
+                    PrimitiveEventStructure("AVID", "c")),
+        GreaterThanCondition(Variable("a", lambda x: x["Opening Price"]), Variable("c", lambda x: x["Opening Price"])),
+        timedelta(minutes=5),
+        ConsumptionPolicy(contiguous=["a", "b", "c"])
+    )
+    with tempfile.TemporaryDirectory() as temp_directory:
+        events_by_timestamp = {}
+        with open(os.path.join(absolutePath, "test/EventFiles/NASDAQ_TINY.txt")) as input_file:
+            for line in input_file:
+                events_by_timestamp.setdefault(line.split(",")[1], []).append(line.rstrip("\n") + "\n")
+        groups = list(events_by_timestamp.values())
+        shuffled_file_path = os.path.join(temp_directory, "NASDAQ_TINY_SHUFFLED.txt")
+        with open(shuffled_file_path, "w") as shuffled_file:
+            for i in range(0, len(groups), 2):
+                for group in reversed(groups[i:i + 2]):
+                    shuffled_file.writelines(group)
+        eval_mechanism_params = TreeBasedEvaluationMechanismParameters(
+            storage_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS.storage_params,
+            optimizer_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS.optimizer_params,
+            allowed_lateness=timedelta(minutes=5))
+        runTest("reorderedContiguity", [pattern], createTestFile, eval_mechanism_params,
+                events=FileInputStream(shuffled_file_path), expected_file_name="contiguousPolicySingleList")
+
+
+def jsonLinesFileOutputStreamTest(createTestFile=False):
+    testName = "jsonLinesFileOutputStream"
+    cep = CEP([get_stream_test_pattern()], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS)
+    with tempfile.TemporaryDirectory() as temp_directory:
+        matches = JsonLinesFileOutputStream(temp_directory, "matches.jsonl", buffer_size=1024)
+        running_time = cep.run(FileInputStream(nasdaqEventStreamShortPath), matches, DEFAULT_TESTING_DATA_FORMATTER)
+        # restore the default representation of the matches from the written records
+        with open(os.path.join(temp_directory, "matches.jsonl")) as json_file, \
+                open(os.path.join(absolutePath, "test", "Matches", "%sMatches.txt" % testName), "w") as output_file:
+            for line in json_file:
+                for payload in json.loads(line)["events"]:
+                    output_file.write("%s\n" % (payload,))
+                output_file.write("\n")
+    verifyStreamTestOutput(testName, "streamGoogleAscend", running_time)
+
+
+def csvFileOutputStreamTest(createTestFile=False):
+    testName = "csvFileOutputStream"
+    cep = CEP([get_stream_test_pattern()], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS)
+    event_attributes = ["Stock Ticker", "Date", "Peak Price"]
+    with tempfile.TemporaryDirectory() as temp_directory:
+        matches = CsvFileOutputStream(temp_directory, "matches.csv", fields=[MatchFields.MATCH_INDEX, MatchFields.EVENTS],
+                                      event_attributes=event_attributes)
+        running_time = cep.run(FileInputStream(nasdaqEventStreamShortPath), matches, DEFAULT_TESTING_DATA_FORMATTER)
+        with open(os.path.join(temp_directory, "matches.csv"), newline="") as csv_file:
+            rows = list(csv.reader(csv_file))
+    # compare the written rows to the projection of the expected matches
+    expected_rows = []
+    with open(os.path.join(absolutePath, "test", "TestsExpected", "streamGoogleAscendMatches.txt")) as expected_file:
+        match_index = 0
+        for line in expected_file:
+            if line == "\n":
+                match_index += 1
+                continue
+            payload = ast.literal_eval(line)
+            expected_rows.append([str(match_index)] + [str(payload[attribute]) for attribute in event_attributes])
+    is_test_successful = rows[0] == ["match_index"] + event_attributes and \
+        sorted(row[1:] for row in rows[1:]) == sorted(row[1:] for row in expected_rows) and \
+        len(set(row[0] for row in rows[1:])) == len(set(row[0] for row in expected_rows))
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def teeOutputStreamTest(createTestFile=False):
+    testName = "teeOutputStream"
+    events = FileInputStream(nasdaqEventStreamShortPath)
+    matches_count = [0]
+
+    def count_match(match):
+        matches_count[0] += 1
+
+    matches = TeeOutputStream([CallbackOutputStream(count_match)])
+    matches.add_sink(FileOutputStream(os.path.join(absolutePath, "test", "Matches"), "%sMatches.txt" % testName),
+                     use_thread=True, buffer_size=16)
+    runTest(testName, [get_stream_test_pattern()], createTestFile, events=events,
+            expected_file_name="streamGoogleAscend", matches_stream=matches)
+    with open(os.path.join(absolutePath, "test", "TestsExpected", "streamGoogleAscendMatches.txt")) as expected_file:
+        expected_matches_count = expected_file.read().count("\n\n")
+    if matches_count[0] != expected_matches_count:
+        print("Test %s result: Failed, the callback received %s matches instead of %s" %
+              (testName, matches_count[0], expected_matches_count))
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def teeOutputStreamCloseTest(createTestFile=False):
+    testName = "teeOutputStreamClose"
+    start = datetime.now()
+    closed_sinks = []
+
+    class FailingOutputStream(CallbackOutputStream):
+        def close(self):
+            closed_sinks.append(self)
+            raise Exception("Failed to close %d" % (len(closed_sinks),))
+
+    class ClosedOutputStream(CallbackOutputStream):
+        def close(self):
+            closed_sinks.append(self)
+
+    received_items = []
+    sinks = [FailingOutputStream(received_items.append), ClosedOutputStream(received_items.append)]
+    threaded_sinks = [FailingOutputStream(received_items.append), ClosedOutputStream(received_items.append)]
+    stream = TeeOutputStream(sinks)
+    for sink in threaded_sinks:
+        stream.add_sink(sink, use_thread=True)
+    stream.add_items(["item"])
+    try:
+        stream.close()
+        is_test_successful = False
+    except Exception as e:
+        # every sink is closed and the threaded sinks deliver their items before the first error is re-raised
+        is_test_successful = str(e) == "Failed to close 1" and len(received_items) == 4 and \
+            sorted(map(id, closed_sinks)) == sorted(map(id, sinks + threaded_sinks))
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def pushEventsTest(createTestFile=False):
+    testName = "pushEvents"
+    cep = CEP([get_stream_test_pattern()], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS)
+    reported_matches = []
+    returned_matches = []
+    raw_events = list(FileInputStream(nasdaqEventStreamShortPath))
+    start = datetime.now()
+    cep.start(DEFAULT_TESTING_DATA_FORMATTER, reported_matches.append)
+    # push the first half of the events one by one and the rest in batches
+    half = len(raw_events) // 2
+    for raw_event in raw_events[:half]:
+        returned_matches.extend(cep.push_event(raw_event))
+    for i in range(half, len(raw_events), 7):
+        returned_matches.extend(cep.push_events(raw_events[i:i + 7]))
+    returned_matches.extend(cep.flush())
+    running_time = (datetime.now() - start).total_seconds()
+    matches = FileOutputStream(os.path.join(absolutePath, "test", "Matches"), "%sMatches.txt" % testName)
+    for match in returned_matches:
+        matches.add_item(match)
+    matches.close()
+    if reported_matches != returned_matches:
+        print("Test %s result: Failed, the reported matches differ from the returned ones" % (testName,))
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+        return
+    verifyStreamTestOutput(testName, "streamGoogleAscend", running_time)
+
+
+def compactPayloadsTest(createTestFile=False):
+    events = FileInputStream(nasdaqEventStreamShortPath)
+    runTest("compactPayloads", [get_stream_test_pattern()], createTestFile, events=events,
+            expected_file_name="streamGoogleAscend", data_formatter=MetastockDataFormatter(use_compact_payloads=True))
+
+
+def compactPayloadMappingTest(createTestFile=False):
+    testName = "compactPayloadMapping"
+    start = datetime.now()
+    payload = EventSchema(["Stock Ticker", "Peak Price"]).create_payload(["GOOG", 100.5])
+    payload["Peak Price"] = 101.5
+    expected_items = [("Stock Ticker", "GOOG"), ("Peak Price", 101.5), (Event.INDEX_ATTRIBUTE_NAME, None)]
+    items = payload.items()
+    # the views returned by items and values can be iterated more than once and reflect the changes of the payload
+    is_test_successful = list(items) == expected_items and list(items) == expected_items and \
+        list(payload.values()) == ["GOOG", 101.5, None] and dict(payload) == dict(expected_items)
+    payload["Peak Price"] = 102.5
+    is_test_successful = is_test_successful and ("Peak Price", 102.5) in items
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+
+
+def epochTimestampsTest(createTestFile=False):
+    timestamp_unit = timedelta(minutes=1)
+    eval_mechanism_params = TreeBasedEvaluationMechanismParameters(
+        storage_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS.storage_params,
+        optimizer_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS.optimizer_params,
+        timestamp_unit=timestamp_unit)
+    events = FileInputStream(nasdaqEventStreamShortPath)
+    runTest("epochTimestamps", [get_stream_test_pattern()], createTestFile, eval_mechanism_params, events=events,
+            expected_file_name="streamGoogleAscend", data_formatter=MetastockDataFormatter(timestamp_unit=timestamp_unit))
+
+
+def projectionPushdownTest(createTestFile=False):
+    testName = "projectionPushdown"
+    raw_events = list(FileInputStream(nasdaqEventStreamShortPath))
+    results = []
+    for project_event_attributes in [False, True]:
+        cep = CEP([get_stream_test_pattern()], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS,
+                  project_event_attributes=project_event_attributes)
+        events = Stream()
+        events.add_items(raw_events)
+        events.close()
+        matches = Stream()
+        running_time = cep.run(events, matches, DEFAULT_TESTING_DATA_FORMATTER)
+        results.append([[(event.type, event.timestamp, event.payload["Peak Price"]) for event in match.events]
+                        for match in matches])
+    projected_payload = DEFAULT_TESTING_DATA_FORMATTER.get_projection({"Peak Price"}).parse_event(raw_events[0])
+    if results[0] != results[1] or len(results[1]) == 0 or "Volume" in projected_payload:
+        print("Test %s result: Failed, the projected evaluation returned different matches" % (testName,))
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+        return
+    print("Test %s result: Succeeded, Time Passed: %s" % (testName, running_time))
+    runTest.over_all_time += running_time
+
+
+def rawEventTypeTest(createTestFile=False):
+    testName = "rawEventType"
+    start = datetime.now()
+    for data_formatter, file_name in [(MetastockDataFormatter(), "NASDAQ_SHORT.txt"),
+                                      (SensorsDataFormatter(), "Sensors_short.dat")]:
+        for raw_event in FileInputStream(os.path.join(absolutePath, "test", "EventFiles", file_name)):
+            if data_formatter.get_raw_event_type(raw_event) != Event(raw_event, data_formatter).type:
+                print("Test %s result: Failed, wrong raw event type for %s" % (testName, raw_event))
+                num_failed_tests.increase_counter()
+                num_failed_tests.failed_tests.add(testName)
+                return
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: Succeeded, Time Passed: %s" % (testName, running_time))
+    runTest.over_all_time += running_time
+
+
+def rawEventTimestampTest(createTestFile=False):
+    testName = "rawEventTimestamp"
+    start = datetime.now()
+    for data_formatter, file_name in [(MetastockDataFormatter(), "NASDAQ_SHORT.txt"),
+                                      (MetastockDataFormatter(timestamp_unit=timedelta(minutes=1)), "NASDAQ_SHORT.txt"),
+                                      (SensorsDataFormatter(), "Sensors_short.dat")]:
+        raw_events = list(FileInputStream(os.path.join(absolutePath, "test", "EventFiles", file_name)))
+        # a malformed timestamp is handled as when parsing the entire event
+        raw_events.append(raw_events[0].replace(",", ",x", 1))
+
+        def get_timestamp(get_raw_event_timestamp):
+            try:
+                return get_raw_event_timestamp()
+            except ValueError as e:
+                return str(e)
+        for raw_event in raw_events:
+            if get_timestamp(lambda: data_formatter.get_raw_event_timestamp(raw_event)) != \
+                    get_timestamp(lambda: Event(raw_event, data_formatter).timestamp):
+                print("Test %s result: Failed, wrong raw event timestamp for %s" % (testName, raw_event))
+                num_failed_tests.increase_counter()
+                num_failed_tests.failed_tests.add(testName)
+                return
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: Succeeded, Time Passed: %s" % (testName, running_time))
+    runTest.over_all_time += running_time
+
+
+def interleavedEnginesTest(createTestFile=False):
+    """
+    Pushes each event to two engines in turn. Since each engine numbers its own events, the contiguity constraints of
+    one engine are not affected by the events handled by the other one.
+    """
+    testName = "interleavedEngines"
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b"),
+                    PrimitiveEventStructure("AVID", "c")),
+        GreaterThanCondition(Variable("a", lambda x: x["Opening Price"]), Variable("c", lambda x: x["Opening Price"])),
+        timedelta(minutes=5),
+        ConsumptionPolicy(contiguous=["a", "b", "c"])
+    )
+    engines = [CEP([pattern], DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS) for _ in range(2)]
+    engine_matches = [[] for _ in engines]
+    start = datetime.now()
+    for cep in engines:
+        cep.start(DEFAULT_TESTING_DATA_FORMATTER)
+    for raw_event in nasdaqEventStreamTiny.duplicate():
+        for cep, returned_matches in zip(engines, engine_matches):
+            returned_matches.extend(cep.push_event(raw_event))
+    for cep, returned_matches in zip(engines, engine_matches):
+        returned_matches.extend(cep.flush())
+    running_time = (datetime.now() - start).total_seconds()
+    if [str(match) for match in engine_matches[0]] != [str(match) for match in engine_matches[1]]:
+        print("Test %s result: Failed, the engines reported different matches" % (testName,))
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
+        return
+    matches = FileOutputStream(os.path.join(absolutePath, "test", "Matches"), "%sMatches.txt" % testName)
+    for match in engine_matches[0]:
+        matches.add_item(match)
+    matches.close()
+    verifyStreamTestOutput(testName, "contiguousPolicySingleList", running_time)
+
+
+def compiledConditionTest(createTestFile=False):
+    testName = "compiledCondition"
+    condition = OrCondition(
+        AndCondition(
+            SmallerThanCondition(Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"])),
+            GreaterThanCondition(Variable("b", lambda x: x.get("Volume", 0)), 1000)
+        ),
+        SimpleCondition(Variable("a", lambda x: x["Opening Price"] - x["Close Price"]),
+                        Variable("b", lambda x: x["Lowest Price"]), relation_op=lambda x, y: x > y / 1000)
+    )
+    # the relations returning neither True nor False are treated the same way as by CompositeCondition.eval
+    non_boolean_condition = AndCondition(
+        SimpleCondition(Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"]),
+                        relation_op=lambda x, y: None if x < y else 0),
+        OrCondition(SimpleCondition(Variable("b", lambda x: x["Volume"]), relation_op=lambda x: x % 3),
+                    SmallerThanCondition(Variable("a", lambda x: x["Volume"]), 1000))
+    )
+    start = datetime.now()
+    events = [Event(raw_event, DEFAULT_TESTING_DATA_FORMATTER)
+              for raw_event in FileInputStream(nasdaqEventStreamShortPath)]
+    for tested_condition in [condition, non_boolean_condition]:
+        evaluate_condition = compile_condition(tested_condition, ["a", "b"])
+        for first_event, second_event in zip(events, events[1:]):
+            expected_result = tested_condition.eval({"a": first_event.payload, "b": second_event.payload})
+            if evaluate_condition is None or evaluate_condition([first_event, second_event]) != expected_result:
+                print("Test %s result: Failed, wrong result for %s and %s" % (testName, first_event, second_event))
+                num_failed_tests.increase_counter()
+                num_failed_tests.failed_tests.add(testName)
+                return
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: Succeeded, Time Passed: %s" % (testName, running_time))
+    runTest.over_all_time += running_time
+
+
+def attributeIntrospectionTest(createTestFile=False):
+    testName = "attributeIntrospection"
+    start = datetime.now()
+    # the attributes are deduced from the bytecode of the functions, which differs between the interpreter versions.
+    # Failing to recognize it would silently disable the projections and the inlined variables
+    is_test_successful = \
+        get_accessed_attribute_names(lambda x: x["Peak Price"]) == {"Peak Price"} and \
+        get_accessed_attribute_names(lambda x: x.get("Volume", 0)) == {"Volume"} and \
+        get_accessed_attribute_names(lambda x: x["Opening Price"] - x["Close Price"]) == \
+        {"Opening Price", "Close Price"} and \
+        get_subscripted_attribute_name(lambda x: x["Peak Price"]) == "Peak Price"
+    # the payload accessed in any other way is not mistaken for a constant attribute
+    is_test_successful = is_test_successful and \
+        all(get_accessed_attribute_names(getattr_func) is None
+            for getattr_func in [lambda x: len(x), lambda x: x, itemgetter("Volume")]) and \
+        all(get_subscripted_attribute_name(getattr_func) is None
+            for getattr_func in [lambda x: x["Volume"] + 1, lambda x: x.get("Volume"), itemgetter("Volume")])
+    # the unrecognized variables are compiled into calls of their functions
+    condition = SmallerThanCondition(Variable("a", itemgetter("Peak Price")),
+                                     Variable("b", lambda x: x["Peak Price"] * 1))
+    evaluate_condition = compile_condition(condition, ["a", "b"])
+    events = [Event(raw_event, DEFAULT_TESTING_DATA_FORMATTER) for raw_event in nasdaqEventStreamTiny.duplicate()]
+    is_test_successful = is_test_successful and evaluate_condition is not None and \
+        all(evaluate_condition([first_event, second_event]) ==
+            condition.eval({"a": first_event.payload, "b": second_event.payload})
+            for first_event, second_event in zip(events, events[1:]))
+    running_time = (datetime.now() - start).total_seconds()
+    print("Test %s result: %s, Time Passed: %s" % (testName,
+                                                   "Succeeded" if is_test_successful else "Failed", running_time))
+    runTest.over_all_time += running_time
+    if not is_test_successful:
+        num_failed_tests.increase_counter()
+        num_failed_tests.failed_tests.add(testName)
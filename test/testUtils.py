@@ -164,7 +164,7 @@ def runTest(testName, patterns, createTestFile=False,
             eval_mechanism_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS,
             parallel_execution_params: ParallelExecutionParameters = None,
             events=None, eventStream=nasdaqEventStream, expected_file_name=None,
-            data_formatter=DEFAULT_TESTING_DATA_FORMATTER):
+            data_formatter=DEFAULT_TESTING_DATA_FORMATTER, matches_stream: OutputStream = None):
     if expected_file_name is None:
         expected_file_name = testName
 
@@ -196,7 +196,8 @@ def runTest(testName, patterns, createTestFile=False,
     output_file_name = "%sMatches.txt" % testName.split('|')[0]
     expected_output_file_name = "%sMatches.txt" % expected_file_name.split('|')[0]
     is_async = parallel_execution_params is not None and parallel_execution_params.execution_mode == ParallelExecutionModes.DATA_PARALLELISM
-    matches_stream = FileOutputStream(base_matches_directory, output_file_name, is_async)
+    if matches_stream is None:
+        matches_stream = FileOutputStream(base_matches_directory, output_file_name, is_async)
     running_time = cep.run(events, matches_stream, data_formatter)
 
     expected_matches_path = os.path.join(absolutePath, 'test', 'TestsExpected', expected_output_file_name)
@@ -414,8 +415,13 @@ class runParallelTest:
         runParallelTest.units[self.unit_id].events_list.append(raw_event)
         self.events.add_item(raw_event)
 
+    def new_add_events(self, raw_events):
+        runParallelTest.units[self.unit_id].events_list.extend(raw_events)
+        self.events.add_items(raw_events)
+
     @staticmethod
     @patch.object(DataParallelExecutionAlgorithm.ExecutionUnit, 'add_event', new=new_add_event)
+    @patch.object(DataParallelExecutionAlgorithm.ExecutionUnit, 'add_events', new=new_add_events)
     @patch.object(DataParallelExecutionAlgorithm.FilterStream, 'add_item', new=new_add_item)
     def __init__(testName, patterns, createTestFile=False,
                  eval_mechanism_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS,
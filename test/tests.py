@@ -12,6 +12,7 @@ from test.NestedTests import *
 from test.UnitTests.test_storage import run_storage_tests
 from test.UnitTests.RuleTransformationTests import ruleTransformationTests
 from test.ParallelTests import *
+from test.StreamTests import *
 
 
 runTest.over_all_time = 0
@@ -132,6 +133,11 @@ freezePolicy2PatternSearchTest()
 
 # storage tests
 sortedStorageTest()
+vectorizedConditionsTest()
+attributeColumnTest()
+hashedStorageTest()
+hashStorageBucketsTest()
+sortedRangeStorageTest()
 run_storage_tests()
 
 # multi-pattern tests
@@ -308,6 +314,42 @@ localSimulatedSearchAndPatterns()
 localSimulatedSearchAndOpposite()
 localSimulatedBushySearchAndOpposite()
 
+# stream tests
+lazyFileInputStreamTest()
+lazyThreadedFileInputStreamTest()
+memoryMappedFileInputStreamTest()
+memoryMappedFileInputStreamRIPTest()
+memoryMappedFileInputStreamCloseTest()
+unfilledStreamTest()
+synchronizedStreamTest()
+gzipFileInputStreamTest()
+lazyXzFileInputStreamTest()
+bufferedFileOutputStreamTest()
+threadedBufferedFileOutputStreamTest()
+failedWriterThreadTest()
+binaryFileInputStreamTest()
+binaryFileWideSchemaTest()
+boundedUnitStreamRIPTest()
+asyncStreamTest()
+mergedInputStreamTest()
+reorderedInputStreamTest()
+reorderedEpochTimestampsTest()
+reorderedContiguityTest()
+jsonLinesFileOutputStreamTest()
+csvFileOutputStreamTest()
+teeOutputStreamTest()
+teeOutputStreamCloseTest()
+pushEventsTest()
+compactPayloadsTest()
+compactPayloadMappingTest()
+epochTimestampsTest()
+projectionPushdownTest()
+rawEventTypeTest()
+rawEventTimestampTest()
+interleavedEnginesTest()
+compiledConditionTest()
+attributeIntrospectionTest()
+
 # benchmarks
 if INCLUDE_BENCHMARKS:
     sortedStorageBenchMarkTest()
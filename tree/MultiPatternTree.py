@@ -1,3 +1,4 @@
+from datetime import timedelta
 from typing import Dict
 
 from base.Pattern import Pattern
@@ -6,6 +7,7 @@ from tree.PatternMatchStorage import TreeStorageParameters
 from base.PatternMatch import PatternMatch
 from tree.Tree import Tree
 from tree.nodes.NegationNode import NegationNode
+from misc.Utils import convert_time_window
 
 
 class MultiPatternTree:
@@ -13,10 +15,11 @@ class MultiPatternTree:
     Represents a multi-pattern evaluation tree.
     """
     def __init__(self, pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
-                 storage_params: TreeStorageParameters):
+                 storage_params: TreeStorageParameters, timestamp_unit: timedelta = None):
         self.__id_to_output_node_map = {}
         self.__id_to_pattern_map = {}
         self.__output_nodes = []
+        self.__timestamp_unit = timestamp_unit
         self.__construct_multi_pattern_tree(pattern_to_tree_plan_map, storage_params)
 
     def __construct_multi_pattern_tree(self, pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
@@ -29,7 +32,8 @@ class MultiPatternTree:
         plan_nodes_to_nodes_map = {}  # a cache for already created subtrees
         for i, (pattern, plan) in enumerate(pattern_to_tree_plan_map.items(), 1):
             pattern.id = i
-            new_tree_root = Tree(plan, pattern, storage_params, plan_nodes_to_nodes_map).get_root()
+            new_tree_root = Tree(plan, pattern, storage_params, plan_nodes_to_nodes_map,
+                                 self.__timestamp_unit).get_root()
             self.__id_to_output_node_map[pattern.id] = new_tree_root
             self.__id_to_pattern_map[pattern.id] = pattern
             self.__output_nodes.append(new_tree_root)
@@ -48,7 +52,7 @@ class MultiPatternTree:
         Returns True if the given match satisfies the window/confidence constraints of the given pattern
         and False otherwise.
         """
-        if match.last_timestamp - match.first_timestamp > pattern.window:
+        if match.last_timestamp - match.first_timestamp > convert_time_window(pattern.window, self.__timestamp_unit):
             return False
         return pattern.confidence is None or match.probability is None or match.probability >= pattern.confidence
 
@@ -1,10 +1,130 @@
+from bisect import bisect_left, bisect_right
+from heapq import heappop, heappush
+from itertools import count
+
+from base.Event import AggregatedEvent
 from base.PatternMatch import PatternMatch
 from misc import DefaultConfig
-from misc.Utils import get_first_index, get_last_index
 from datetime import datetime
 from misc.Utils import find_partial_match_by_timestamp
 from condition.Condition import RelopTypes, EquationSides
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the largest magnitude of an integer which is exactly representable by a float
+MAX_EXACT_FLOAT_INTEGER = 2 ** 53
+
+
+def is_column_value(value):
+    """
+    Returns True if the given value can be stored in a column and compared with a column without losing precision.
+    """
+    if value.__class__ is float:
+        return True
+    return isinstance(value, (int, float)) and -MAX_EXACT_FLOAT_INTEGER <= value <= MAX_EXACT_FLOAT_INTEGER
+
+
+class AttributeColumn:
+    """
+    Keeps the values of an attribute of the event at a given index of the pattern matches of a storage, in the order of
+    its internal buffer, in a growable NumPy array. A value which is not a number or whose calculation failed is marked
+    as invalid, such that the conditions on its pattern match are evaluated as usual.
+    """
+    INITIAL_CAPACITY = 16
+
+    def __init__(self, event_index: int, getattr_func: callable, partial_matches: list):
+        self.__event_index = event_index
+        self.__getattr_func = getattr_func
+        capacity = max(AttributeColumn.INITIAL_CAPACITY, 2 * len(partial_matches))
+        self.__data = numpy.zeros(capacity, numpy.int64)
+        self.__is_valid = numpy.zeros(capacity, bool)
+        self.__size = 0
+        self.__invalid_count = 0
+        # set whenever the column is requested, allowing the storage to discard the columns which are no longer used
+        self.is_used = True
+        for pm in partial_matches:
+            self.insert(pm)
+
+    def get(self):
+        """
+        Returns an array of the values along with an array marking the valid values, or None instead of the latter if
+        all values are valid. None is returned if no value is valid.
+        """
+        size = self.__size
+        if self.__invalid_count == 0:
+            return self.__data[:size], None
+        if self.__invalid_count == size:
+            return None
+        return self.__data[:size], self.__is_valid[:size]
+
+    def insert(self, pm: PatternMatch, index: int = None):
+        """
+        Calculates the value of a new pattern match inserted at the given index, or appended if no index is specified.
+        """
+        value = self.__get_value(pm)
+        is_valid = is_column_value(value)
+        if not is_valid:
+            value = 0
+            self.__invalid_count += 1
+        elif isinstance(value, float) and self.__data.dtype != numpy.float64:
+            # the integers stored so far are exactly representable by floats
+            self.__data = self.__data.astype(numpy.float64)
+        if self.__size == len(self.__data):
+            self.__data = numpy.concatenate((self.__data, numpy.zeros_like(self.__data)))
+            self.__is_valid = numpy.concatenate((self.__is_valid, numpy.zeros_like(self.__is_valid)))
+        size = self.__size
+        if index is None or index == size:
+            index = size
+        else:
+            self.__data[index + 1:size + 1] = self.__data[index:size]
+            self.__is_valid[index + 1:size + 1] = self.__is_valid[index:size]
+        self.__data[index] = value
+        self.__is_valid[index] = is_valid
+        self.__size += 1
+
+    def remove_prefix(self, count: int):
+        """
+        Removes the values of the first count pattern matches.
+        """
+        self.__keep(slice(count, self.__size))
+
+    def keep(self, indices: list):
+        """
+        Keeps the values of the pattern matches at the given indices only.
+        """
+        self.__keep(numpy.array(indices, numpy.int64))
+
+    def __keep(self, selection):
+        """
+        Replaces the content of the column with the values at the given selection of the current content.
+        """
+        data = self.__data[:self.__size][selection]
+        is_valid = self.__is_valid[:self.__size][selection]
+        self.__size = len(data)
+        self.__invalid_count = self.__size - int(numpy.count_nonzero(is_valid))
+        capacity = max(AttributeColumn.INITIAL_CAPACITY, 2 * self.__size)
+        self.__data = numpy.zeros(capacity, data.dtype)
+        self.__data[:self.__size] = data
+        self.__is_valid = numpy.zeros(capacity, bool)
+        self.__is_valid[:self.__size] = is_valid
+
+    def __get_value(self, pm: PatternMatch):
+        """
+        Returns the value of the attribute for the given pattern match, or None if it cannot be calculated.
+        """
+        event = pm.events[self.__event_index]
+        if isinstance(event, AggregatedEvent):
+            # the content of an aggregated event is not a single payload
+            return None
+        try:
+            return self.__getattr_func(event.payload)
+        except Exception:
+            # the condition will fail in the regular evaluation
+            return None
+
 
 class PatternMatchStorage:
     """
@@ -23,6 +143,8 @@ class PatternMatchStorage:
         self._sorted_by_arrival_order = sorted_by_arrival_order
         self._clean_up_interval = clean_up_interval
         self._access_count = 0
+        # the attribute columns of the stored pattern matches, by the event index and the attribute function
+        self._columns = {}
 
     def get_key_function(self):
         """
@@ -41,6 +163,7 @@ class PatternMatchStorage:
         Implements list-style "set item" semantics.
         """
         self._partial_matches[index] = item
+        self._columns.clear()
 
     def __getitem__(self, index):
         """
@@ -54,6 +177,7 @@ class PatternMatchStorage:
         Implements list-style "remove item" semantics.
         """
         del self._partial_matches[index]
+        self._columns.clear()
 
     def __iter__(self):
         """
@@ -81,12 +205,31 @@ class PatternMatchStorage:
         """
         Removes pattern matches whose earliest earliest_timestamp violates the time window constraint.
         """
+        self.__discard_unused_columns()
         if self._sorted_by_arrival_order:
             count = find_partial_match_by_timestamp(self._partial_matches, earliest_timestamp)
             self._partial_matches = self._partial_matches[count:]
-        else:
+            for column in self._columns.values():
+                column.remove_prefix(count)
+            return
+        if len(self._columns) == 0:
             self._partial_matches = list(filter(lambda pm: pm.first_timestamp >= earliest_timestamp,
                                                 self._partial_matches))
+            return
+        kept_indices = [i for i, pm in enumerate(self._partial_matches) if pm.first_timestamp >= earliest_timestamp]
+        self._partial_matches = [self._partial_matches[i] for i in kept_indices]
+        for column in self._columns.values():
+            column.keep(kept_indices)
+
+    def __discard_unused_columns(self):
+        """
+        Discards the columns which were not requested since the previous cleanup, e.g., since the conditions of the
+        node were replaced, so that they are no longer maintained upon each insertion.
+        """
+        for key, column in list(self._columns.items()):
+            if not column.is_used:
+                del self._columns[key]
+            column.is_used = False
 
     def get_internal_buffer(self):
         """
@@ -94,6 +237,35 @@ class PatternMatchStorage:
         """
         return self._partial_matches
 
+    def is_internal_buffer(self, partial_matches: list):
+        """
+        Returns True if the given list is the internal buffer of this storage, to which the columns correspond.
+        """
+        return partial_matches is self._partial_matches
+
+    def get_column(self, event_index: int, getattr_func: callable):
+        """
+        Returns a NumPy array containing the values of the given attribute of the event at the given index for all
+        stored pattern matches, in the order of the internal buffer, along with an array marking the valid values or
+        None if all values are valid (see AttributeColumn). The values are calculated once for each pattern match and
+        maintained along with the buffer from this point on. None is returned if no value is valid.
+        """
+        key = (event_index, getattr_func)
+        column = self._columns.get(key)
+        if column is None:
+            column = AttributeColumn(event_index, getattr_func, self._partial_matches)
+            self._columns[key] = column
+        column.is_used = True
+        return column.get()
+
+    def _add_column_values(self, pm: PatternMatch, index: int = None):
+        """
+        Calculates the values of the maintained columns for a new pattern match inserted at the given index, or
+        appended if no index is specified.
+        """
+        for column in self._columns.values():
+            column.insert(pm, index)
+
     def add(self, pm: PatternMatch):
         """
         Adds a new pattern match to the storage.
@@ -110,10 +282,13 @@ class PatternMatchStorage:
 class SortedPatternMatchStorage(PatternMatchStorage):
     """
     This class stores the pattern matches sorted in increasing order according to a predefined function (key).
+    The key of each pattern match is calculated once upon insertion and kept in a parallel list, which is binary
+    searched using bisect.
     """
     def __init__(self, get_match_key: callable, rel_op: RelopTypes, equation_side: EquationSides,
                  clean_up_interval: int, sort_by_first_timestamp=False, in_leaf=False):
         super().__init__(get_match_key, in_leaf and sort_by_first_timestamp, clean_up_interval)
+        self.__keys = []
         self.__get_function = self.__generate_get_function(rel_op, equation_side)
 
     def __contains__(self, item):
@@ -123,18 +298,39 @@ class SortedPatternMatchStorage(PatternMatchStorage):
         """
         return item in self.__get_equal(self._get_key(item))
 
+    def __setitem__(self, index, item):
+        """
+        Implements list-style "set item" semantics.
+        """
+        super().__setitem__(index, item)
+        self.__keys = [self._get_key(pm) for pm in self._partial_matches]
+
+    def __delitem__(self, index):
+        """
+        Implements list-style "remove item" semantics.
+        """
+        super().__delitem__(index)
+        del self.__keys[index]
+
     def add(self, pm: PatternMatch):
         """
         Efficiently inserts the new pattern match to the storage according to its key.
         """
         self._access_count += 1
+        key = self._get_key(pm)
         if self._sorted_by_arrival_order:
             # no need for artificially sorting
             self._partial_matches.append(pm)
+            self.__keys.append(key)
+            if len(self._columns) > 0:
+                self._add_column_values(pm)
             return
-        index = get_last_index(self._partial_matches, self._get_key(pm), self._get_key)
-        index = 0 if index == -1 else index
+        # the pattern matches sharing the same key are kept in their order of arrival
+        index = bisect_right(self.__keys, key)
         self._partial_matches.insert(index, pm)
+        self.__keys.insert(index, key)
+        if len(self._columns) > 0:
+            self._add_column_values(pm, index)
 
     def get(self, value: int or float):
         """
@@ -144,81 +340,56 @@ class SortedPatternMatchStorage(PatternMatchStorage):
             return []
         return self.__get_function(value)
 
+    def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
+        """
+        Removes the expired pattern matches along with their keys.
+        """
+        if self._sorted_by_arrival_order:
+            self.__keys = self.__keys[find_partial_match_by_timestamp(self._partial_matches, earliest_timestamp):]
+        else:
+            self.__keys = [key for key, pm in zip(self.__keys, self._partial_matches)
+                           if pm.first_timestamp >= earliest_timestamp]
+        super()._clean_expired_partial_matches(earliest_timestamp)
+
     def __get_equal(self, value: int or float):
         """
         Returns the pattern matches whose keys are equal to the given value.
         """
-        left_index = get_first_index(self._partial_matches, value, self._get_key)
-        if left_index == len(self._partial_matches) or left_index == -1 or \
-                self._get_key(self._partial_matches[left_index]) != value:
-            return []
-        right_index = get_last_index(self._partial_matches, value, self._get_key)
-        return self._partial_matches[left_index: right_index + 1]
+        return self._partial_matches[bisect_left(self.__keys, value): bisect_right(self.__keys, value)]
 
     def __get_unequal(self, value: int or float):
         """
         Returns the pattern matches whose keys are not equal to the given value.
         """
-        left_index = get_first_index(self._partial_matches, value, self._get_key)
-        if left_index == len(self._partial_matches) or left_index == -1 or \
-                self._get_key(self._partial_matches[left_index]) != value:
-            return self._partial_matches
-        right_index = get_last_index(self._partial_matches, value, self._get_key)
-        return self._partial_matches[:left_index] + self._partial_matches[right_index + 1:]
-
-    def __get_greater_aux(self, value: int or float, return_equal: bool):
-        """
-        An auxiliary method for implementing "greater than" or "greater than or equal to" conditions.
-        """
-        right_index = get_first_index(self._partial_matches, value, self._get_key) if return_equal \
-            else get_last_index(self._partial_matches, value, self._get_key)
-        if right_index == len(self._partial_matches):
-            return []
-        if right_index == -1:
+        left_index = bisect_left(self.__keys, value)
+        right_index = bisect_right(self.__keys, value)
+        if left_index == right_index:
             return self._partial_matches
-        # in case value doesn't exist right_index will point on the first one greater than it
-        if self._get_key(self._partial_matches[right_index]) != value:
-            return self._partial_matches[right_index:]
-        return self._partial_matches[right_index:] if return_equal else self._partial_matches[right_index + 1:]
+        return self._partial_matches[:left_index] + self._partial_matches[right_index:]
 
     def __get_greater(self, value: int or float):
         """
         Returns the pattern matches whose keys are greater than the given value.
         """
-        return self.__get_greater_aux(value, False)
+        return self._partial_matches[bisect_right(self.__keys, value):]
 
     def __get_greater_or_equal(self, value: int or float):
         """
         Returns the pattern matches whose keys are greater than or equal to the given value.
         """
-        return self.__get_greater_aux(value, True)
-
-    def __get_smaller_aux(self, value: int or float, return_equal: bool):
-        """
-        An auxiliary method for implementing "smaller than" or "smaller than or equal to" conditions.
-        """
-        left_index = get_last_index(self._partial_matches, value, self._get_key) if return_equal \
-            else get_first_index(self._partial_matches, value, self._get_key)
-        if left_index == len(self._partial_matches):
-            return self._partial_matches
-        if left_index == -1:
-            return []
-        # in case value doesn't exist left_index will point on the first one smaller than it
-        if self._get_key(self._partial_matches[left_index]) != value:
-            return self._partial_matches[: left_index + 1]
-        return self._partial_matches[:left_index + 1] if return_equal else self._partial_matches[:left_index]
+        return self._partial_matches[bisect_left(self.__keys, value):]
 
     def __get_smaller(self, value: int or float):
         """
         Returns the pattern matches whose keys are smaller than the given value.
         """
-        return self.__get_smaller_aux(value, False)
+        return self._partial_matches[:bisect_left(self.__keys, value)]
 
     def __get_smaller_or_equal(self, value: int or float):
         """
         Returns the pattern matches whose keys are smaller than or equal to the given value.
         """
-        return self.__get_smaller_aux(value, True)
+        return self._partial_matches[:bisect_right(self.__keys, value)]
 
     def __get_all(self, value: int or float):
         """
@@ -263,6 +434,8 @@ class UnsortedPatternMatchStorage(PatternMatchStorage):
         """
         self._access_count += 1
         self._partial_matches.append(pm)
+        if len(self._columns) > 0:
+            self._add_column_values(pm)
 
     def get(self, value: int or float):
         """
@@ -271,13 +444,172 @@ class UnsortedPatternMatchStorage(PatternMatchStorage):
         return self._partial_matches
 
 
+class HashPatternMatchStorage(PatternMatchStorage):
+    """
+    This class stores the pattern matches in buckets according to the value of a predefined function (key), such that
+    the pattern matches with a given key are retrieved in constant time. It is used for equality conditions.
+    Each bucket keeps its pattern matches in their order of arrival, along with the earliest timestamp of its pattern
+    matches. A heap of these timestamps allows the cleanup to only visit the buckets containing expired pattern matches,
+    whose prefix is trimmed when the storage belongs to a leaf.
+    The pattern matches whose keys cannot be hashed (e.g., lists) are kept in a separate list which is searched
+    linearly, as done by an unsorted storage.
+    """
+    def __init__(self, get_match_key: callable, clean_up_interval: int, in_leaf=False):
+        super().__init__(get_match_key, in_leaf, clean_up_interval)
+        self.__buckets = {}
+        self.__earliest_timestamps = {}
+        # (timestamp, serial number, key) entries - an entry is outdated if the earliest timestamp of its bucket changed
+        self.__expiration_heap = []
+        self.__serial_numbers = count()
+        self.__unhashable_entries = []
+        self.__size = 0
+
+    def __len__(self):
+        return self.__size
+
+    def __iter__(self):
+        return iter(self.get_internal_buffer())
+
+    def __getitem__(self, index):
+        return self.get_internal_buffer()[index]
+
+    def __contains__(self, item):
+        """
+        Returns True if the given item is stored and False otherwise.
+        Only searches the bucket of the item.
+        """
+        return item in self.get(self._get_key(item))
+
+    def __setitem__(self, index, item):
+        """
+        Implements list-style "set item" semantics.
+        """
+        partial_matches = self.get_internal_buffer()
+        partial_matches[index] = item
+        self.__rebuild(partial_matches)
+
+    def __delitem__(self, index):
+        """
+        Implements list-style "remove item" semantics.
+        """
+        partial_matches = self.get_internal_buffer()
+        del partial_matches[index]
+        self.__rebuild(partial_matches)
+
+    def get_internal_buffer(self):
+        """
+        Returns a new list containing all stored pattern matches. If the storage belongs to a leaf, the pattern matches
+        are sorted by their timestamps.
+        """
+        partial_matches = [pm for bucket in self.__buckets.values() for pm in bucket]
+        partial_matches.extend(pm for _, pm in self.__unhashable_entries)
+        if self._sorted_by_arrival_order:
+            partial_matches.sort(key=lambda pm: pm.first_timestamp)
+        return partial_matches
+
+    def is_internal_buffer(self, partial_matches: list):
+        """
+        The buckets are never returned as a whole, hence no columns are maintained for this storage.
+        """
+        return False
+
+    def add(self, pm: PatternMatch):
+        """
+        Appends the new pattern match to the bucket of its key.
+        """
+        self._access_count += 1
+        self.__add_to_bucket(pm)
+
+    def get(self, value: int or float):
+        """
+        Returns a new list containing the pattern matches whose keys are equal to the given value.
+        """
+        try:
+            partial_matches = list(self.__buckets.get(value, ()))
+        except TypeError:
+            partial_matches = []
+        if len(self.__unhashable_entries) > 0:
+            partial_matches.extend(pm for key, pm in self.__unhashable_entries if key == value)
+        return partial_matches
+
+    def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
+        """
+        Removes the expired pattern matches from the buckets whose earliest timestamp precedes the given one. Empty
+        buckets are discarded.
+        """
+        expiration_heap = self.__expiration_heap
+        while len(expiration_heap) > 0 and expiration_heap[0][0] < earliest_timestamp:
+            timestamp, _, key = heappop(expiration_heap)
+            if self.__earliest_timestamps.get(key) != timestamp:
+                # an outdated entry
+                continue
+            bucket = self.__buckets[key]
+            bucket_size = len(bucket)
+            if self._sorted_by_arrival_order:
+                del bucket[:find_partial_match_by_timestamp(bucket, earliest_timestamp)]
+            else:
+                bucket[:] = [pm for pm in bucket if pm.first_timestamp >= earliest_timestamp]
+            self.__size -= bucket_size - len(bucket)
+            if len(bucket) == 0:
+                del self.__buckets[key]
+                del self.__earliest_timestamps[key]
+                continue
+            self.__set_earliest_timestamp(key, bucket[0].first_timestamp if self._sorted_by_arrival_order
+                                          else min(pm.first_timestamp for pm in bucket))
+        if len(self.__unhashable_entries) > 0:
+            unhashable_count = len(self.__unhashable_entries)
+            self.__unhashable_entries = [(key, pm) for key, pm in self.__unhashable_entries
+                                         if pm.first_timestamp >= earliest_timestamp]
+            self.__size -= unhashable_count - len(self.__unhashable_entries)
+
+    def __add_to_bucket(self, pm: PatternMatch):
+        """
+        Appends the given pattern match to the bucket of its key.
+        """
+        key = self._get_key(pm)
+        self.__size += 1
+        try:
+            bucket = self.__buckets.get(key)
+        except TypeError:
+            self.__unhashable_entries.append((key, pm))
+            return
+        if bucket is None:
+            self.__buckets[key] = [pm]
+            self.__set_earliest_timestamp(key, pm.first_timestamp)
+            return
+        bucket.append(pm)
+        if pm.first_timestamp < self.__earliest_timestamps[key]:
+            self.__set_earliest_timestamp(key, pm.first_timestamp)
+
+    def __set_earliest_timestamp(self, key, timestamp):
+        """
+        Records the earliest timestamp of the pattern matches in the bucket of the given key.
+        """
+        self.__earliest_timestamps[key] = timestamp
+        heappush(self.__expiration_heap, (timestamp, next(self.__serial_numbers), key))
+
+    def __rebuild(self, partial_matches: list):
+        """
+        Recreates the buckets from the given pattern matches.
+        """
+        self.__buckets = {}
+        self.__earliest_timestamps = {}
+        self.__expiration_heap = []
+        self.__unhashable_entries = []
+        self.__size = 0
+        for pm in partial_matches:
+            self.__add_to_bucket(pm)
+
+
 class TreeStorageParameters:
     """
     Parameters for the evaluation tree to specify how to store the data.
     """
     def __init__(self, sort_storage: bool = DefaultConfig.SHOULD_SORT_STORAGE, attributes_priorities: dict = None,
                  clean_up_interval: int = DefaultConfig.CLEANUP_INTERVAL,
-                 prioritize_sorting_by_timestamp: bool = DefaultConfig.PRIORITIZE_SORTING_BY_TIMESTAMP):
+                 prioritize_sorting_by_timestamp: bool = DefaultConfig.PRIORITIZE_SORTING_BY_TIMESTAMP,
+                 vectorize_conditions: bool = DefaultConfig.VECTORIZE_CONDITIONS,
+                 vectorized_evaluation_threshold: int = DefaultConfig.VECTORIZED_EVALUATION_THRESHOLD):
         if sort_storage is None:
             sort_storage = DefaultConfig.SHOULD_SORT_STORAGE
         if attributes_priorities is None:
@@ -286,6 +618,10 @@ class TreeStorageParameters:
             raise Exception('cleanup interval should be positive.')
         if prioritize_sorting_by_timestamp is None:
             prioritize_sorting_by_timestamp = DefaultConfig.PRIORITIZE_SORTING_BY_TIMESTAMP
+        if vectorize_conditions is None:
+            vectorize_conditions = DefaultConfig.VECTORIZE_CONDITIONS
+        if vectorize_conditions and numpy is None:
+            raise Exception("The numpy package is required for vectorized condition evaluation.")
 
         # True if the user is willing to use non-default sorted storage and False otherwise
         self.sort_storage = sort_storage
@@ -296,3 +632,9 @@ class TreeStorageParameters:
         # The number of partial match additions after which a cleanup operation will be applied
         self.clean_up_interval = clean_up_interval
         self.prioritize_sorting_by_timestamp = prioritize_sorting_by_timestamp
+
+        # If True, the numeric attributes of the stored partial matches are kept in NumPy arrays and the relation
+        # conditions between the subtrees of a node are evaluated on all candidate partial matches at once
+        self.vectorize_conditions = vectorize_conditions
+        # The minimal number of candidate partial matches for which the conditions are evaluated in bulk
+        self.vectorized_evaluation_threshold = vectorized_evaluation_threshold
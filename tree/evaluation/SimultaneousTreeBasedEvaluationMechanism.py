@@ -21,11 +21,15 @@ class SimultaneousTreeBasedEvaluationMechanism(TreeBasedEvaluationMechanism):
                  storage_params: TreeStorageParameters,
                  statistics_collector: StatisticsCollector = None,
                  optimizer: Optimizer = None,
-                 statistics_update_time_window: timedelta = None):
+                 statistics_update_time_window: timedelta = None,
+                 allowed_lateness: timedelta = None,
+                 timestamp_unit: timedelta = None):
         super().__init__(pattern_to_tree_plan_map, storage_params,
                          statistics_collector,
                          optimizer,
-                         statistics_update_time_window)
+                         statistics_update_time_window,
+                         allowed_lateness,
+                         timestamp_unit)
         self.__new_tree = None
         self.__new_event_types_listeners = None
         self.__is_simultaneous_state = False
@@ -59,7 +63,7 @@ class SimultaneousTreeBasedEvaluationMechanism(TreeBasedEvaluationMechanism):
         if self.__is_simultaneous_state:
             # After this round we ask if we are in a simultaneous state.
             # If the pattern window is over then we want to return to single tree state.
-            if event.max_timestamp - self.__tree_update_time > self._pattern.window:
+            if event.max_timestamp - self.__tree_update_time > self._time_window:
                 # Passes pending matches from the old tree to the new tree if the root is a NegationNode
                 self.__last_matches_from_old_tree = self._tree.get_last_matches()
 
@@ -1,13 +1,14 @@
 from abc import ABC
 from typing import Dict
 from base.DataFormatter import DataFormatter
-from base.Event import Event
+from base.Event import Event, EventIdAllocator
 from plan.TreePlan import TreePlan
 from stream.Stream import InputStream, OutputStream
 from misc.Utils import *
 from tree.nodes.LeafNode import LeafNode
 from tree.PatternMatchStorage import TreeStorageParameters
 from evaluation.EvaluationMechanism import EvaluationMechanism
+from evaluation.EventReorderBuffer import EventReorderBuffer
 from misc.ConsumptionPolicy import *
 from tree.MultiPatternTree import MultiPatternTree
 from adaptive.statistics import StatisticsCollector
@@ -24,27 +25,45 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
                  storage_params: TreeStorageParameters,
                  statistics_collector: StatisticsCollector = None,
                  optimizer: Optimizer = None,
-                 statistics_update_time_window: timedelta = None):
+                 statistics_update_time_window: timedelta = None,
+                 allowed_lateness: timedelta = None,
+                 timestamp_unit: timedelta = None):
+        # if specified, the event timestamps are integers and all time intervals are converted accordingly
+        self.__timestamp_unit = timestamp_unit
         self.__is_multi_pattern_mode = len(pattern_to_tree_plan_map) > 1
         if self.__is_multi_pattern_mode:
             # TODO: support statistic collection in the multi-pattern mode
-            self._tree = MultiPatternTree(pattern_to_tree_plan_map, storage_params)
+            self._tree = MultiPatternTree(pattern_to_tree_plan_map, storage_params, timestamp_unit)
         else:
             pattern = list(pattern_to_tree_plan_map)[0]
             pattern.condition.set_statistics_collector(statistics_collector)
             self._tree = Tree(list(pattern_to_tree_plan_map.values())[0],
-                              list(pattern_to_tree_plan_map)[0], storage_params)
+                              list(pattern_to_tree_plan_map)[0], storage_params, timestamp_unit=timestamp_unit)
 
         self.__storage_params = storage_params
         self.__statistics_collector = statistics_collector
         self.__optimizer = optimizer
 
         self._event_types_listeners = {}
-        self.__statistics_update_time_window = statistics_update_time_window
+        # the serial numbers of the events are only required to be unique among the events played on this mechanism
+        self.__event_id_allocator = EventIdAllocator()
+        self.__statistics_update_time_window = convert_time_window(statistics_update_time_window, timestamp_unit)
+
+        # the state of the current evaluation, initialized by start_eval
+        self.__matches = None
+        self.__data_formatter = None
+        self.__last_statistics_refresh_time = None
+
+        # if enabled, the events arriving out of order are sorted before being played on the tree
+        if allowed_lateness is not None and not isinstance(allowed_lateness, timedelta):
+            raise Exception("The allowed lateness should be a timedelta, also when the timestamps are integers.")
+        self.__allowed_lateness = convert_time_window(allowed_lateness, timestamp_unit)
+        self.__reorder_buffer = None
 
         # The remainder of the initialization process is only relevant for the freeze map feature. This feature can
         # only be enabled in single-pattern mode.
         self._pattern = list(pattern_to_tree_plan_map)[0] if not self.__is_multi_pattern_mode else None
+        self._time_window = convert_time_window(self._pattern.window, timestamp_unit) if self._pattern is not None else None
         self.__freeze_map = {}
         self.__active_freezers = []
 
@@ -57,26 +76,96 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
         Activates the tree evaluation mechanism on the input event stream and reports all found pattern matches to the
         given output stream.
         """
+        self.start_eval(matches, data_formatter)
+        for raw_events in events.iterate_batches():
+            self.eval_raw_events(raw_events)
+        self.finish_eval()
+        matches.close()
+
+    def start_eval(self, matches: OutputStream, data_formatter: DataFormatter):
+        """
+        Prepares the evaluation mechanism for receiving events incrementally via eval_raw_events.
+        """
+        if data_formatter.get_timestamp_unit() != self.__timestamp_unit:
+            raise Exception("The timestamp unit of the data formatter (%s) differs from the one of the evaluation "
+                            "mechanism (%s)." % (data_formatter.get_timestamp_unit(), self.__timestamp_unit))
         self._event_types_listeners = self._register_event_listeners(self._tree)
-        last_statistics_refresh_time = None
+        self.__last_statistics_refresh_time = None
+        self.__matches = matches
+        self.__data_formatter = data_formatter
+        if self.__allowed_lateness is not None:
+            self.__reorder_buffer = EventReorderBuffer(self.__allowed_lateness, self.__timestamp_unit)
 
-        for raw_event in events:
-            event = Event(raw_event, data_formatter)
+    def get_event_id_allocator(self):
+        """
+        Returns the allocator assigning the serial numbers of the events played on this evaluation mechanism.
+        """
+        return self.__event_id_allocator
+
+    def eval_raw_events(self, raw_events: List):
+        """
+        Plays the given raw events on the tree and reports the resulting pattern matches.
+        """
+        data_formatter = self.__data_formatter
+        # a block of serial numbers is reserved for the entire batch, including the events dropped below
+        first_event_id = self.__event_id_allocator.allocate(len(raw_events)) if self.__reorder_buffer is None else 0
+        for event_id, raw_event in enumerate(raw_events, first_event_id):
+            raw_event_type = data_formatter.get_raw_event_type(raw_event)
+            if raw_event_type is not None and raw_event_type not in self._event_types_listeners:
+                # the event is dropped without being parsed
+                continue
+            event = Event(raw_event, data_formatter, event_id)
             if event.type not in self._event_types_listeners:
                 continue
-            self.__remove_expired_freezers(event)
+            if self.__reorder_buffer is None:
+                self.__eval_event(event)
+                continue
+            self.__eval_released_events(self.__reorder_buffer.add_event(event))
 
-            if not self.__is_multi_pattern_mode and self.__statistics_collector is not None:
-                # TODO: support multi-pattern mode
-                last_statistics_refresh_time = self.__perform_reoptimization(last_statistics_refresh_time, event)
+    def __eval_released_events(self, events: List[Event]):
+        """
+        Numbers the events released by the reorder buffer and plays them on the tree.
+        Since the contiguity conditions compare the serial numbers of the events, the reordered events are numbered in
+        their timestamp order rather than in their order of arrival. The events of irrelevant types never enter the
+        buffer, hence the contiguity conditions only apply to the events of the relevant types.
+        """
+        if len(events) == 0:
+            return
+        first_event_id = self.__event_id_allocator.allocate(len(events))
+        for event_id, event in enumerate(events, first_event_id):
+            event.payload[Event.INDEX_ATTRIBUTE_NAME] = event_id
+            self.__eval_event(event)
+
+    def __eval_event(self, event: Event):
+        """
+        Plays a single event on the tree and reports the resulting pattern matches.
+        """
+        self.__remove_expired_freezers(event)
+
+        if not self.__is_multi_pattern_mode and self.__statistics_collector is not None:
+            # TODO: support multi-pattern mode
+            self.__last_statistics_refresh_time = self.__perform_reoptimization(
+                self.__last_statistics_refresh_time, event)
 
-            self._play_new_event_on_tree(event, matches)
-            self._get_matches(matches)
+        self._play_new_event_on_tree(event, self.__matches)
+        self._get_matches(self.__matches)
 
+    def finish_eval(self):
+        """
+        Reports the matches still pending in the tree once no more events are expected. The output stream is not
+        closed by this method.
+        """
+        if self.__reorder_buffer is not None:
+            self.__eval_released_events(self.__reorder_buffer.flush())
         # Now that we finished the input stream, if there were some pending matches somewhere in the tree, we will
         # collect them now
-        self._get_last_pending_matches(matches)
-        matches.close()
+        self._get_last_pending_matches(self.__matches)
+
+    def get_dropped_late_events_count(self):
+        """
+        Returns the number of events dropped for arriving later than the allowed lateness.
+        """
+        return 0 if self.__reorder_buffer is None else self.__reorder_buffer.get_dropped_events_count()
 
     def __perform_reoptimization(self, last_statistics_refresh_time: timedelta, last_event: Event):
         """
@@ -90,7 +179,7 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
         new_statistics = self.__statistics_collector.get_statistics()
         if self.__optimizer.should_optimize(new_statistics, self._pattern):
             new_tree_plan = self.__optimizer.build_new_plan(new_statistics, self._pattern)
-            new_tree = Tree(new_tree_plan, self._pattern, self.__storage_params)
+            new_tree = Tree(new_tree_plan, self._pattern, self.__storage_params, timestamp_unit=self.__timestamp_unit)
             self._tree_update(new_tree, last_event.max_timestamp)
         # this is the new last statistic refresh time
         return last_event.max_timestamp
@@ -201,7 +290,7 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
             # freeze option disabled
             return False
         self.__active_freezers = [freezer for freezer in self.__active_freezers
-                                  if event.max_timestamp - freezer.min_timestamp <= self._pattern.window]
+                                  if event.max_timestamp - freezer.min_timestamp <= self._time_window]
 
     def get_structure_summary(self):
         return self._tree.get_structure_summary()
@@ -2,13 +2,15 @@ from abc import ABC
 from datetime import timedelta
 from typing import List, Set
 
-from base.Event import Event
+from base.Event import Event, AggregatedEvent
 from misc.Utils import calculate_joint_probability
-from condition.Condition import Condition, Variable, EquationSides
-from condition.BaseRelationCondition import BaseRelationCondition
+from condition.Condition import Condition, Variable, EquationSides, SimpleCondition
+from condition.CompositeCondition import AndCondition
+from condition.BaseRelationCondition import BaseRelationCondition, RELOP_TYPE_FUNCTIONS
 from base.PatternMatch import PatternMatch
 from tree.nodes.InternalNode import InternalNode
 from tree.nodes.Node import Node, PrimitiveEventDefinition, PatternParameters
+from tree.PatternMatchStorage import PatternMatchStorage, is_column_value
 
 
 class BinaryNode(InternalNode, ABC):
@@ -21,6 +23,8 @@ class BinaryNode(InternalNode, ABC):
         super().__init__(pattern_params, parents, pattern_ids, event_defs)
         self._left_subtree = left
         self._right_subtree = right
+        # the relation conditions evaluated in bulk for the partial matches arriving from each subtree, by subtree
+        self.__vectorized_conditions = {}
 
     def create_parent_to_info_dict(self):
         if self._left_subtree is not None:
@@ -114,6 +118,11 @@ class BinaryNode(InternalNode, ABC):
         other_subtree.clean_expired_partial_matches(new_partial_match.last_timestamp)
         partial_matches_to_compare = other_subtree.get_partial_matches(new_pm_key(new_partial_match))
         second_event_defs = other_subtree.get_event_definitions_by_parent(self)
+        if self._vectorized_evaluation_threshold is not None and \
+                len(partial_matches_to_compare) >= self._vectorized_evaluation_threshold:
+            partial_matches_to_compare = self.__filter_partial_matches_in_bulk(
+                new_partial_match, partial_matches_to_compare, other_subtree.get_storage_unit(),
+                partial_match_source, first_event_defs, second_event_defs)
 
         self.clean_expired_partial_matches(new_partial_match.last_timestamp)
 
@@ -134,6 +143,79 @@ class BinaryNode(InternalNode, ABC):
             probability = calculate_joint_probability(new_partial_match.probability, partial_match.probability)
             self._validate_and_propagate_partial_match(events_for_new_match, probability)
 
+    def __filter_partial_matches_in_bulk(self, new_partial_match: PatternMatch, partial_matches: List[PatternMatch],
+                                         storage: PatternMatchStorage, partial_match_source: Node,
+                                         first_event_defs: List[PrimitiveEventDefinition],
+                                         second_event_defs: List[PrimitiveEventDefinition]):
+        """
+        Evaluates the relation conditions between the new partial match and the stored ones on the numeric columns of
+        the storage at once, and returns the partial matches satisfying all of them. The partial matches for which a
+        column value is not available, along with the remaining conditions, are evaluated as usual.
+        """
+        if not storage.is_internal_buffer(partial_matches):
+            # the columns are only available for the entire content of the storage
+            return partial_matches
+        mask = None
+        for index, getattr_func, stored_index, stored_getattr_func, relation, is_new_term_left in \
+                self.__get_vectorized_conditions(partial_match_source, first_event_defs, second_event_defs):
+            event = new_partial_match.events[index]
+            if isinstance(event, AggregatedEvent):
+                continue
+            try:
+                value = getattr_func(event.payload)
+            except Exception:
+                # the condition will fail in the regular evaluation
+                continue
+            if not is_column_value(value):
+                continue
+            column = storage.get_column(stored_index, stored_getattr_func)
+            if column is None:
+                continue
+            values, is_valid = column
+            condition_mask = relation(value, values) if is_new_term_left else relation(values, value)
+            if is_valid is not None:
+                condition_mask |= ~is_valid
+            mask = condition_mask if mask is None else mask & condition_mask
+        if mask is None:
+            return partial_matches
+        return [partial_matches[i] for i in mask.nonzero()[0].tolist()]
+
+    def __get_vectorized_conditions(self, partial_match_source: Node, first_event_defs: List[PrimitiveEventDefinition],
+                                    second_event_defs: List[PrimitiveEventDefinition]):
+        """
+        Returns the relation conditions of this node between an event of a new partial match matching first_event_defs
+        and an event of a stored partial match matching second_event_defs. Each condition is described by the index of
+        the event in the new partial match and the function retrieving its attribute, the same for the event of the
+        stored partial matches, the relation function and whether the term of the new partial match is the left one.
+        """
+        vectorized_conditions = self.__vectorized_conditions.get(partial_match_source)
+        if vectorized_conditions is not None and vectorized_conditions[0] is first_event_defs and \
+                vectorized_conditions[1] is second_event_defs and vectorized_conditions[2] is self._condition:
+            return vectorized_conditions[3]
+        conditions = []
+        first_indices = {event_def.name: i for i, event_def in enumerate(first_event_defs)}
+        second_indices = {event_def.name: i for i, event_def in enumerate(second_event_defs)}
+        # a relation condition can only be used for filtering if it is a part of a top-level conjunction
+        atomic_conditions = self._condition.get_conditions_list() if isinstance(self._condition, AndCondition) else []
+        for condition in atomic_conditions:
+            if not isinstance(condition, BaseRelationCondition) or condition.get_statistics_collector() is not None or \
+                    type(condition)._eval is not SimpleCondition._eval:
+                continue
+            left_term, right_term = condition.left_term_repr, condition.right_term_repr
+            if not isinstance(left_term, Variable) or not isinstance(right_term, Variable):
+                continue
+            if left_term.name in first_indices and right_term.name in second_indices:
+                new_term, stored_term, is_new_term_left = left_term, right_term, True
+            elif right_term.name in first_indices and left_term.name in second_indices:
+                new_term, stored_term, is_new_term_left = right_term, left_term, False
+            else:
+                continue
+            conditions.append((first_indices[new_term.name], new_term.getattr_func, second_indices[stored_term.name],
+                               stored_term.getattr_func, RELOP_TYPE_FUNCTIONS[condition.relop_type], is_new_term_left))
+        self.__vectorized_conditions[partial_match_source] = \
+            (first_event_defs, second_event_defs, self._condition, conditions)
+        return conditions
+
     def _merge_events_for_new_match(self,
                                     first_event_defs: List[PrimitiveEventDefinition],
                                     second_event_defs: List[PrimitiveEventDefinition],
@@ -3,8 +3,10 @@ from typing import List, Set
 
 from base.Event import Event, AggregatedEvent
 from condition.Condition import RelopTypes, EquationSides
+from condition.ConditionCompiler import compile_condition
 from tree.nodes.Node import Node, PrimitiveEventDefinition, PatternParameters
-from tree.PatternMatchStorage import TreeStorageParameters, UnsortedPatternMatchStorage, SortedPatternMatchStorage
+from tree.PatternMatchStorage import TreeStorageParameters, UnsortedPatternMatchStorage, SortedPatternMatchStorage, \
+    HashPatternMatchStorage
 
 
 class InternalNode(Node, ABC):
@@ -15,25 +17,48 @@ class InternalNode(Node, ABC):
                  event_defs: List[PrimitiveEventDefinition] = None):
         super().__init__(pattern_params, parents, pattern_ids)
         self._event_defs = event_defs
+        # the minimal number of candidate partial matches on which the conditions are evaluated at once, or None if
+        # the vectorized evaluation is disabled
+        self._vectorized_evaluation_threshold = None
+        # the event definitions and the condition for which the condition was compiled, along with the compiled function
+        self.__compiled_condition = None
 
     def get_event_definitions(self):
         return self._event_defs
 
     def _validate_new_match(self, events_for_new_match: List[Event]):
         """
-        Validates the condition stored in this node on the given set of events.
+        Validates the condition stored in this node on the given set of events. If the condition can be compiled, the
+        compiled function is evaluated instead of binding the events to their names.
         """
         if not super()._validate_new_match(events_for_new_match):
             return False
         if len(events_for_new_match) != len(set(events_for_new_match)):
             # the list contains duplicate events which is not allowed
             return False
+        evaluate_condition = self.__get_compiled_condition()
+        if evaluate_condition is not None:
+            return evaluate_condition(events_for_new_match)
         binding = {
             self._event_defs[i].name: InternalNode._get_event_content(events_for_new_match[i])
             for i in range(len(self._event_defs))
         }
         return self._condition.eval(binding)
 
+    def __get_compiled_condition(self):
+        """
+        Returns the function evaluating the condition of this node on a list of events matching the event definitions
+        of this node, or None if the condition cannot be compiled. The function is only generated once and is
+        regenerated if the condition or the definitions change.
+        """
+        compiled_condition = self.__compiled_condition
+        if compiled_condition is not None and compiled_condition[0] is self._event_defs and \
+                compiled_condition[1] is self._condition:
+            return compiled_condition[2]
+        evaluate_condition = compile_condition(self._condition, [event_def.name for event_def in self._event_defs])
+        self.__compiled_condition = (self._event_defs, self._condition, evaluate_condition)
+        return evaluate_condition
+
     def create_parent_to_info_dict(self):
         """
         Creates the dictionary that maps parent to event type, event name and index.
@@ -51,9 +76,14 @@ class InternalNode(Node, ABC):
         """
         An auxiliary method for setting up the storage of an internal node.
         In the internal nodes, we only sort the storage if a storage key is explicitly provided by the user.
+        For an equality condition, the partial matches are hashed by their keys instead of being sorted.
         """
+        self._vectorized_evaluation_threshold = storage_params.vectorized_evaluation_threshold \
+            if storage_params.vectorize_conditions else None
         if not storage_params.sort_storage or sorting_key is None:
             self._partial_matches = UnsortedPatternMatchStorage(storage_params.clean_up_interval)
+        elif rel_op == RelopTypes.Equal:
+            self._partial_matches = HashPatternMatchStorage(sorting_key, storage_params.clean_up_interval)
         else:
             self._partial_matches = SortedPatternMatchStorage(sorting_key, rel_op, equation_side,
                                                               storage_params.clean_up_interval, sort_by_first_timestamp)
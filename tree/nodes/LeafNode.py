@@ -6,7 +6,7 @@ from condition.Condition import Condition, RelopTypes, EquationSides
 from base.PatternStructure import PrimitiveEventStructure
 from tree.nodes.Node import Node
 from tree.nodes.Node import PrimitiveEventDefinition, PatternParameters
-from tree.PatternMatchStorage import TreeStorageParameters, SortedPatternMatchStorage
+from tree.PatternMatchStorage import TreeStorageParameters, SortedPatternMatchStorage, HashPatternMatchStorage
 
 
 class LeafNode(Node):
@@ -88,9 +88,13 @@ class LeafNode(Node):
         """
         For leaf nodes, we always want to create a sorted storage, since the events arrive in their natural order
         of occurrence anyway. Hence, a sorted storage is initialized either according to a user-specified key, or an
-        arrival order if no storage parameters were explicitly specified.
+        arrival order if no storage parameters were explicitly specified. For an equality condition, the events are
+        hashed by the user-specified key instead.
         """
         should_use_default_storage_mode = not storage_params.sort_storage or sorting_key is None
+        if not should_use_default_storage_mode and rel_op == RelopTypes.Equal:
+            self._partial_matches = HashPatternMatchStorage(sorting_key, storage_params.clean_up_interval, True)
+            return
         actual_sorting_key = (lambda pm: pm.events[0].timestamp) if should_use_default_storage_mode else sorting_key
         actual_sort_by_first_timestamp = should_use_default_storage_mode or sort_by_first_timestamp
         self._partial_matches = SortedPatternMatchStorage(actual_sorting_key, rel_op, equation_side,